@@ -0,0 +1,198 @@
+'''
+Persistent cache of the results of solve_first_part and solve_second_part, so that solving again an unchanged puzzle file returns the stored result at once instead of taking minutes (e.g. days 16, 18 or 19).
+
+The results are stored in a SQLite file, keyed by the hash of the bytes of the puzzle file and the hash of the source code of the solver (the day module and every module of this folder that it imports, directly or through other modules, such as fast_input.py or puzzle_result.py), so that a result is never reused if the input or the solver changes. CACHE_FORMAT_VERSION is part of the key too, so that changes in what is stored (e.g. in PuzzleResult) can discard all the stored results at once. When the stored results exceed the maximum size, the least recently used ones are deleted.
+
+The day scripts use the cache by default. --no-cache bypasses it (nothing is read or written) and --clear-cache deletes the stored results of the day before solving
+'''
+
+import os
+import time
+
+from profiling import run_profiled
+from lazy_import import lazy_import
+
+# only imported when they are first used, see lazy_import.py: every day script imports this module, and these modules are only needed when the cache is used
+ast = lazy_import("ast")
+hashlib = lazy_import("hashlib")
+pickle = lazy_import("pickle")
+sqlite3 = lazy_import("sqlite3")
+
+DEFAULT_CACHE_FILE_NAME = os.path.join(os.path.expanduser("~"), ".cache", "advent_of_code_2022", "answers.sqlite3")
+DEFAULT_MAXIMUM_CACHE_SIZE = 64*1024*1024 # bytes
+SQLITE_LOCK_TIMEOUT = 30 # seconds. Several processes (e.g. the workers of run_batch.py) can use the cache at once
+
+CACHE_FORMAT_VERSION = 2 # increased when the stored results of older versions must not be used
+
+FIRST_PART = "first"
+SECOND_PART = "second"
+
+
+def get_file_hash(file_name):
+    file_hash = hashlib.sha256()
+    with open(file_name, "rb") as file:
+        for file_chunk in iter(lambda: file.read(1024*1024), b""):
+            file_hash.update(file_chunk)
+    return file_hash.hexdigest()
+
+
+def get_local_imported_file_names(file_name):
+    # files of the modules of the same folder that the module of file_name imports, directly or through other modules of the folder, including file_name itself, sorted
+    folder = os.path.dirname(os.path.abspath(file_name))
+    file_names_to_check = [os.path.abspath(file_name)]
+    local_file_names = set()
+    while len(file_names_to_check) != 0:
+        current_file_name = file_names_to_check.pop()
+        if current_file_name in local_file_names:
+            continue
+        local_file_names.add(current_file_name)
+        with open(current_file_name, "rb") as file:
+            syntax_tree = ast.parse(file.read(), current_file_name)
+        for node in ast.walk(syntax_tree):
+            if isinstance(node, ast.Import):
+                module_names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module is not None:
+                module_names = [node.module]
+            else:
+                continue
+            for module_name in module_names:
+                module_file_name = os.path.join(folder, module_name.split(".")[0] + ".py")
+                if os.path.isfile(module_file_name):
+                    file_names_to_check.append(module_file_name)
+    return sorted(local_file_names)
+
+
+def get_solver_hash(day_module):
+    # hash of the source code that the answers of the day depend on, see get_local_imported_file_names
+    solver_hash = hashlib.sha256(str(CACHE_FORMAT_VERSION).encode())
+    for file_name in get_local_imported_file_names(day_module.__file__):
+        solver_hash.update(os.path.basename(file_name).encode())
+        solver_hash.update(get_file_hash(file_name).encode())
+    return solver_hash.hexdigest()
+
+
+class AnswerCache:
+    def __init__(self, cache_file_name=DEFAULT_CACHE_FILE_NAME, maximum_size=DEFAULT_MAXIMUM_CACHE_SIZE):
+        self.cache_file_name = cache_file_name
+        self.maximum_size = maximum_size
+        cache_folder = os.path.dirname(cache_file_name)
+        if cache_folder != "":
+            os.makedirs(cache_folder, exist_ok=True)
+        self.connection = sqlite3.connect(cache_file_name, timeout=SQLITE_LOCK_TIMEOUT)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, day INTEGER, part TEXT, result BLOB, size INTEGER, last_access REAL)")
+
+    def get_key(self, day, part, input_hash, solver_hash, reading_arguments=()):
+        # the reading arguments distinguish results of the same file that are read differently (the example constants of day 15)
+        return hashlib.sha256("{}/{}/{}/{}/{!r}".format(day, part, input_hash, solver_hash, reading_arguments).encode()).hexdigest()
+
+    def load(self, key):
+        row = self.connection.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            puzzle_result = pickle.loads(row[0])
+        except Exception: # e.g. a diagnostic whose class was stored from a day run as a script (__main__) and is loaded from the imported module
+            return None
+        with self.connection:
+            self.connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        return puzzle_result
+
+    def store(self, key, day, part, puzzle_result):
+        try:
+            result_bytes = pickle.dumps(puzzle_result)
+        except Exception: # results that can not be stored are just not cached
+            return
+        if len(result_bytes) > self.maximum_size:
+            return
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", (key, day, part, result_bytes, len(result_bytes), time.time()))
+            self.evict_least_recently_used()
+
+    def evict_least_recently_used(self):
+        total_size = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total_size <= self.maximum_size:
+            return
+        evicted_keys = []
+        for key, size in self.connection.execute("SELECT key, size FROM results ORDER BY last_access"):
+            evicted_keys.append((key,))
+            total_size -= size
+            if total_size <= self.maximum_size:
+                break
+        self.connection.executemany("DELETE FROM results WHERE key = ?", evicted_keys)
+
+    def invalidate(self, day=None):
+        # deletes the results of a day, or all results if no day is given
+        with self.connection:
+            if day is None:
+                self.connection.execute("DELETE FROM results")
+            else:
+                self.connection.execute("DELETE FROM results WHERE day = ?", (day,))
+
+    def close(self):
+        self.connection.close()
+
+
+class CachedPuzzleSolver:
+    '''
+    Solves the parts of a puzzle file with the read_puzzle_input, solve_first_part and solve_second_part functions of a day module, returning the cached result instead when there is one. The file is only parsed if a part has to be solved.
+
+    The extra arguments given to solve_part (e.g. a callback to report progress, or an already known result of the first part) are not part of the key, so they must not change the result.
+
+    With a part_profiler (see profiling.py), the parsing and the parts are profiled, and cached results are not used, as there would be nothing to profile
+    '''
+    def __init__(self, day, day_module, file_name, reading_arguments=(), answer_cache=None, part_profiler=None):
+        self.day = day
+        self.day_module = day_module
+        self.file_name = file_name
+        self.reading_arguments = reading_arguments
+        self.answer_cache = answer_cache
+        self.part_profiler = part_profiler
+        self.part_arguments = None # arguments of solve_first_part and solve_second_part, once the file is parsed
+
+        if answer_cache is not None:
+            self.input_hash = get_file_hash(file_name)
+            self.solver_hash = get_solver_hash(day_module)
+
+    def solve_part(self, part, *extra_arguments, **extra_keyword_arguments):
+        if self.answer_cache is not None:
+            key = self.answer_cache.get_key(self.day, part, self.input_hash, self.solver_hash, self.reading_arguments)
+            puzzle_result = self.answer_cache.load(key) if self.part_profiler is None else None
+            if puzzle_result is not None:
+                return puzzle_result
+
+        if self.part_arguments is None:
+            self.part_arguments = run_profiled(self.part_profiler, "parse", self.day_module.read_puzzle_input, self.file_name, *self.reading_arguments)
+        if part == FIRST_PART:
+            puzzle_result = run_profiled(self.part_profiler, part, self.day_module.solve_first_part, *self.part_arguments[0], *extra_arguments, **extra_keyword_arguments)
+        else:
+            puzzle_result = run_profiled(self.part_profiler, part, self.day_module.solve_second_part, *self.part_arguments[1], *extra_arguments, **extra_keyword_arguments)
+
+        if self.answer_cache is not None:
+            self.answer_cache.store(key, self.day, part, puzzle_result)
+        return puzzle_result
+
+    def solve_first_part(self, *extra_arguments, **extra_keyword_arguments):
+        return self.solve_part(FIRST_PART, *extra_arguments, **extra_keyword_arguments)
+
+    def solve_second_part(self, *extra_arguments, **extra_keyword_arguments):
+        return self.solve_part(SECOND_PART, *extra_arguments, **extra_keyword_arguments)
+
+
+def add_cache_arguments(parser):
+    parser.add_argument("--no-cache", dest="use_cache", action="store_false", help="do not use the answer cache: solve the puzzle even if it was already solved, and do not store the result")
+    parser.add_argument("--clear-cache", dest="clear_cache", action="store_true", help="delete the cached answers of this day before solving")
+    parser.add_argument("--cache-file", dest="cache_file_name", type=str, default=DEFAULT_CACHE_FILE_NAME, help="SQLite file of the answer cache. Default: " + DEFAULT_CACHE_FILE_NAME)
+
+
+def get_answer_cache(args, day):
+    # AnswerCache for the arguments added by add_cache_arguments, or None if the cache is not used
+    if not args.use_cache and not args.clear_cache:
+        return None
+    answer_cache = AnswerCache(args.cache_file_name)
+    if args.clear_cache:
+        answer_cache.invalidate(day)
+    if not args.use_cache:
+        answer_cache.close()
+        return None
+    return answer_cache
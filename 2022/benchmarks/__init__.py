@@ -0,0 +1,5 @@
+'''
+Benchmarks of the 2022 solutions. The repository does not contain any puzzle input, so input_generators.py creates valid puzzle-shaped inputs for every day at an adjustable scale (scale 1 is roughly the size of a real puzzle input), and scaling_benchmark.py runs the solutions of each day over several scales to show how the run time grows with the size of the input.
+
+The modules import the solutions of each day (day1.py, day2.py...) and run_all_days.py, so they have to be run as modules from the 2022 folder, e.g. python -m benchmarks.scaling_benchmark 1 8 --scales 1 10 100
+'''
@@ -0,0 +1,121 @@
+'''
+Measures how long it takes to import the module of every day, which on the puzzle inputs is often longer than solving the day itself, so that a new module-level import of a heavy module (such as NumPy, see lazy_import.py) does not go unnoticed.
+
+Each day is imported in a new interpreter with python -X importtime, which reports the cumulative import time of every module. The fastest of several runs is kept, as the slower ones are only noise. The benchmark also checks whether the code of NumPy was run during the import: none of the days needs it until it solves something.
+
+The exit status is 1 if a day runs the code of NumPy when it is imported or takes longer to import than --maximum-import-time-ratio times the imports that the interpreter does at start-up (measured the same way, with python -c pass), so that the benchmark can be used as a check that the start-up time does not regress. The limit is relative to the start-up of the interpreter so that it holds on slower and faster machines alike. --maximum-import-time gives an absolute limit instead.
+
+Run from the 2022 folder: python -m benchmarks.import_time_benchmark [days] [--repetitions 5]
+'''
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass, asdict
+
+import run_all_days
+
+DEFAULT_REPETITIONS = 5
+DEFAULT_MAXIMUM_IMPORT_TIME_RATIO = 10 # times the start-up imports of the interpreter. The days take around 5 times them, and NumPy around 15 times
+IMPORTED_MODULE_CHECK_CODE = "import sys, types, {module_name}; print(type(sys.modules.get('numpy')) is types.ModuleType)" # prints whether NumPy was run, and not only registered by lazy_import
+MICROSECONDS_PER_MILLISECOND = 1000
+
+
+@dataclass
+class ImportMeasurement:
+    module_name: str
+    import_time: float # milliseconds, including the modules it imports
+    numpy_imported: bool # True if the code of NumPy was run during the import
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Advent of Code 2022: measure the time it takes to import the module of every day")
+    parser.add_argument("days", type=int, nargs='*', help="days to measure. If no days are given, all days are measured")
+    parser.add_argument("-r", "--repetitions", type=int, default=DEFAULT_REPETITIONS, help="times that each day is imported, keeping the fastest. Default: {}".format(DEFAULT_REPETITIONS))
+    parser.add_argument("--maximum-import-time-ratio", dest="maximum_import_time_ratio", type=float, default=DEFAULT_MAXIMUM_IMPORT_TIME_RATIO, help="times the start-up imports of the interpreter above which the import time of a day is reported as a regression. Default: {:g}".format(DEFAULT_MAXIMUM_IMPORT_TIME_RATIO))
+    parser.add_argument("-m", "--maximum-import-time", dest="maximum_import_time", type=float, default=None, help="milliseconds above which the import time of a day is reported as a regression, instead of the limit given by --maximum-import-time-ratio")
+    parser.add_argument("--reference", dest="reference_module_names", type=str, nargs='*', default=["numpy"], help="other modules to measure, to compare the days with them. Default: numpy")
+    parser.add_argument("--json", dest="print_json", action="store_true", help="print the measurements as JSON instead of as a table")
+    args = parser.parse_args()
+    if args.days == []:
+        args.days = list(range(1,run_all_days.N_DAYS+1))
+    return args
+
+
+def get_cumulative_import_time(importtime_output, module_name):
+    # -X importtime writes a line per imported module, "import time: self [us] | cumulative | imported package", with the module names indented by their nesting level
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if fields[2].strip() == module_name and not fields[2].startswith("  "): # the module imported by the command, not a nested import with the same name
+            return int(fields[1]) / MICROSECONDS_PER_MILLISECOND
+    raise ValueError("The import time of {} was not reported".format(module_name))
+
+
+def get_startup_import_time(importtime_output):
+    # adds the cumulative import times of the modules that are not imported by other modules
+    startup_import_time = 0
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if fields[1].strip().isdigit() and not fields[2].startswith("  "):
+            startup_import_time += int(fields[1]) / MICROSECONDS_PER_MILLISECOND
+    return startup_import_time
+
+
+def measure_startup_import(repetitions):
+    # milliseconds spent importing the modules that the interpreter imports at start-up (site, encodings...), the fastest of several runs
+    startup_import_times = []
+    for _ in range(repetitions):
+        completed_process = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"], capture_output=True, text=True, check=True)
+        startup_import_times.append(get_startup_import_time(completed_process.stderr))
+    return min(startup_import_times)
+
+
+def measure_import(module_name, repetitions):
+    import_times = []
+    for _ in range(repetitions):
+        completed_process = subprocess.run([sys.executable, "-X", "importtime", "-c", IMPORTED_MODULE_CHECK_CODE.format(module_name=module_name)], capture_output=True, text=True, check=True)
+        import_times.append(get_cumulative_import_time(completed_process.stderr, module_name))
+    numpy_imported = completed_process.stdout.strip() == "True"
+    return ImportMeasurement(module_name, min(import_times), numpy_imported)
+
+
+def print_import_table(import_measurements):
+    print("{:<12}  {:>16}  {:>14}".format("Module", "Import time (ms)", "Imports NumPy"))
+    for measurement in import_measurements:
+        print("{:<12}  {:>16.2f}  {:>14}".format(measurement.module_name, measurement.import_time, "yes" if measurement.numpy_imported else "no"))
+
+
+def main(args):
+    day_measurements = [measure_import("day{}".format(day), args.repetitions) for day in args.days]
+    reference_measurements = [measure_import(module_name, args.repetitions) for module_name in args.reference_module_names]
+
+    if args.print_json:
+        print(json.dumps([asdict(measurement) for measurement in day_measurements + reference_measurements], indent=2))
+    else:
+        print_import_table(day_measurements + reference_measurements)
+
+    if args.maximum_import_time is not None:
+        maximum_import_time = args.maximum_import_time
+    else:
+        startup_import_time = measure_startup_import(args.repetitions)
+        maximum_import_time = args.maximum_import_time_ratio * startup_import_time
+        print("Start-up imports of the interpreter: {:.2f} ms, so the maximum import time is {:.2f} ms".format(startup_import_time, maximum_import_time), file=sys.stderr)
+
+    regressions = []
+    for measurement in day_measurements:
+        if measurement.numpy_imported:
+            regressions.append("{} runs the code of NumPy when it is imported".format(measurement.module_name))
+        if measurement.import_time > maximum_import_time:
+            regressions.append("{} takes {:.2f} ms to import, more than {:.2f} ms".format(measurement.module_name, measurement.import_time, maximum_import_time))
+    for regression in regressions:
+        print(regression, file=sys.stderr)
+    return 1 if len(regressions) != 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_arguments()))
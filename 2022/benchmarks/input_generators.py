@@ -0,0 +1,757 @@
+'''
+Generators of synthetic puzzle inputs for every day of 2022. Each generator receives a scale and a random.Random instance, and returns the contents of a puzzle file as a string. A scale of 1 produces an input of roughly the same size as a real puzzle input, and the amount of data grows linearly with the scale (e.g. scale 10 gives 10 times more calorie lines, or a tree grid with 10 times more trees).
+
+The generated inputs fulfill the properties that the puzzles guarantee and that the solutions rely on (e.g. the rucksacks of day 3 share exactly one item, the monkeys of day 21 form a tree in which "humn" appears once, the rock of day 14 never blocks the sand source in the first part...). They are not meant to have the same answers as the real puzzles, only the same shape.
+
+Some inputs cannot grow in every direction, as some solutions hardcode part of the puzzle structure:
+- Day 10 always draws a 240 cycle screen, so the program is not scaled
+- Day 15 keeps the puzzle coordinate space (rows of interest 2000000 and 4000000). Only the number of sensors grows. The distress beacon is guaranteed to not be covered by any sensor, but other uncovered positions may exist, so the second part can find a different position
+- Day 22 keeps the 50x50 cube layout of the real puzzle files. Only the path to follow grows
+- Day 25 chooses the last number so that the sum of all the numbers has only the digits 0, 1 and 2 in base 5, as the conversion of the sum to SNAFU of the solution (decimal_to_SNAFU) fails when a digit 3 or 4 carries into a 4 or into a new leading digit
+'''
+
+import itertools
+import math
+import string
+
+DAY1_N_ELVES = 250
+DAY1_MAXIMUM_N_FOOD_ITEMS = 14
+DAY1_CALORIES_RANGE = (1000, 60000)
+
+DAY2_N_ROUNDS = 2500
+
+DAY3_N_GROUPS = 100
+DAY3_ITEM_TYPES = string.ascii_lowercase + string.ascii_uppercase
+DAY3_COMPARTMENT_LENGTH_RANGE = (6, 24)
+
+DAY4_N_PAIRS = 1000
+DAY4_MAXIMUM_SECTION_ID = 99
+
+DAY5_N_STACKS = 9 # the number of stacks and their height grow both with the square root of the scale, so the number of crates grows linearly
+DAY5_MAXIMUM_INITIAL_STACK_HEIGHT = 8
+DAY5_N_MOVES = 500
+DAY5_MAXIMUM_CRATES_PER_MOVE = 30
+
+DAY6_DATASTREAM_LENGTH = 4096
+DAY6_BODY_ALPHABET_LENGTH = 3 # the body of the datastream uses only 3 different characters at a time, so no marker (of 4 or 14 different characters) can appear before the end of the stream
+DAY6_LONGEST_MARKER_LENGTH = 14
+DAY6_BODY_ALPHABET_CHANGE_PERIOD = 100
+
+DAY7_N_DIRECTORIES = 180
+DAY7_MAXIMUM_DEPTH = 10 # grows linearly with the scale, and a branch of the tree always reaches it, so big scales have trees deeper than the recursion limit
+DAY7_MAXIMUM_N_FILES_PER_DIRECTORY = 5
+DAY7_TOTAL_USED_SPACE = 48000000 # bigger than the 40000000 allowed by the puzzle (70000000 - 30000000), so that the second part always needs to delete a directory
+
+DAY8_N_ROWS = 99
+DAY8_N_COLS = 99
+
+DAY9_N_MOTIONS = 2000
+DAY9_MAXIMUM_MOTION_STEPS = 19
+
+DAY10_N_CYCLES = 240
+DAY10_ADDX_PROBABILITY = 0.6
+DAY10_MAXIMUM_ADDX_VALUE = 5
+DAY10_SCREEN_WIDTH = 40
+
+DAY11_N_MONKEYS = 8
+DAY11_MAXIMUM_N_STARTING_ITEMS = 7
+DAY11_STARTING_WORRY_RANGE = (50, 99)
+DAY11_SUM_OPERATION_PROBABILITY = 0.6
+DAY11_SUM_VALUE_RANGE = (1, 8)
+DAY11_MULTIPLICATION_VALUE_RANGE = (2, 19)
+
+DAY12_N_ROWS = 41
+DAY12_N_COLS = 170 # at least as many columns as elevation levels are needed, so that the central row can climb one level at a time
+DAY12_N_ELEVATION_LEVELS = 26
+DAY12_MAXIMUM_ELEVATION_DROP = 3
+
+DAY13_N_PAIRS = 150
+DAY13_MAXIMUM_DEPTH = 4
+DAY13_MAXIMUM_LIST_LENGTH = 5
+DAY13_MAXIMUM_INTEGER = 10
+DAY13_NESTED_LIST_PROBABILITY = 0.3
+
+DAY14_N_ROCK_PATHS = 150
+DAY14_HALF_WIDTH = 40 # maximum horizontal distance between a rock and the sand source
+DAY14_DEPTH = 120
+DAY14_MAXIMUM_N_SEGMENTS = 6
+DAY14_MAXIMUM_SEGMENT_LENGTH = 8
+DAY14_SAND_SOURCE_X = 500
+
+DAY15_N_SENSORS = 30
+DAY15_MAXIMUM_COORDINATE_POSITION = 4000000
+DAY15_RANGE_FACTOR = 1.5 # sensor range in relation to the distance between sensors, big enough to cover the space between them
+
+DAY16_N_VALVES = 60
+DAY16_N_FLOWING_VALVES = 15
+DAY16_FLOW_RATE_RANGE = (3, 25)
+DAY16_STARTING_VALVE = "AA"
+
+DAY17_JET_PATTERN_LENGTH = 10091
+
+DAY18_N_CUBES = 2800
+DAY18_SIDE_LENGTH = 20
+
+DAY19_N_BLUEPRINTS = 30
+DAY19_ORE_COST_RANGE = (2, 4)
+DAY19_OBSIDIAN_ROBOT_CLAY_COST_RANGE = (5, 20)
+DAY19_GEODE_ROBOT_OBSIDIAN_COST_RANGE = (7, 20)
+
+DAY20_N_NUMBERS = 5000
+DAY20_MAXIMUM_ABSOLUTE_VALUE = 10000
+
+DAY21_N_YELLING_MONKEYS = 1000 # monkeys that yell a number. Almost as many monkeys do a math operation
+DAY21_YELLED_NUMBER_RANGE = (1, 20)
+DAY21_MAXIMUM_MULTIPLICATION_RESULT = 10**12
+DAY21_ROOT_MONKEY_NAME = "root"
+DAY21_HUMAN_NAME = "humn"
+DAY21_NAME_LENGTH = 4
+
+DAY22_CUBE_DIMENSIONS = 50 # hardcoded in the second part of the solution
+DAY22_N_INSTRUCTIONS = 2000
+DAY22_MAXIMUM_N_STEPS = 50
+DAY22_WALL_PROBABILITY = 0.1
+DAY22_SOLID_WALL = "#"
+DAY22_OPEN_TILE = "."
+
+DAY23_N_ROWS = 70
+DAY23_N_COLS = 70
+DAY23_ELF_PROBABILITY = 0.5
+
+DAY24_N_ROWS = 25
+DAY24_COLS_PER_ROW = 5 # the number of columns is a multiple of the number of rows, so the blizzard period (their least common multiple) is just the number of columns
+DAY24_BLIZZARD_PROBABILITY = 0.6
+
+DAY25_N_NUMBERS = 120
+DAY25_MAXIMUM_N_DIGITS = 20
+SNAFU_DIGITS = {-2: "=", -1: "-", 0: "0", 1: "1", 2: "2"}
+
+
+def scaled(puzzle_size, scale, minimum=1):
+    return max(minimum, round(puzzle_size*scale))
+
+
+def scaled_side(puzzle_side, scale, n_dimensions=2, minimum=1):
+    # side of a grid (or cube) whose area (or volume) grows linearly with the scale
+    return max(minimum, round(puzzle_side * scale**(1/n_dimensions)))
+
+
+def generate_day1(scale, random_generator):
+    lines = []
+    for elf_idx in range(scaled(DAY1_N_ELVES, scale)):
+        if elf_idx != 0:
+            lines.append("")
+        for _ in range(random_generator.randint(1, DAY1_MAXIMUM_N_FOOD_ITEMS)):
+            lines.append(str(random_generator.randint(*DAY1_CALORIES_RANGE)))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day2(scale, random_generator):
+    lines = [random_generator.choice("ABC") + " " + random_generator.choice("XYZ") for _ in range(scaled(DAY2_N_ROUNDS, scale))]
+    return "\n".join(lines) + "\n"
+
+
+def generate_day3(scale, random_generator):
+    '''
+    In each group of three Elves, the badge is the only item type that the three rucksacks share, and in each rucksack only one item type appears in both compartments. The remaining item types are split between the Elves (so they do not share them) and, for each Elf, between the two compartments
+    '''
+    lines = []
+    for _ in range(scaled(DAY3_N_GROUPS, scale)):
+        item_types = list(DAY3_ITEM_TYPES)
+        random_generator.shuffle(item_types)
+        badge = item_types.pop()
+        n_item_types_per_elf = len(item_types)//3
+        for elf_idx in range(3):
+            elf_item_types = item_types[elf_idx*n_item_types_per_elf:(elf_idx+1)*n_item_types_per_elf]
+            repeated_item = random_generator.choice(elf_item_types + [badge])
+            if repeated_item != badge:
+                elf_item_types.remove(repeated_item)
+            first_compartment_types = elf_item_types[:len(elf_item_types)//2]
+            second_compartment_types = elf_item_types[len(elf_item_types)//2:]
+
+            compartment_length = random_generator.randint(*DAY3_COMPARTMENT_LENGTH_RANGE)
+            first_compartment = [repeated_item] + random_generator.choices(first_compartment_types, k=compartment_length-1)
+            second_compartment = [repeated_item] + random_generator.choices(second_compartment_types, k=compartment_length-1)
+            if badge != repeated_item:
+                first_compartment[1] = badge # compartments are at least 2 items long
+            random_generator.shuffle(first_compartment)
+            random_generator.shuffle(second_compartment)
+            lines.append("".join(first_compartment + second_compartment))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day4(scale, random_generator):
+    lines = []
+    for _ in range(scaled(DAY4_N_PAIRS, scale)):
+        section_ids = []
+        for _ in range(2):
+            first_section = random_generator.randint(1, DAY4_MAXIMUM_SECTION_ID)
+            last_section = random_generator.randint(first_section, DAY4_MAXIMUM_SECTION_ID)
+            section_ids.append("{}-{}".format(first_section, last_section))
+        lines.append(",".join(section_ids))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day5(scale, random_generator):
+    n_stacks = scaled_side(DAY5_N_STACKS, scale, minimum=2)
+    stack_list = []
+    for _ in range(n_stacks):
+        stack_height = random_generator.randint(2, scaled_side(DAY5_MAXIMUM_INITIAL_STACK_HEIGHT, scale, minimum=2))
+        stack_list.append(random_generator.choices(string.ascii_uppercase, k=stack_height))
+
+    lines = []
+    for level in reversed(range(max(len(stack) for stack in stack_list))):
+        crates = []
+        for stack in stack_list:
+            if level < len(stack):
+                crates.append("[" + stack[level] + "]")
+            else:
+                crates.append("   ")
+        lines.append(" ".join(crates))
+    lines.append(" ".join("{:^3}".format(stack_idx+1) for stack_idx in range(n_stacks))) # the numbers of 4 digits or more do not fit below their stacks, but only how many numbers there are matters
+    lines.append("")
+
+    # no stack is ever emptied, so there is always a top crate. As there are at least 2 crates per stack, some stack always has 2 crates or more to move from
+    stack_heights = [len(stack) for stack in stack_list]
+    for _ in range(scaled(DAY5_N_MOVES, scale)):
+        origin = random_generator.choice([stack_idx for stack_idx, stack_height in enumerate(stack_heights) if stack_height > 1])
+        destination = random_generator.choice([stack_idx for stack_idx in range(n_stacks) if stack_idx != origin])
+        n_crates = random_generator.randint(1, min(stack_heights[origin]-1, DAY5_MAXIMUM_CRATES_PER_MOVE))
+        stack_heights[origin] -= n_crates
+        stack_heights[destination] += n_crates
+        lines.append("move {} from {} to {}".format(n_crates, origin+1, destination+1))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day6(scale, random_generator):
+    '''
+    The markers are placed at the very end of the datastream, so both parts have to go through all of it
+    '''
+    body_length = scaled(DAY6_DATASTREAM_LENGTH, scale, minimum=DAY6_LONGEST_MARKER_LENGTH+1) - DAY6_LONGEST_MARKER_LENGTH
+    datastream = []
+    while len(datastream) < body_length:
+        body_alphabet = random_generator.sample(string.ascii_lowercase, DAY6_BODY_ALPHABET_LENGTH)
+        datastream += random_generator.choices(body_alphabet, k=min(DAY6_BODY_ALPHABET_CHANGE_PERIOD, body_length-len(datastream)))
+
+    # the characters right before the marker can not be part of it, or the marker would start earlier
+    marker_characters = [character for character in string.ascii_lowercase if character not in datastream[-DAY6_LONGEST_MARKER_LENGTH:]]
+    datastream += random_generator.sample(marker_characters, DAY6_LONGEST_MARKER_LENGTH)
+    return "".join(datastream) + "\n"
+
+
+def generate_day7(scale, random_generator):
+    n_directories = scaled(DAY7_N_DIRECTORIES, scale)
+    maximum_depth = min(scaled(DAY7_MAXIMUM_DEPTH, scale), n_directories-1)
+    subdirectory_list = [[] for _ in range(n_directories)]
+    directory_depths = [0]
+    for directory_idx in range(1, n_directories):
+        if directory_idx <= maximum_depth: # the first directories are a chain that reaches the maximum depth, as random parents rarely give deep trees
+            parent_idx = directory_idx-1
+        else:
+            parent_idx = random_generator.randrange(directory_idx)
+        while directory_depths[parent_idx] >= maximum_depth:
+            parent_idx = random_generator.randrange(directory_idx)
+        subdirectory_list[parent_idx].append(directory_idx)
+        directory_depths.append(directory_depths[parent_idx] + 1)
+
+    # random file weights, converted afterwards to sizes that add up to DAY7_TOTAL_USED_SPACE
+    file_weight_list = [[random_generator.random() for _ in range(random_generator.randint(0, DAY7_MAXIMUM_N_FILES_PER_DIRECTORY))] for _ in range(n_directories)]
+    size_per_weight = DAY7_TOTAL_USED_SPACE / sum(sum(file_weights) for file_weights in file_weight_list)
+
+    def random_name(used_names):
+        name = "".join(random_generator.choices(string.ascii_lowercase, k=random_generator.randint(1, 8)))
+        while name in used_names:
+            name = "".join(random_generator.choices(string.ascii_lowercase, k=random_generator.randint(1, 8)))
+        used_names.add(name)
+        return name
+
+    lines = ["$ cd /"]
+    directories_to_list = [(0, None)] # stack of (directory index, name). The name of the root directory was already written
+    while len(directories_to_list) != 0:
+        directory_idx, directory_name = directories_to_list.pop()
+        if directory_idx is None:
+            lines.append("$ cd ..")
+            continue
+        if directory_name is not None:
+            lines.append("$ cd " + directory_name)
+
+        lines.append("$ ls")
+        used_names = set()
+        subdirectory_names = []
+        for subdirectory_idx in subdirectory_list[directory_idx]:
+            subdirectory_names.append(random_name(used_names))
+            lines.append("dir " + subdirectory_names[-1])
+        for file_weight in file_weight_list[directory_idx]:
+            lines.append("{} {}.{}".format(max(1, round(file_weight*size_per_weight)), random_name(used_names), random_generator.choice(("txt", "dat", "log", ""))).rstrip("."))
+
+        for subdirectory_idx, subdirectory_name in zip(reversed(subdirectory_list[directory_idx]), reversed(subdirectory_names)):
+            directories_to_list.append((None, None)) # go back up after visiting the subdirectory
+            directories_to_list.append((subdirectory_idx, subdirectory_name))
+
+    while lines[-1] == "$ cd ..": # like in the real puzzle files, the terminal output does not go back to the root at the end
+        lines.pop()
+    return "\n".join(lines) + "\n"
+
+
+def generate_day8(scale, random_generator):
+    n_rows = scaled_side(DAY8_N_ROWS, scale)
+    n_cols = scaled_side(DAY8_N_COLS, scale)
+    lines = ["".join(random_generator.choices(string.digits, k=n_cols)) for _ in range(n_rows)]
+    return "\n".join(lines) + "\n"
+
+
+def generate_day9(scale, random_generator):
+    lines = ["{} {}".format(random_generator.choice("RLUD"), random_generator.randint(1, DAY9_MAXIMUM_MOTION_STEPS)) for _ in range(scaled(DAY9_N_MOTIONS, scale))]
+    return "\n".join(lines) + "\n"
+
+
+def generate_day10(scale, random_generator):
+    '''
+    The screen of the second part has a fixed size, and the program can not last more cycles than the screen has pixels. Therefore the scale is ignored
+    '''
+    lines = []
+    n_cycles = 0
+    register_X = 1
+    while n_cycles < DAY10_N_CYCLES:
+        if n_cycles+2 <= DAY10_N_CYCLES and random_generator.random() < DAY10_ADDX_PROBABILITY:
+            value_V = random_generator.choice([value for value in range(-DAY10_MAXIMUM_ADDX_VALUE, DAY10_MAXIMUM_ADDX_VALUE+1) if value != 0 and 0 <= register_X+value < DAY10_SCREEN_WIDTH])
+            register_X += value_V
+            lines.append("addx {}".format(value_V))
+            n_cycles += 2
+        else:
+            lines.append("noop")
+            n_cycles += 1
+    return "\n".join(lines) + "\n"
+
+
+def get_first_primes(n_primes):
+    prime_list = []
+    candidate = 2
+    while len(prime_list) < n_primes:
+        if all(candidate % prime != 0 for prime in prime_list if prime*prime <= candidate):
+            prime_list.append(candidate)
+        candidate += 1
+    return prime_list
+
+
+def generate_day11(scale, random_generator):
+    n_monkeys = scaled(DAY11_N_MONKEYS, scale, minimum=2)
+    test_dividends = get_first_primes(n_monkeys)
+    random_generator.shuffle(test_dividends)
+    squaring_monkey_id = random_generator.randrange(n_monkeys)
+
+    lines = []
+    for monkey_id in range(n_monkeys):
+        starting_items = [random_generator.randint(*DAY11_STARTING_WORRY_RANGE) for _ in range(random_generator.randint(1, DAY11_MAXIMUM_N_STARTING_ITEMS))]
+        if monkey_id == squaring_monkey_id:
+            operation = "old * old"
+        elif random_generator.random() < DAY11_SUM_OPERATION_PROBABILITY:
+            operation = "old + {}".format(random_generator.randint(*DAY11_SUM_VALUE_RANGE))
+        else:
+            operation = "old * {}".format(random_generator.randint(*DAY11_MULTIPLICATION_VALUE_RANGE))
+        true_target, false_target = random_generator.sample([other_id for other_id in range(n_monkeys) if other_id != monkey_id], 2) if n_monkeys > 2 else (1-monkey_id, 1-monkey_id)
+
+        if monkey_id != 0:
+            lines.append("")
+        lines.append("Monkey {}:".format(monkey_id))
+        lines.append("  Starting items: " + ", ".join(map(str, starting_items)))
+        lines.append("  Operation: new = " + operation)
+        lines.append("  Test: divisible by {}".format(test_dividends[monkey_id]))
+        lines.append("    If true: throw to monkey {}".format(true_target))
+        lines.append("    If false: throw to monkey {}".format(false_target))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day12(scale, random_generator):
+    '''
+    The elevation grows one level at a time from left to right, so the central row is always a valid path between S (on the left) and E (on the right). Random cells in the rest of the grid are lowered, which creates dead ends and more starting squares of elevation a
+    '''
+    n_rows = scaled_side(DAY12_N_ROWS, scale)
+    n_cols = scaled_side(DAY12_N_COLS, scale)
+    central_row_idx = n_rows//2
+    lines = []
+    for row_idx in range(n_rows):
+        line = []
+        for col_idx in range(n_cols):
+            elevation = col_idx*DAY12_N_ELEVATION_LEVELS // n_cols
+            if row_idx != central_row_idx:
+                elevation = max(0, elevation - random_generator.randint(0, DAY12_MAXIMUM_ELEVATION_DROP))
+            line.append(string.ascii_lowercase[elevation])
+        lines.append(line)
+    lines[central_row_idx][0] = "S"
+    lines[central_row_idx][-1] = "E"
+    return "\n".join("".join(line) for line in lines) + "\n"
+
+
+def compare_packets(left_packet, right_packet):
+    # -1 if the packets are in the right order, 1 if they are not and 0 if the puzzle rules can not decide
+    if type(left_packet) is int and type(right_packet) is int:
+        return (left_packet > right_packet) - (left_packet < right_packet)
+    if type(left_packet) is int:
+        left_packet = [left_packet]
+    if type(right_packet) is int:
+        right_packet = [right_packet]
+    for left_value, right_value in zip(left_packet, right_packet):
+        comparison = compare_packets(left_value, right_value)
+        if comparison != 0:
+            return comparison
+    return (len(left_packet) > len(right_packet)) - (len(left_packet) < len(right_packet))
+
+
+def generate_packet(random_generator, depth=0):
+    packet = []
+    for _ in range(random_generator.randint(0, DAY13_MAXIMUM_LIST_LENGTH)):
+        if depth < DAY13_MAXIMUM_DEPTH and random_generator.random() < DAY13_NESTED_LIST_PROBABILITY:
+            packet.append(generate_packet(random_generator, depth+1))
+        else:
+            packet.append(random_generator.randint(0, DAY13_MAXIMUM_INTEGER))
+    return packet
+
+
+def generate_day13(scale, random_generator):
+    '''
+    The puzzle can not decide the order of two equivalent packets (e.g. [[1]] and [1]), so these are not generated inside a pair, and no packet is equivalent to a divider packet
+    '''
+    divider_packets = ([[2]], [[6]])
+    lines = []
+    for pair_idx in range(scaled(DAY13_N_PAIRS, scale)):
+        packet_pair = []
+        while len(packet_pair) < 2:
+            packet = generate_packet(random_generator)
+            if any(compare_packets(packet, other_packet) == 0 for other_packet in packet_pair + list(divider_packets)):
+                continue
+            packet_pair.append(packet)
+
+        if pair_idx != 0:
+            lines.append("")
+        lines += [str(packet).replace(" ", "") for packet in packet_pair]
+    return "\n".join(lines) + "\n"
+
+
+def generate_day14(scale, random_generator):
+    '''
+    All rocks are deeper than their horizontal distance to the sand source, so in the first part the sand can never pile up until blocking the source, it always ends falling into the abyss
+    '''
+    half_width = scaled_side(DAY14_HALF_WIDTH, scale)
+    minimum_depth = half_width + 2
+    maximum_depth = minimum_depth + scaled_side(DAY14_DEPTH, scale)
+    lines = []
+    for _ in range(scaled(DAY14_N_ROCK_PATHS, scale)):
+        x = random_generator.randint(DAY14_SAND_SOURCE_X-half_width, DAY14_SAND_SOURCE_X+half_width)
+        y = random_generator.randint(minimum_depth, maximum_depth)
+        path_nodes = [(x,y)]
+        is_horizontal = random_generator.random() < 0.5
+        for _ in range(random_generator.randint(1, DAY14_MAXIMUM_N_SEGMENTS)):
+            segment_length = random_generator.choice((-1,1)) * random_generator.randint(1, DAY14_MAXIMUM_SEGMENT_LENGTH)
+            if is_horizontal:
+                x = min(max(x + segment_length, DAY14_SAND_SOURCE_X-half_width), DAY14_SAND_SOURCE_X+half_width)
+            else:
+                y = min(max(y + segment_length, minimum_depth), maximum_depth)
+            if (x,y) != path_nodes[-1]:
+                path_nodes.append((x,y))
+            is_horizontal = not is_horizontal
+        lines.append(" -> ".join("{},{}".format(*path_node) for path_node in path_nodes))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day15(scale, random_generator):
+    '''
+    The sensors are placed on a jittered grid over the puzzle coordinate space, with ranges that cover the space between them. The ranges are cut so that no sensor reaches the (randomly placed) distress beacon
+    '''
+    n_sensors = scaled(DAY15_N_SENSORS, scale)
+    n_sensors_per_side = math.ceil(math.sqrt(n_sensors))
+    distance_between_sensors = DAY15_MAXIMUM_COORDINATE_POSITION // n_sensors_per_side
+    distress_beacon_x = random_generator.randint(0, DAY15_MAXIMUM_COORDINATE_POSITION)
+    distress_beacon_y = random_generator.randint(0, DAY15_MAXIMUM_COORDINATE_POSITION)
+
+    grid_cells = random_generator.sample(range(n_sensors_per_side**2), n_sensors)
+    lines = []
+    for grid_cell in grid_cells:
+        sensor_x = (grid_cell % n_sensors_per_side) * distance_between_sensors + distance_between_sensors//2 + random_generator.randint(-distance_between_sensors//4, distance_between_sensors//4)
+        sensor_y = (grid_cell // n_sensors_per_side) * distance_between_sensors + distance_between_sensors//2 + random_generator.randint(-distance_between_sensors//4, distance_between_sensors//4)
+        distance_to_distress_beacon = abs(sensor_x-distress_beacon_x) + abs(sensor_y-distress_beacon_y)
+        sensor_range = min(round(DAY15_RANGE_FACTOR*distance_between_sensors*random_generator.uniform(1, 1.1)), distance_to_distress_beacon-1)
+
+        beacon_x_distance = random_generator.randint(0, sensor_range)
+        beacon_x = sensor_x + random_generator.choice((-1,1)) * beacon_x_distance
+        beacon_y = sensor_y + random_generator.choice((-1,1)) * (sensor_range-beacon_x_distance)
+        lines.append("Sensor at x={}, y={}: closest beacon is at x={}, y={}".format(sensor_x, sensor_y, beacon_x, beacon_y))
+    return "\n".join(lines) + "\n"
+
+
+def get_valve_names(n_valves, starting_valve):
+    # names of uppercase letters, with the starting valve first. More letters are used if 2 letters are not enough
+    name_length = len(starting_valve)
+    while len(string.ascii_uppercase)**name_length < n_valves:
+        name_length += 1
+    valve_names = [starting_valve]
+    for name_characters in itertools.product(string.ascii_uppercase, repeat=name_length):
+        if len(valve_names) == n_valves:
+            break
+        if "".join(name_characters) != starting_valve:
+            valve_names.append("".join(name_characters))
+    return valve_names
+
+
+def generate_day16(scale, random_generator):
+    '''
+    The tunnels form a tree, as the solution follows every path between valves when mapping their distances, and the number of paths explodes with loops. Both the number of valves and the number of valves with flow grow with the scale, so the search of the best path grows exponentially
+    '''
+    n_valves = scaled(DAY16_N_VALVES, scale, minimum=2)
+    n_flowing_valves = min(scaled(DAY16_N_FLOWING_VALVES, scale), n_valves-1)
+    valve_names = get_valve_names(n_valves, DAY16_STARTING_VALVE)
+    random_generator.shuffle(valve_names)
+
+    neighbour_list = [[] for _ in range(n_valves)]
+    for valve_idx in range(1, n_valves):
+        parent_idx = random_generator.randrange(valve_idx)
+        neighbour_list[valve_idx].append(parent_idx)
+        neighbour_list[parent_idx].append(valve_idx)
+
+    # the starting valve has no flow
+    starting_valve_idx = valve_names.index(DAY16_STARTING_VALVE)
+    flow_rates = [0]*n_valves
+    for valve_idx in random_generator.sample([valve_idx for valve_idx in range(n_valves) if valve_idx != starting_valve_idx], n_flowing_valves):
+        flow_rates[valve_idx] = random_generator.randint(*DAY16_FLOW_RATE_RANGE)
+
+    lines = []
+    for valve_idx in range(n_valves):
+        neighbour_names = [valve_names[neighbour_idx] for neighbour_idx in neighbour_list[valve_idx]]
+        if len(neighbour_names) == 1:
+            tunnel_text = "tunnel leads to valve"
+        else:
+            tunnel_text = "tunnels lead to valves"
+        lines.append("Valve {} has flow rate={}; {} {}".format(valve_names[valve_idx], flow_rates[valve_idx], tunnel_text, ", ".join(neighbour_names)))
+    random_generator.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+
+def generate_day17(scale, random_generator):
+    return "".join(random_generator.choices("<>", k=scaled(DAY17_JET_PATTERN_LENGTH, scale))) + "\n"
+
+
+def generate_day18(scale, random_generator):
+    side_length = scaled_side(DAY18_SIDE_LENGTH, scale, n_dimensions=3)
+    n_cubes = min(scaled(DAY18_N_CUBES, scale), side_length**3)
+    lines = []
+    for cube_idx in random_generator.sample(range(side_length**3), n_cubes):
+        lines.append("{},{},{}".format(cube_idx % side_length, (cube_idx // side_length) % side_length, cube_idx // side_length**2))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day19(scale, random_generator):
+    lines = []
+    for blueprint_id in range(1, scaled(DAY19_N_BLUEPRINTS, scale)+1):
+        ore_robot_cost_ore, clay_robot_cost_ore, obsidian_robot_cost_ore, geode_robot_cost_ore = [random_generator.randint(*DAY19_ORE_COST_RANGE) for _ in range(4)]
+        obsidian_robot_cost_clay = random_generator.randint(*DAY19_OBSIDIAN_ROBOT_CLAY_COST_RANGE)
+        geode_robot_cost_obsidian = random_generator.randint(*DAY19_GEODE_ROBOT_OBSIDIAN_COST_RANGE)
+        lines.append("Blueprint {}: Each ore robot costs {} ore. Each clay robot costs {} ore. Each obsidian robot costs {} ore and {} clay. Each geode robot costs {} ore and {} obsidian.".format(blueprint_id, ore_robot_cost_ore, clay_robot_cost_ore, obsidian_robot_cost_ore, obsidian_robot_cost_clay, geode_robot_cost_ore, geode_robot_cost_obsidian))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day20(scale, random_generator):
+    numbers = [random_generator.choice((-1,1)) * random_generator.randint(1, DAY20_MAXIMUM_ABSOLUTE_VALUE) for _ in range(scaled(DAY20_N_NUMBERS, scale, minimum=2)-1)]
+    numbers.insert(random_generator.randint(0, len(numbers)), 0) # there has to be exactly one 0
+    return "\n".join(map(str, numbers)) + "\n"
+
+
+def combine_monkey_jobs(monkey_idxs, monkey_values, monkey_jobs, random_generator, human_dependent_idx=None):
+    '''
+    Randomly combines pairs of the given monkeys with math operations (creating new monkeys) until only one monkey is left, whose index is returned. Every value is a positive integer, so the operations can be done and also undone without fractions (the solution relies on str.isnumeric(), so it does not support negative numbers either)
+
+    The monkey whose value depends on the human (if given) is only combined with operations that can be undone to find a bigger human value: it is always on the left side of the operation. The values it is multiplied by are also returned, as the difference between human values has to be a multiple of them
+    '''
+    human_multipliers = []
+    while len(monkey_idxs) > 1:
+        left_idx, right_idx = random_generator.sample(monkey_idxs, 2)
+        if right_idx == human_dependent_idx:
+            left_idx, right_idx = right_idx, left_idx
+        left_value = monkey_values[left_idx]
+        right_value = monkey_values[right_idx]
+
+        possible_operations = ["+"]
+        if left_value > right_value:
+            possible_operations.append("-")
+        if left_value * right_value <= DAY21_MAXIMUM_MULTIPLICATION_RESULT:
+            possible_operations.append("*")
+        if left_value % right_value == 0:
+            possible_operations.append("/")
+        operation = random_generator.choice(possible_operations)
+        if operation == "+":
+            value = left_value + right_value
+        elif operation == "-":
+            value = left_value - right_value
+        elif operation == "*":
+            value = left_value * right_value
+        else:
+            value = left_value // right_value
+
+        if left_idx == human_dependent_idx:
+            human_dependent_idx = len(monkey_values)
+            if operation == "*":
+                human_multipliers.append(right_value)
+        monkey_idxs.remove(left_idx)
+        monkey_idxs.remove(right_idx)
+        monkey_idxs.append(len(monkey_values))
+        monkey_values.append(value)
+        monkey_jobs.append((left_idx, operation, right_idx))
+
+    return monkey_idxs[0], human_multipliers
+
+
+def generate_day21(scale, random_generator):
+    '''
+    The monkeys that depend on "humn" are on the left side of "root", as the solution expects. Once both sides are built, a monkey is added to the right side so that it is equal to the left side for a human number bigger than the one of the first part
+    '''
+    n_yelling_monkeys = scaled(DAY21_N_YELLING_MONKEYS, scale, minimum=3)
+    n_left_yelling_monkeys = random_generator.randint(1, n_yelling_monkeys-2)
+    monkey_values = [random_generator.randint(*DAY21_YELLED_NUMBER_RANGE) for _ in range(n_yelling_monkeys-1)] # the last yelling monkey is the added one
+    monkey_jobs = [None]*len(monkey_values) # None for the yelling monkeys, (left monkey index, operation, right monkey index) for the rest
+    human_idx = 0
+    left_idx, human_multipliers = combine_monkey_jobs(list(range(n_left_yelling_monkeys)), monkey_values, monkey_jobs, random_generator, human_dependent_idx=human_idx)
+    right_idx, _ = combine_monkey_jobs(list(range(n_left_yelling_monkeys, n_yelling_monkeys-1)), monkey_values, monkey_jobs, random_generator)
+
+    human_value_step = math.prod(human_multipliers)
+    second_part_left_value = monkey_values[left_idx] + human_value_step * max(1, (monkey_values[right_idx] - monkey_values[left_idx])//human_value_step + 1)
+    monkey_values.append(second_part_left_value - monkey_values[right_idx])
+    monkey_jobs.append(None)
+    monkey_values.append(second_part_left_value)
+    monkey_jobs.append((right_idx, "+", len(monkey_jobs)-1))
+    right_idx = len(monkey_values)-1
+    monkey_values.append(monkey_values[left_idx] + monkey_values[right_idx])
+    monkey_jobs.append((left_idx, "+", right_idx))
+
+    used_names = {DAY21_ROOT_MONKEY_NAME, DAY21_HUMAN_NAME}
+    monkey_names = []
+    for monkey_idx in range(len(monkey_values)):
+        if monkey_idx == human_idx:
+            monkey_names.append(DAY21_HUMAN_NAME)
+        elif monkey_idx == len(monkey_values)-1:
+            monkey_names.append(DAY21_ROOT_MONKEY_NAME)
+        else:
+            name = "".join(random_generator.choices(string.ascii_lowercase, k=DAY21_NAME_LENGTH))
+            while name in used_names:
+                name = "".join(random_generator.choices(string.ascii_lowercase, k=DAY21_NAME_LENGTH))
+            used_names.add(name)
+            monkey_names.append(name)
+
+    lines = []
+    for monkey_idx, monkey_job in enumerate(monkey_jobs):
+        if monkey_job is None:
+            lines.append("{}: {}".format(monkey_names[monkey_idx], monkey_values[monkey_idx]))
+        else:
+            lines.append("{}: {} {} {}".format(monkey_names[monkey_idx], monkey_names[monkey_job[0]], monkey_job[1], monkey_names[monkey_job[2]]))
+    random_generator.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+
+def generate_day22(scale, random_generator):
+    '''
+    The map follows the cube layout of the real puzzle files, which is the one hardcoded in the second part of the solution:
+     12
+     3
+    45
+    6
+    '''
+    face_columns_by_row = ((1,2), (1,), (0,1), (0,)) # columns (in faces) of the faces in each row of faces
+    lines = []
+    for face_columns in face_columns_by_row:
+        for _ in range(DAY22_CUBE_DIMENSIONS):
+            n_tiles = len(face_columns)*DAY22_CUBE_DIMENSIONS
+            tiles = [DAY22_SOLID_WALL if random_generator.random() < DAY22_WALL_PROBABILITY else DAY22_OPEN_TILE for _ in range(n_tiles)]
+            lines.append(" "*face_columns[0]*DAY22_CUBE_DIMENSIONS + "".join(tiles))
+    first_tile_idx = face_columns_by_row[0][0]*DAY22_CUBE_DIMENSIONS
+    lines[0] = lines[0][:first_tile_idx] + DAY22_OPEN_TILE + lines[0][first_tile_idx+1:] # the starting position is the leftmost open tile of the first row. Like in the real puzzle files, it is the leftmost tile
+    lines.append("")
+
+    path_description = [str(random_generator.randint(1, DAY22_MAXIMUM_N_STEPS))]
+    for _ in range(scaled(DAY22_N_INSTRUCTIONS, scale)-1):
+        path_description.append(random_generator.choice("RL"))
+        path_description.append(str(random_generator.randint(1, DAY22_MAXIMUM_N_STEPS)))
+    lines.append("".join(path_description))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day23(scale, random_generator):
+    n_rows = scaled_side(DAY23_N_ROWS, scale)
+    n_cols = scaled_side(DAY23_N_COLS, scale)
+    lines = ["".join("#" if random_generator.random() < DAY23_ELF_PROBABILITY else "." for _ in range(n_cols)) for _ in range(n_rows)]
+    return "\n".join(lines) + "\n"
+
+
+def generate_day24(scale, random_generator):
+    '''
+    Like in the real puzzle files, there are no vertical blizzards in the columns of the entrance and the exit, as they would leave the valley through them
+    '''
+    n_inner_rows = scaled_side(DAY24_N_ROWS, scale)
+    n_inner_cols = n_inner_rows*DAY24_COLS_PER_ROW
+    lines = ["#." + "#"*n_inner_cols]
+    for _ in range(n_inner_rows):
+        cells = []
+        for col_idx in range(n_inner_cols):
+            if random_generator.random() < DAY24_BLIZZARD_PROBABILITY:
+                if col_idx == 0 or col_idx == n_inner_cols-1:
+                    cells.append(random_generator.choice("<>"))
+                else:
+                    cells.append(random_generator.choice("<>^v"))
+            else:
+                cells.append(".")
+        lines.append("#" + "".join(cells) + "#")
+    lines.append("#"*n_inner_cols + ".#")
+    return "\n".join(lines) + "\n"
+
+
+def decimal_to_SNAFU(number):
+    SNAFU_number = ""
+    while number != 0:
+        digit = (number+2) % 5 - 2
+        SNAFU_number = SNAFU_DIGITS[digit] + SNAFU_number
+        number = (number-digit) // 5
+    return SNAFU_number
+
+
+def get_smallest_number_without_carries(minimum_number):
+    # smallest number from minimum_number on whose base 5 digits are all 0, 1 or 2, so that its conversion to SNAFU needs no carries
+    number = minimum_number
+    while True:
+        high_digit_positions = [position for position in range(int(math.log(number, 5))+2 if number > 0 else 1) if number // 5**position % 5 > 2]
+        if len(high_digit_positions) == 0:
+            return number
+        digit_weight = 5**(max(high_digit_positions)+1)
+        number = (number // digit_weight + 1) * digit_weight # the highest digit 3 or 4 and the ones below it become 0, adding 1 to the digit above it (which can become a 3 in turn)
+
+
+def generate_day25(scale, random_generator):
+    numbers = [random_generator.randint(1, 5**random_generator.randint(1, DAY25_MAXIMUM_N_DIGITS)) for _ in range(scaled(DAY25_N_NUMBERS, scale)-1)]
+    numbers.append(get_smallest_number_without_carries(sum(numbers)+1) - sum(numbers)) # see the docstring of this module
+    lines = [decimal_to_SNAFU(number) for number in numbers]
+    return "\n".join(lines) + "\n"
+
+
+INPUT_GENERATORS = {
+    1: generate_day1,
+    2: generate_day2,
+    3: generate_day3,
+    4: generate_day4,
+    5: generate_day5,
+    6: generate_day6,
+    7: generate_day7,
+    8: generate_day8,
+    9: generate_day9,
+    10: generate_day10,
+    11: generate_day11,
+    12: generate_day12,
+    13: generate_day13,
+    14: generate_day14,
+    15: generate_day15,
+    16: generate_day16,
+    17: generate_day17,
+    18: generate_day18,
+    19: generate_day19,
+    20: generate_day20,
+    21: generate_day21,
+    22: generate_day22,
+    23: generate_day23,
+    24: generate_day24,
+    25: generate_day25,
+}
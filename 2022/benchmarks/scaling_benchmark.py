@@ -0,0 +1,157 @@
+'''
+Runs the solutions of several days over synthetic inputs of increasing scale (see input_generators.py), to show how the run time of each part grows with the size of the input and where each algorithm stops scaling.
+
+Each day and scale is run with run_all_days.run_day() in a separate process, so that a solution that takes too long can be stopped without stopping the whole benchmark. Once a day does not finish in time (or fails), bigger scales of that day are not run, as they would only take longer.
+
+The growth column estimates the exponent k of run time ~ (input size)^k between each scale and the previous one: around 1 for linear algorithms, 2 for quadratic ones, and much bigger for exponential ones. Very small run times are noisy, so the growth is only reliable for the bigger scales
+
+Run from the 2022 folder: python -m benchmarks.scaling_benchmark [days] [--scales 1 10 100]
+'''
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+from dataclasses import dataclass, asdict
+
+import run_all_days
+from benchmarks.input_generators import INPUT_GENERATORS
+
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_TIMEOUT = 60 # seconds for each day and scale
+DEFAULT_SEED = 2022
+GENERATED_FILE_NAME_FORMAT = "day{}_scale{}.txt"
+
+BYTES_PER_KIBIBYTE = 1024
+MINIMUM_TIME_FOR_GROWTH = 1e-4 # seconds. The growth is not computed for faster parts, as timing noise dominates them
+MINIMUM_SIZE_RATIO_FOR_GROWTH = 1.5 # the growth is not computed for inputs that (almost) did not grow, such as the ones of day 10
+
+
+@dataclass
+class ScalingMeasurement:
+    day: int
+    scale: float
+    input_size: int # bytes of the generated puzzle file
+    part: str
+    wall_time: float # seconds
+    cpu_time: float # seconds
+    peak_memory: int # bytes, None if not measured
+    growth: float = None # exponent of the wall time growth with the input size, compared with the previous scale. None for the first scale
+    error: str = None # description of the exception raised by the part, if any. The times and the memory are None then
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Advent of Code 2022: measure how the solutions scale with synthetic inputs bigger than the puzzle inputs")
+    parser.add_argument("days", type=int, nargs='*', help="days to run. If no days are given, all days are run")
+    parser.add_argument("-s", "--scales", type=float, nargs='+', default=DEFAULT_SCALES, help="input scales to run, where 1 is roughly the size of a real puzzle input. Default: " + " ".join(map(str, DEFAULT_SCALES)))
+    parser.add_argument("-t", "--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds that each day and scale is allowed to run. Bigger scales of a day are skipped once it takes longer. Default: {}".format(DEFAULT_TIMEOUT))
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="seed of the input generators, so that the inputs can be reproduced. Default: {}".format(DEFAULT_SEED))
+    parser.add_argument("-o", "--output-folder", dest="output_folder", type=str, default=None, help="folder in which to keep the generated inputs. By default they are written to a temporary folder and deleted at the end")
+    parser.add_argument("--json", dest="print_json", action="store_true", help="print the measurements as JSON instead of as a table")
+    parser.add_argument("--memory", dest="trace_memory", action="store_true", help="also measure the peak memory. tracemalloc slows down the measured code, so the times are less accurate with it")
+    args = parser.parse_args()
+    if args.days == []:
+        args.days = list(range(1,run_all_days.N_DAYS+1))
+    args.scales = sorted(args.scales)
+    return args
+
+
+def generate_puzzle_file(day, scale, seed, folder):
+    random_generator = random.Random("{}/{}/{}".format(seed, day, scale)) # every day and scale has its own seed, so the inputs do not depend on which other days are run
+    file_contents = INPUT_GENERATORS[day](scale, random_generator)
+    file_name = os.path.join(folder, GENERATED_FILE_NAME_FORMAT.format(day, scale))
+    with open(file_name, "w") as file:
+        file.write(file_contents)
+    return file_name, len(file_contents)
+
+
+def run_day_with_timeout(day, file_name, timeout, trace_memory):
+    # returns the measurements of run_all_days.run_day(), or None if the day did not finish in time
+    with multiprocessing.Pool(1) as pool: # the pool is terminated when leaving the with block, stopping the day if it is still running
+        async_measurements = pool.apply_async(run_all_days.run_day, (day, file_name, False, trace_memory))
+        try:
+            return async_measurements.get(timeout)
+        except multiprocessing.TimeoutError:
+            return None
+
+
+def get_growth(wall_time, input_size, previous_wall_time, previous_input_size):
+    if wall_time is None or previous_wall_time is None or input_size < MINIMUM_SIZE_RATIO_FOR_GROWTH*previous_input_size or min(wall_time, previous_wall_time) < MINIMUM_TIME_FOR_GROWTH:
+        return None
+    return math.log(wall_time/previous_wall_time) / math.log(input_size/previous_input_size)
+
+
+def benchmark_day(day, scales, timeout, seed, folder, trace_memory):
+    scaling_measurements = []
+    previous_wall_times = {} # indexed by part
+    previous_input_size = None
+    for scale in scales:
+        file_name, input_size = generate_puzzle_file(day, scale, seed, folder)
+        try:
+            measurements = run_day_with_timeout(day, file_name, timeout, trace_memory)
+        except Exception as exception:
+            print("Day {} failed at scale {} ({}: {}). Skipping bigger scales".format(day, scale, type(exception).__name__, exception), file=sys.stderr)
+            break
+        if measurements is None:
+            print("Day {} did not finish in {} seconds at scale {}. Skipping bigger scales".format(day, timeout, scale), file=sys.stderr)
+            break
+
+        for measurement in measurements:
+            growth = get_growth(measurement.wall_time, input_size, previous_wall_times.get(measurement.part), previous_input_size)
+            scaling_measurements.append(ScalingMeasurement(day, scale, input_size, measurement.part, measurement.wall_time, measurement.cpu_time, measurement.peak_memory, growth, measurement.error))
+            previous_wall_times[measurement.part] = measurement.wall_time
+        previous_input_size = input_size
+
+        failed_measurements = [measurement for measurement in measurements if measurement.error is not None] # run_day returns the steps that raise with their error instead of raising
+        if len(failed_measurements) != 0:
+            print("Day {} failed at scale {} ({}: {}). Skipping bigger scales".format(day, scale, failed_measurements[0].part, failed_measurements[0].error), file=sys.stderr)
+            break
+
+    return scaling_measurements
+
+
+def print_scaling_table(scaling_measurements):
+    print("{:>3}  {:>7}  {:>12}  {:<6}  {:>13}  {:>12}  {:>17}  {:>6}".format("Day", "Scale", "Input (KiB)", "Part", "Wall time (s)", "CPU time (s)", "Peak memory (MiB)", "Growth"))
+    for measurement in scaling_measurements:
+        if measurement.error is not None:
+            print("{:>3}  {:>7g}  {:>12.1f}  {:<6}  {:>13}  {:>12}  {:>17}  {:>6}  failed with {}".format(measurement.day, measurement.scale, measurement.input_size / BYTES_PER_KIBIBYTE, measurement.part, "-", "-", "-", "-", measurement.error))
+            continue
+        if measurement.peak_memory is None:
+            peak_memory = "-"
+        else:
+            peak_memory = "{:.2f}".format(measurement.peak_memory / run_all_days.BYTES_PER_MEBIBYTE)
+        if measurement.growth is None:
+            growth = "-"
+        else:
+            growth = "{:.2f}".format(measurement.growth)
+        print("{:>3}  {:>7g}  {:>12.1f}  {:<6}  {:>13.4f}  {:>12.4f}  {:>17}  {:>6}".format(measurement.day, measurement.scale, measurement.input_size / BYTES_PER_KIBIBYTE, measurement.part, measurement.wall_time, measurement.cpu_time, peak_memory, growth))
+
+
+def main(args):
+    if args.output_folder is None:
+        temporary_folder = tempfile.TemporaryDirectory()
+        folder = temporary_folder.name
+    else:
+        temporary_folder = None
+        folder = args.output_folder
+        os.makedirs(folder, exist_ok=True)
+
+    scaling_measurements = []
+    for day in args.days:
+        scaling_measurements += benchmark_day(day, args.scales, args.timeout, args.seed, folder, args.trace_memory)
+
+    if temporary_folder is not None:
+        temporary_folder.cleanup()
+
+    if args.print_json:
+        print(json.dumps([asdict(measurement) for measurement in scaling_measurements], indent=2))
+    else:
+        print_scaling_table(scaling_measurements)
+
+
+if __name__ == "__main__":
+    main(parse_arguments())
@@ -1,5 +1,15 @@
 import argparse
+import heapq
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines, iterate_line_stream, open_line_stream, add_streaming_argument
+from profiling import add_profiling_arguments, get_part_profiler, run_profiled
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 1
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day1.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day1_example.txt"
 
@@ -9,60 +19,120 @@ NUMBER_OF_ELVES = 3
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 1: Calorie Counting")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
+    add_streaming_argument(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler, args.streaming
 
 
-def solve_first_part(lines):
-    most_calories = 0
-    current_calories = 0
-    for line in lines:
-        if line == '':
-            if(current_calories > most_calories):
-                most_calories = current_calories
-            current_calories = 0
-                
-        else:
-            current_calories += int(line)
+def get_most_calories(calories_by_elf, n_elves=NUMBER_OF_ELVES):
+    '''
+    Returns the calories carried by the n_elves Elves that carry the most, from lowest to highest, for an array with the calories of every Elf. If there are fewer Elves, the list starts with zeros.
+
+    np.partition places the n_elves biggest values at the end of the array in linear time, so only those have to be sorted, instead of sorting the calories of every Elf (or sorting the top list every time it changes)
+    '''
+    n_most_calories = min(n_elves, len(calories_by_elf))
+    if n_most_calories == 0:
+        return [0]*n_elves
+    most_calories_array = np.sort(np.partition(calories_by_elf, len(calories_by_elf)-n_most_calories)[-n_most_calories:])
+    return [0]*(n_elves-n_most_calories) + most_calories_array.tolist()
 
-    print("The Elf that carries the most calories carries", most_calories)
 
+def get_most_calories_from_stream(calories_by_elf, n_elves=NUMBER_OF_ELVES):
+    # same as get_most_calories, for any iterable of calories (e.g. a generator that reads a stream) instead of an array. heapq.nlargest keeps a heap of at most n_elves values while it iterates
+    most_calories_list = sorted(heapq.nlargest(n_elves, calories_by_elf))
+    return [0]*(n_elves-len(most_calories_list)) + most_calories_list
 
-def solve_second_part(lines):
-    most_calories_array = [0 for _ in range(NUMBER_OF_ELVES)]
+
+def solve_first_part(calories_by_elf):
+    if len(calories_by_elf) == 0:
+        return PuzzleResult(0)
+    return PuzzleResult(int(calories_by_elf.max()))
+
+
+def solve_second_part(calories_by_elf, n_elves=NUMBER_OF_ELVES):
+    most_calories_list = get_most_calories(calories_by_elf, n_elves)
+    sum_most_carried_calories = sum(most_calories_list)
+    return PuzzleResult(sum_most_carried_calories, {"most_calories_list": most_calories_list})
+
+
+def iterate_elf_calories(lines):
+    # yields the calories carried by each Elf, whose inventories are separated by empty lines
     current_calories = 0
     for line in lines:
-        if line == '':
-            if(current_calories > most_calories_array[0]):
-                most_calories_array[0] = current_calories
-                most_calories_array.sort() # place the lowest amount of calories at the beginning of the array
+        if len(line) == 0:
+            yield current_calories
             current_calories = 0
-                
         else:
             current_calories += int(line)
+    yield current_calories
 
-    sum_most_carried_calories = sum(most_calories_array)
-    print("The {} Elves that carry most calories carry a total of {}. They carry {}".format(NUMBER_OF_ELVES,sum_most_carried_calories,most_calories_array[0]), end='')
-    for elve_idx in range(1,NUMBER_OF_ELVES-1):
-        print(", {}".format(most_calories_array[elve_idx]), end='')
-    print(" and {} calories".format(most_calories_array[-1]))
 
+def solve_both_parts(lines):
+    '''
+    Solves both parts in a single pass over any iterable of lines (e.g. an open file or sys.stdin), so that the lines do not have to be kept in memory. Only the calories of the current Elf and the NUMBER_OF_ELVES most calories are kept.
 
-def main(file_name):    
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-        lines += [""] # Be sure that there is an extra empty line at the end. This is just to make sure to check the maximum values in the upcoming loops of the functions
+    The Elf that carries the most calories (first part) is the last one of the NUMBER_OF_ELVES that carry the most (second part), so both answers come from the same loop
+    '''
+    most_calories_list = get_most_calories_from_stream(iterate_elf_calories(lines))
+    first_part_result = PuzzleResult(most_calories_list[-1])
+    second_part_result = PuzzleResult(sum(most_calories_list), {"most_calories_list": most_calories_list})
+    return first_part_result, second_part_result
 
-    solve_first_part(lines)
-    solve_second_part(lines)
+
+def parse_puzzle_file(lines):
+    '''
+    Returns a flat array with the calories of every item of every Elf, in the order of the file, and the offsets in that array at which the items of each Elf start. The inventories of the Elves are separated by one or more empty lines
+    '''
+    item_lines = [line for line in lines if len(line) != 0]
+    item_calories = np.fromiter(map(int, item_lines), dtype=np.int64, count=len(item_lines)) # int() reads bytes directly, without creating a str for each line
+
+    is_item_line = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines)) != 0
+    is_first_item_of_elf = is_item_line.copy()
+    is_first_item_of_elf[1:] &= ~is_item_line[:-1] # items right after an empty line (or at the beginning of the file)
+    elf_offsets = np.flatnonzero(is_first_item_of_elf[is_item_line])
+    return item_calories, elf_offsets
+
+
+def get_calories_by_elf(item_calories, elf_offsets):
+    # sums the calories of the items of each Elf at once: np.add.reduceat adds the values between each offset and the next one
+    if len(elf_offsets) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.add.reduceat(item_calories, elf_offsets)
+
+
+def read_puzzle_input(file_name):
+    calories_by_elf = get_calories_by_elf(*parse_puzzle_file(list(iterate_lines(file_name, as_bytes=True))))
+    return (calories_by_elf,), (calories_by_elf,) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, answer_cache=None, part_profiler=None, streaming=False):
+    if streaming:
+        with open_line_stream(file_name) as line_stream:
+            first_part_result, second_part_result = run_profiled(part_profiler, "both", solve_both_parts, iterate_line_stream(line_stream))
+    else:
+        puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+        first_part_result = puzzle_solver.solve_first_part()
+        second_part_result = puzzle_solver.solve_second_part()
+
+    print("The Elf that carries the most calories carries", first_part_result.answer)
+
+    most_calories_list = second_part_result.diagnostics["most_calories_list"]
+    print("The {} Elves that carry most calories carry a total of {}. They carry {}".format(NUMBER_OF_ELVES,second_part_result.answer,most_calories_list[0]), end='')
+    for elve_idx in range(1,NUMBER_OF_ELVES-1):
+        print(", {}".format(most_calories_list[elve_idx]), end='')
+    print(" and {} calories".format(most_calories_list[-1]))
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
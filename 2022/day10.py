@@ -1,14 +1,23 @@
 import argparse
-import numpy as np
+import sys
+from dataclasses import dataclass
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines, iterate_line_stream, open_line_stream, add_streaming_argument
+from profiling import add_profiling_arguments, get_part_profiler, run_profiled
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 10
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day10.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day10_example.txt"
 
 CYCLES_OF_INTEREST = (20,60,100,140,180,220)
+INITIAL_REGISTER_X = 1
 
 HEIGHT_CRT_SCREEN = 6
 WIDTH_CRT_SCREEN = 40
-CYCLES_OF_INTEREST_PART2 = (40,80,120,160,200,240)
 
 # these first two characters are the default suggested by the input of the day. They are commente out as the rendered output is easier to read if using others
 # MATCH_PRINTING_CHAR = "#" # default
@@ -20,97 +29,142 @@ EMPTY_PRINTING_CHAR = " "
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 10: Cathode-Ray Tube")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
+    add_streaming_argument(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler, args.streaming
 
 
 
-def increase_and_check_cycle(cycle_count, register_X, signal_strength, cycles_of_interest):
-    cycle_count += 1
-    if cycle_count in cycles_of_interest:
-        signal_strength += cycle_count*register_X
-    return cycle_count, signal_strength
+@dataclass
+class Instruction:
+    n_cycles: int
+    get_register_X_increment: object # function that returns what the instruction adds to X when it finishes, from its arguments (the rest of the words of its line). It can not depend on the value of X, so that the values of X of all the cycles come from a cumulative sum
 
 
-def solve_first_part(lines):
-    register_X = 1
-    signal_strength = 0
-    cycle_count = 0
+# New instructions only need to be added here
+INSTRUCTION_SET = {
+    "noop": Instruction(1, lambda arguments: 0),
+    "addx": Instruction(2, lambda arguments: int(arguments[0])),
+}
+
+
+def compile_program(lines, instruction_set=INSTRUCTION_SET):
+    # returns two arrays with the number of cycles of every instruction and what it adds to X
+    n_cycles_by_instruction = []
+    register_X_increments = []
     for line in lines:
-        line_split = line.split(" ")
-        instruction = line_split[0]
-        if instruction == "addx":
-            value_V = int(line_split[1])
-            cycle_count, signal_strength = increase_and_check_cycle(cycle_count, register_X, signal_strength, CYCLES_OF_INTEREST)
-            cycle_count, signal_strength = increase_and_check_cycle(cycle_count, register_X, signal_strength, CYCLES_OF_INTEREST)
-            register_X += value_V
-
-        elif instruction == "noop":
-            cycle_count, signal_strength = increase_and_check_cycle(cycle_count, register_X, signal_strength, CYCLES_OF_INTEREST)
-        
-        
-    print("The total signal strength is", signal_strength)
- 
-
-
-class CycleCountter:
-    def __init__(self, cycles_of_interest):
-        self.screen_row = 0
-        self.screen_col = 0
-        self.cycle_count = 0
-        self.screen_CRT = np.zeros([HEIGHT_CRT_SCREEN,WIDTH_CRT_SCREEN],dtype="str")
-        self.cycles_of_interest = cycles_of_interest
-
-    def increase_and_check_cycle(self, register_X):
-        if self.screen_col == register_X or (self.screen_col+1) == register_X or (self.screen_col-1) == register_X:
-            self.screen_CRT[self.screen_row, self.screen_col] = MATCH_PRINTING_CHAR
-        else:
-            self.screen_CRT[self.screen_row, self.screen_col] = EMPTY_PRINTING_CHAR
-
-        self.cycle_count += 1
-        if self.cycle_count in self.cycles_of_interest:
-            self.screen_row += 1
-            self.screen_col = 0
-        else:
-            self.screen_col += 1
-
-
-def solve_second_part(lines):
-    register_X = 1
-    cycle_counter = CycleCountter(CYCLES_OF_INTEREST_PART2)
+        instruction_name, *arguments = line.split(" ")
+        instruction = instruction_set.get(instruction_name)
+        if instruction is None:
+            raise ValueError("Unknown instruction {!r}".format(instruction_name))
+        n_cycles_by_instruction.append(instruction.n_cycles)
+        register_X_increments.append(instruction.get_register_X_increment(arguments))
+    return np.array(n_cycles_by_instruction, dtype=np.int64), np.array(register_X_increments, dtype=np.int64)
+
+
+def get_register_X_by_cycle(n_cycles_by_instruction, register_X_increments):
+    '''
+    Returns an array with the value of X during every cycle (the cycle n is at the index n-1). X only changes at the end of an instruction, so it keeps during all the cycles of an instruction the value it has when the instruction starts: the initial value plus the increments of all the instructions before it
+    '''
+    register_X_by_instruction = INITIAL_REGISTER_X + np.cumsum(register_X_increments) - register_X_increments
+    return np.repeat(register_X_by_instruction, n_cycles_by_instruction)
+
+
+def get_signal_strength(register_X_by_cycle, cycles_of_interest=CYCLES_OF_INTEREST):
+    # adds the signal strength (cycle times X) of all the cycles of interest at once. Cycles after the end of the program are ignored
+    cycles_of_interest = np.array(cycles_of_interest, dtype=np.int64)
+    cycles_of_interest = cycles_of_interest[(cycles_of_interest >= 1) & (cycles_of_interest <= len(register_X_by_cycle))]
+    return int(np.sum(cycles_of_interest * register_X_by_cycle[cycles_of_interest-1]))
+
+
+def render_screen(register_X_by_cycle):
+    '''
+    Draws a pixel in every cycle, going through the rows of the screen from left to right. The pixel is lit if the sprite, 3 pixels wide and centered at X, is over it, which is checked for all cycles at once. The cycles after the last pixel of the screen draw nothing, and the pixels that are not reached are left blank
+    '''
+    n_screen_rows = HEIGHT_CRT_SCREEN
+    register_X_by_cycle = register_X_by_cycle[:n_screen_rows*WIDTH_CRT_SCREEN]
+    n_cycles = len(register_X_by_cycle)
+    pixel_col_idxs = np.arange(n_cycles) % WIDTH_CRT_SCREEN
+    is_pixel_lit = np.abs(register_X_by_cycle - pixel_col_idxs) <= 1
+
+    screen_CRT = np.full(n_screen_rows*WIDTH_CRT_SCREEN, "", dtype="<U1")
+    screen_CRT[:n_cycles] = np.where(is_pixel_lit, MATCH_PRINTING_CHAR, EMPTY_PRINTING_CHAR)
+    return "\n".join("".join(screen_row) for screen_row in screen_CRT.reshape(n_screen_rows, WIDTH_CRT_SCREEN).tolist())
+
+
+def solve_first_part(register_X_by_cycle):
+    return PuzzleResult(get_signal_strength(register_X_by_cycle))
+
+
+def solve_second_part(register_X_by_cycle):
+    rendered_screen = render_screen(register_X_by_cycle)
+    return PuzzleResult(rendered_screen) # the letters have to be read from the rendered screen
+
+
+def solve_both_parts(lines):
+    '''
+    Solves both parts in a single pass over any iterable of lines (e.g. an open file or sys.stdin), keeping only the current row of the screen in memory: the signal strength is added as each cycle of interest arrives, and each row of the screen is drawn once its last pixel is. The reading stops once the screen is complete and all the cycles of interest are passed, as the rest of the program does not change the result
+    '''
+    cycles_of_interest = set(CYCLES_OF_INTEREST)
+    n_screen_cycles = HEIGHT_CRT_SCREEN*WIDTH_CRT_SCREEN
+    n_needed_cycles = max(n_screen_cycles, max(CYCLES_OF_INTEREST))
+
+    register_X = INITIAL_REGISTER_X
+    signal_strength = 0
+    screen_rows = []
+    screen_row = []
+    cycle = 0
     for line in lines:
-        line_split = line.split(" ")
-        instruction = line_split[0]
-        if instruction == "addx":
-            value_V = int(line_split[1])
-            cycle_counter.increase_and_check_cycle(register_X)
-            cycle_counter.increase_and_check_cycle(register_X)
-            register_X += value_V
-
-        elif instruction == "noop":
-            cycle_counter.increase_and_check_cycle(register_X)
-        
-
-    for height_idx in range(HEIGHT_CRT_SCREEN):
-        for width_idx in range(WIDTH_CRT_SCREEN):
-            print(cycle_counter.screen_CRT[height_idx,width_idx], end = '')
-        print("")
-        
-
-def main(file_name): 
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
-
-    solve_first_part(lines)
-    solve_second_part(lines)
+        instruction_name, *arguments = line.split(" ")
+        instruction = INSTRUCTION_SET.get(instruction_name)
+        if instruction is None:
+            raise ValueError("Unknown instruction {!r}".format(instruction_name))
+        for _ in range(instruction.n_cycles):
+            cycle += 1
+            if cycle in cycles_of_interest:
+                signal_strength += cycle*register_X
+            if cycle <= n_screen_cycles:
+                screen_row.append(MATCH_PRINTING_CHAR if abs(register_X - len(screen_row)) <= 1 else EMPTY_PRINTING_CHAR)
+                if len(screen_row) == WIDTH_CRT_SCREEN:
+                    screen_rows.append("".join(screen_row))
+                    screen_row = []
+        if cycle >= n_needed_cycles:
+            break
+        register_X += instruction.get_register_X_increment(arguments)
+
+    if len(screen_row) != 0: # the program ended in the middle of a row
+        screen_rows.append("".join(screen_row))
+    screen_rows += [""]*(HEIGHT_CRT_SCREEN - len(screen_rows))
+    return PuzzleResult(signal_strength), PuzzleResult("\n".join(screen_rows))
+
+
+def read_puzzle_input(file_name):
+    register_X_by_cycle = get_register_X_by_cycle(*compile_program(iterate_lines(file_name)))
+
+    return (register_X_by_cycle,), (register_X_by_cycle,) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, answer_cache=None, part_profiler=None, streaming=False):
+    if streaming:
+        with open_line_stream(file_name) as line_stream:
+            first_part_result, second_part_result = run_profiled(part_profiler, "both", solve_both_parts, iterate_line_stream(line_stream))
+    else:
+        puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+        first_part_result = puzzle_solver.solve_first_part()
+        second_part_result = puzzle_solver.solve_second_part()
+
+    print("The total signal strength is", first_part_result.answer)
+    print(second_part_result.answer)
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
\ No newline at end of file
+    main(*parse_file_name())
\ No newline at end of file
@@ -1,16 +1,27 @@
 import argparse
+import sys
 import copy
-import numpy as np
 import enum
+import functools
+import math
 from dataclasses import dataclass
+from puzzle_result import PuzzleResult
+from fast_input import iterate_blocks
+from profiling import add_profiling_arguments, get_part_profiler
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 11
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day11.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day11_example.txt"
 
 
-MONKEY_TEXT_LENGTH = 7
 N_ROUNDS = 20
 N_ROUNDS_PART2 = 10000
+INT64_MAXIMUM = 2**63 - 1
+UINT64_MAXIMUM = 2**64 - 1
 
 class OperationType(enum.Enum):
     SUM_OPERATION = enum.auto()
@@ -31,47 +42,46 @@ class Monkey:
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 11: Monkey in the Middle")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler
 
 
 
-def parse_puzzle_file(lines):
+def parse_puzzle_file(monkey_blocks):
     monkey_list = []
-    are_there_more_monkeys = len(lines[0:]) > MONKEY_TEXT_LENGTH
-    line_index = 0
-    while are_there_more_monkeys == True:
-        split_item_line = lines[line_index + 1].replace(",","").split(" ")
+    for monkey_lines in monkey_blocks: # the first line of each block is the name of the monkey, which is its position in the list
+        split_item_line = monkey_lines[1].replace(",","").split(" ")
         new_items = [[] for _ in range(len(split_item_line[4:]))]
         for item_idx in range(len(split_item_line[4:])):
             new_items[item_idx] = int(split_item_line[4 +item_idx ])
 
-        if lines[line_index + 2].split(" ")[-1] == "old":
+        if monkey_lines[2].split(" ")[-1] == "old":
             new_operation_type = OperationType.EXPONENTIATION_OPERATION
             new_operation_value = 0
         else:
-            if lines[line_index + 2].find("*") != -1:
+            if monkey_lines[2].find("*") != -1:
                 new_operation_type = OperationType.MULTIPLICATION_OPERATION
             else:
                 new_operation_type = OperationType.SUM_OPERATION
-            new_operation_value = int(lines[line_index + 2].split(" ")[-1])
+            new_operation_value = int(monkey_lines[2].split(" ")[-1])
 
-        new_test_dividend = int(lines[line_index + 3].split(" ")[-1])
+        new_test_dividend = int(monkey_lines[3].split(" ")[-1])
 
-        new_true_target = int(lines[line_index + 4].split(" ")[-1])
+        new_true_target = int(monkey_lines[4].split(" ")[-1])
 
-        new_false_target = int(lines[line_index + 5].split(" ")[-1])
+        new_false_target = int(monkey_lines[5].split(" ")[-1])
 
         monkey_list.append( Monkey(new_items, new_operation_type, new_operation_value, new_test_dividend, new_true_target, new_false_target) )
 
-        are_there_more_monkeys = len(lines[line_index+MONKEY_TEXT_LENGTH-1:]) >= MONKEY_TEXT_LENGTH
-        line_index += MONKEY_TEXT_LENGTH
-
     return monkey_list
 
 
@@ -107,68 +117,143 @@ def solve_first_part(monkey_list):
     for idx, monkey in enumerate(monkey_list):
         n_inspections_list[idx] = monkey.n_inspections
 
-    print("The monkey business level is", np.sort(n_inspections_list)[-1] * np.sort(n_inspections_list)[-2])
+    monkey_business_level = sorted(n_inspections_list)[-1] * sorted(n_inspections_list)[-2]
+    return PuzzleResult(monkey_business_level, {"n_inspections_list": n_inspections_list})
  
 
-def solve_second_part(monkey_list):
+def solve_second_part(monkey_list, n_rounds=N_ROUNDS_PART2):
     '''
     As the item_worry values are no longer divided by 3 in each iteration, and the number of rounds has increased to 10000, reusing the old code to solve the second part of this challenge is, although possible, absurdly inefficient. There are exponentations of always-increasing numbers, these create a risk of overflowing and do slow down the program too much (maybe days).
 
     The only important operation that alters the desired result (the number of times each monkey manipulated an item), is the operation that decides which monkey receives which item. This is just a module operation, which uses different but predefined (in the given text file) numbers. 
-    The remainder of a number N divided by another D is the same remainder as the remainder of the remainder of N divided by D divided by D (i.e. N % D == (N % D) % D)), also when another number A is added to N (i.e. (N+A) % D == ((N%D)+A) % D)). Therefore, a number D that works with all given dividend numbers can be used to keep the item_worry (N in this case) values low, and still give the same result for this challenge. This D can be the multiplication between all given dividend numbers (e.g., if D = d1*d2, (N+A) % d1 == (N%D+A) % d1 and (N+A) % d2 == (N%D+A) % d2), as this is the common multiple of the dividends.
+    The remainder of a number N divided by another D is the same remainder as the remainder of the remainder of N divided by D divided by D (i.e. N % D == (N % D) % D)), also when another number A is added to N (i.e. (N+A) % D == ((N%D)+A) % D)). Therefore, a number D that works with all given dividend numbers can be used to keep the item_worry (N in this case) values low, and still give the same result for this challenge. This D can be the multiplication between all given dividend numbers (e.g., if D = d1*d2, (N+A) % d1 == (N%D+A) % d1 and (N+A) % d2 == (N%D+A) % d2), as this is a common multiple of the dividends, but the smallest D, and so the smallest worry values, is their least common multiple.
 
     Note: It was considered to eliminate the exponentation altogether, but the idea can not work, e.g in many cases (N*N-A) % D != (N-A) % D
+
+    Every item moves between the monkeys on its own: where it goes and which monkeys inspect it only depend on its own worry level, not on the other items or on the order in which a monkey inspects them. So the state of an item at the start of a round, (monkey, worry level modulo the common dividend), decides all its next rounds, and there are finitely many states. The items are simulated together, in a batch per monkey, until the state of each item repeats (see count_item_inspections), and from then on its inspections follow arithmetically, so the number of rounds can be far beyond N_ROUNDS_PART2
     '''
+    common_dividend = get_least_common_multiple([monkey.test_dividend for monkey in monkey_list])
+    worry_dtype = get_worry_dtype(monkey_list, common_dividend)
 
-    n_monkeys = len(monkey_list)
-    common_dividend = 1
-    for current_monkey_id in range(n_monkeys):
-        n_items = len(monkey_list[current_monkey_id].items)
-        for _ in range(n_items):
-            common_dividend *= monkey_list[current_monkey_id].test_dividend
+    n_inspections_list, n_simulated_rounds, item_cycle_lengths = count_item_inspections(monkey_list, n_rounds, common_dividend, worry_dtype)
 
+    monkey_business_level = sorted(n_inspections_list)[-1] * sorted(n_inspections_list)[-2]
+    return PuzzleResult(monkey_business_level, {"n_inspections_list": n_inspections_list, "n_simulated_rounds": n_simulated_rounds, "item_cycle_lengths": item_cycle_lengths, "common_dividend": common_dividend, "worry_dtype": str(worry_dtype)})
 
-    for _ in range(N_ROUNDS_PART2):
-        for current_monkey_id in range(n_monkeys):
-            
-            n_items = len(monkey_list[current_monkey_id].items)
-            for _ in range(n_items):
-                item_worry = monkey_list[current_monkey_id].items.pop(0)
-                
-                if monkey_list[current_monkey_id].operation_type == OperationType.EXPONENTIATION_OPERATION:
-                    item_worry *= item_worry
-                elif monkey_list[current_monkey_id].operation_type == OperationType.MULTIPLICATION_OPERATION:
-                    item_worry *= monkey_list[current_monkey_id].operation_value
-                else:
-                    item_worry += monkey_list[current_monkey_id].operation_value
 
-                if (item_worry % monkey_list[current_monkey_id].test_dividend) == 0:
-                    target_monkey = monkey_list[current_monkey_id].true_target
-                else:
-                    target_monkey = monkey_list[current_monkey_id].false_target
+def get_least_common_multiple(numbers):
+    return functools.reduce(lambda multiple, number: multiple * number // math.gcd(multiple, number), numbers, 1)
 
-                monkey_list[target_monkey].items.append(item_worry % common_dividend)
 
-            monkey_list[current_monkey_id].n_inspections += n_items
+def get_worry_dtype(monkey_list, common_dividend):
+    '''
+    Returns the smallest type of integer in which the worry levels can be kept: int64 or uint64 if the biggest worry level that an operation can produce, from a worry level below the common dividend, fits in it, so the batches of items are computed with machine integers. Otherwise the worry levels are kept as Python integers (object), which do not overflow but are much slower
+    '''
+    maximum_worry = common_dividend - 1
+    maximum_new_worry = maximum_worry
+    for monkey in monkey_list:
+        maximum_new_worry = max(maximum_new_worry, inspect_items(monkey, maximum_worry))
+
+    if maximum_new_worry <= INT64_MAXIMUM:
+        return np.dtype(np.int64)
+    elif maximum_new_worry <= UINT64_MAXIMUM:
+        return np.dtype(np.uint64)
+    return np.dtype(object)
+
+
+def inspect_items(monkey, item_worries):
+    # applies the operation of the monkey to the worry levels of all the items that it holds at once (or to a single worry level)
+    if monkey.operation_type == OperationType.EXPONENTIATION_OPERATION:
+        return item_worries * item_worries
+    elif monkey.operation_type == OperationType.MULTIPLICATION_OPERATION:
+        return item_worries * monkey.operation_value
+    else:
+        return item_worries + monkey.operation_value
 
 
-    n_inspections_list = [[] for _ in range(n_monkeys)]
-    for idx, monkey in enumerate(monkey_list):
-        n_inspections_list[idx] = monkey.n_inspections
+def simulate_item_round(monkey_list, item_monkeys, item_worries, item_inspections, common_dividend):
+    # one round for all the given items. The items thrown to a monkey that comes later in the round are inspected again in the same round, as when the monkeys take turns
+    for monkey_id, monkey in enumerate(monkey_list):
+        held_item_idxs = np.flatnonzero(item_monkeys == monkey_id)
+        if len(held_item_idxs) == 0:
+            continue
+        new_worries = inspect_items(monkey, item_worries[held_item_idxs])
+        item_monkeys[held_item_idxs] = np.where(new_worries % monkey.test_dividend == 0, monkey.true_target, monkey.false_target)
+        item_worries[held_item_idxs] = new_worries % common_dividend
+        item_inspections[held_item_idxs, monkey_id] += 1
 
-    print("Without constant division of worry levels, the monkey business level is", np.sort(n_inspections_list)[-1] * np.sort(n_inspections_list)[-2])
+
+def count_item_inspections(monkey_list, n_rounds, common_dividend, worry_dtype):
+    '''
+    Returns the number of items inspected by each monkey in n_rounds rounds, the number of rounds that had to be simulated and the length of the cycle of every item whose state repeated.
+
+    Each item keeps a checkpoint of its state, which is moved to its current state after 1, 2, 4, 8... rounds (Brent's cycle detection), so the state of an item repeats at its checkpoint a few rounds after it enters its cycle, whatever the length of the cycle, without keeping all its past states. When it does, the rounds since the checkpoint are a cycle of the item: the item skips as many whole cycles as fit in its remaining rounds, adding the inspections that it received during the cycle once per skipped cycle, and only its last rounds are simulated. The items that finish all their rounds leave the batch
+    '''
+    n_monkeys = len(monkey_list)
+    item_monkeys = np.array([monkey_id for monkey_id, monkey in enumerate(monkey_list) for _ in monkey.items], dtype=np.int64)
+    item_worries = np.array([item_worry % common_dividend for monkey in monkey_list for item_worry in monkey.items], dtype=worry_dtype)
+    n_items = len(item_monkeys)
+    item_inspections = np.zeros((n_items, n_monkeys), dtype=np.int64) # how many times each monkey inspected each item
+    item_rounds = np.zeros(n_items, dtype=np.int64) # rounds done by each item, which differ once some items skip their cycles
+    is_item_cycle_skipped = np.zeros(n_items, dtype=bool)
+
+    checkpoint_monkeys = item_monkeys.copy()
+    checkpoint_worries = item_worries.copy()
+    checkpoint_inspections = item_inspections.copy()
+    checkpoint_rounds = item_rounds.copy()
+    checkpoint_intervals = np.ones(n_items, dtype=np.int64) # rounds after which the checkpoint is moved again
+
+    n_inspections_list = [0]*n_monkeys
+    item_cycle_lengths = []
+    n_simulated_rounds = 0
+    while n_items > 0 and n_simulated_rounds < n_rounds:
+        simulate_item_round(monkey_list, item_monkeys, item_worries, item_inspections, common_dividend)
+        item_rounds += 1
+        n_simulated_rounds += 1
+
+        is_state_repeated = ~is_item_cycle_skipped & (item_monkeys == checkpoint_monkeys) & (item_worries == checkpoint_worries)
+        for item_idx in np.flatnonzero(is_state_repeated):
+            cycle_length = item_rounds[item_idx] - checkpoint_rounds[item_idx]
+            n_skipped_cycles = (n_rounds - item_rounds[item_idx]) // cycle_length
+            item_inspections[item_idx] += n_skipped_cycles * (item_inspections[item_idx] - checkpoint_inspections[item_idx])
+            item_rounds[item_idx] += n_skipped_cycles * cycle_length
+            is_item_cycle_skipped[item_idx] = True
+            item_cycle_lengths.append(int(cycle_length))
+
+        is_checkpoint_due = ~is_item_cycle_skipped & (item_rounds - checkpoint_rounds == checkpoint_intervals)
+        if is_checkpoint_due.any():
+            checkpoint_monkeys[is_checkpoint_due] = item_monkeys[is_checkpoint_due]
+            checkpoint_worries[is_checkpoint_due] = item_worries[is_checkpoint_due]
+            checkpoint_inspections[is_checkpoint_due] = item_inspections[is_checkpoint_due]
+            checkpoint_rounds[is_checkpoint_due] = item_rounds[is_checkpoint_due]
+            checkpoint_intervals[is_checkpoint_due] *= 2
+
+        is_item_done = item_rounds >= n_rounds
+        if is_item_done.any():
+            for monkey_id, n_inspections in enumerate(item_inspections[is_item_done].sum(axis=0).tolist()):
+                n_inspections_list[monkey_id] += n_inspections
+            is_item_left = ~is_item_done
+            item_monkeys, item_worries, item_inspections, item_rounds, is_item_cycle_skipped = item_monkeys[is_item_left], item_worries[is_item_left], item_inspections[is_item_left], item_rounds[is_item_left], is_item_cycle_skipped[is_item_left]
+            checkpoint_monkeys, checkpoint_worries, checkpoint_inspections, checkpoint_rounds, checkpoint_intervals = checkpoint_monkeys[is_item_left], checkpoint_worries[is_item_left], checkpoint_inspections[is_item_left], checkpoint_rounds[is_item_left], checkpoint_intervals[is_item_left]
+            n_items = len(item_monkeys)
+
+    return n_inspections_list, n_simulated_rounds, sorted(item_cycle_lengths)
         
 
-def main(file_name): 
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+def read_puzzle_input(file_name):
+    monkey_list = parse_puzzle_file(iterate_blocks(file_name)) # each block of lines describes a monkey
+    return (copy.deepcopy(monkey_list),), (monkey_list,) # arguments of solve_first_part and solve_second_part. Both parts modify the monkeys, so each one receives its own copy
+
+
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part()
+    print("The monkey business level is", first_part_result.answer)
 
-    monkey_list = parse_puzzle_file(lines)
-    solve_first_part(copy.deepcopy(monkey_list))
-    solve_second_part(monkey_list)
+    second_part_result = puzzle_solver.solve_second_part()
+    print("Without constant division of worry levels, the monkey business level is", second_part_result.answer)
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
\ No newline at end of file
+    main(*parse_file_name())
\ No newline at end of file
@@ -1,6 +1,16 @@
 import argparse
-import numpy as np
-
+import sys
+import collections
+from puzzle_result import PuzzleResult
+from fast_input import read_character_grid
+from profiling import add_profiling_arguments, get_part_profiler
+from search_counters import SearchCounters, add_search_counting_argument, print_search_counters
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
+
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 12
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day12.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day12_example.txt"
 
@@ -9,119 +19,184 @@ INITIAL_POSITION_CHAR = 'S'
 TARGET_POSITION_CHAR = 'E'
 MINIMUM_ELEVATION_CHAR = 'a'
 MAXIMUM_ELEVATION_CHAR = 'z'
+MINIMUM_ELEVATION = 0
+MAXIMUM_ELEVATION = ord(MAXIMUM_ELEVATION_CHAR) - ord(MINIMUM_ELEVATION_CHAR)
+UNREACHED_DISTANCE = -1
+BORDER_DISTANCE = -2
+DISTANCE_GRID_CACHE_SIZE = 8 # targets whose distance grids are kept by a Heightmap
 
 
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 12: Hill Climbing Algorithm")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
+    add_search_counting_argument(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.counting_search
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.counting_search
     else:
-        return args.file_name[1]
-
-
-def parse_puzzle_file(lines):
-    n_rows = len(lines)
-    n_cols = len(lines[0])
-    climbing_grid = np.zeros([n_rows,n_cols],dtype=int)
-    possible_starting_positions = []
-    for row_idx, line in enumerate(lines):
-        climbing_grid[row_idx,:] = [ord(character) for character in line]
-
-        col_idxs = [pos for pos, character in enumerate(line) if character == MINIMUM_ELEVATION_CHAR]
-        for col_idx in col_idxs:
-            possible_starting_positions.append((row_idx, col_idx))
-
-        col_idx = line.find(INITIAL_POSITION_CHAR)
-        if col_idx != -1:
-            starting_position = (row_idx, col_idx)
-            climbing_grid[row_idx, col_idx] = ord(MINIMUM_ELEVATION_CHAR) # INITIAL_POSITION_CHAR has an elevation of MINIMUM_ELEVATION_CHAR. The fact that the cell is labeled as INITIAL_POSITION_CHAR does not give extra information once its position is stored
-
-    return starting_position, possible_starting_positions, climbing_grid
-
-
-
-def check_cell(climbing_grid, checked_paths, paths_to_check, cell_position, maximum_next_elevation, n_steps, necessary_n_steps_list):
-    possible_step = climbing_grid[cell_position[0],cell_position[1]]
-
-    if possible_step == ord(TARGET_POSITION_CHAR):
-        possible_step = ord(MAXIMUM_ELEVATION_CHAR) # the elevation of TARGET_POSITION_CHAR corresponds to MAXIMUM_ELEVATION_CHAR
-        if maximum_next_elevation >= possible_step:
-            necessary_n_steps_list.append(n_steps)
-            paths_to_check = [[]] # There is no need to keep checking paths. An empty list is left nested, so calling pop() from solve_first_part does not throw an error
-
-    elif maximum_next_elevation >= possible_step:
-        if cell_position not in checked_paths:
-            checked_paths[cell_position] = n_steps
-            paths_to_check.append(cell_position)
-
-
-def check_neighbours(climbing_grid, checked_paths, paths_to_check, row_idx, col_idx, elevation, current_n_steps, n_rows, n_cols, necessary_n_steps_list):
-    maximum_next_elevation = elevation+1
-    n_steps_to_target = current_n_steps + 1
-
-    # check up
-    if row_idx != 0:
-        cell_position = (row_idx-1, col_idx)
-        check_cell(climbing_grid, checked_paths, paths_to_check, cell_position, maximum_next_elevation, n_steps_to_target, necessary_n_steps_list)
-    
-    # check down
-    if row_idx != (n_rows-1):
-        cell_position = (row_idx+1, col_idx)
-        check_cell(climbing_grid, checked_paths, paths_to_check, cell_position, maximum_next_elevation, n_steps_to_target, necessary_n_steps_list)
-
-
-    # check right
-    if col_idx != (n_cols-1):
-        cell_position = (row_idx, col_idx+1)
-        check_cell(climbing_grid, checked_paths, paths_to_check, cell_position, maximum_next_elevation, n_steps_to_target, necessary_n_steps_list)
-
-    # check left
-    if col_idx != 0:
-        cell_position = (row_idx, col_idx-1)
-        check_cell(climbing_grid, checked_paths, paths_to_check, cell_position, maximum_next_elevation, n_steps_to_target, necessary_n_steps_list)
-
-
-
-def solve_first_part(starting_position, climbing_grid, print_result=True):
-    checked_paths = {} # dictionary of paths that have alreay been checked, storing the position as key and the number of steps as valu
-    paths_to_check = [starting_position]
-    necessary_n_steps_list = [] # it will hold just 1 value, but is declared as a list to facilitate solve_second_part and to avoid passing the variable by value, which would require many checks until it is assigned
-    checked_paths[starting_position] = 0
-    while len(paths_to_check) != 0:
-        cell_position = paths_to_check[0]
-        check_neighbours(climbing_grid, checked_paths, paths_to_check, cell_position[0], cell_position[1], climbing_grid[cell_position[0],cell_position[1]], checked_paths[cell_position], climbing_grid.shape[0], climbing_grid.shape[1], necessary_n_steps_list)
-
-        paths_to_check.pop(0)
-
-    if print_result == True:
-        print("To reach '{}', it is necessary to do at least {} steps starting from '{}'".format(TARGET_POSITION_CHAR, necessary_n_steps_list[0], INITIAL_POSITION_CHAR))
+        return args.file_name[1], answer_cache, part_profiler, args.counting_search
+
+
+def parse_puzzle_file(character_grid):
+    height_grid = np.subtract(character_grid, ord(MINIMUM_ELEVATION_CHAR), dtype=np.uint8) # the elevation of each cell is the position of its letter in the alphabet, from 0 for MINIMUM_ELEVATION_CHAR to 25 for MAXIMUM_ELEVATION_CHAR
+
+    starting_position = tuple(np.argwhere(character_grid == ord(INITIAL_POSITION_CHAR))[0].tolist())
+    height_grid[starting_position] = MINIMUM_ELEVATION # INITIAL_POSITION_CHAR has an elevation of MINIMUM_ELEVATION_CHAR. The fact that the cell is labeled as INITIAL_POSITION_CHAR does not give extra information once its position is stored
+    target_position = tuple(np.argwhere(character_grid == ord(TARGET_POSITION_CHAR))[0].tolist())
+    height_grid[target_position] = MAXIMUM_ELEVATION # the elevation of TARGET_POSITION_CHAR corresponds to MAXIMUM_ELEVATION_CHAR
+
+    return Heightmap(height_grid, starting_position, target_position)
+
+
+def get_distance_grid(height_grid, target_position, search_counters=None):
+    '''
+    Returns the number of steps from every cell to the target (UNREACHED_DISTANCE if the target can not be reached from it), with a single breadth-first search that goes backwards from the target: a step from a cell A to a cell B can be climbed if B is at most 1 higher than A, so the search moves from B to A if A is at most 1 lower than B.
+
+    The search advances a whole level (all the cells at the same distance) at a time, checking the 4 neighbours of all the cells of the level at once. The grid is flattened and surrounded by a border of cells, so the neighbours are a fixed offset away from each cell and never go out of the grid: the border cells are marked with BORDER_DISTANCE, so they are never reached
+    '''
+    n_rows, n_cols = height_grid.shape
+    padded_heights = np.zeros((n_rows+2, n_cols+2), dtype=np.uint8)
+    padded_heights[1:-1,1:-1] = height_grid
+    padded_heights = padded_heights.ravel()
+    distances = np.full((n_rows+2, n_cols+2), BORDER_DISTANCE, dtype=np.int32)
+    distances[1:-1,1:-1] = UNREACHED_DISTANCE
+    distances = distances.ravel()
+    neighbour_offsets = np.array([-(n_cols+2), n_cols+2, 1, -1]) # up, down, right and left in the flattened padded grid
+
+    cells_to_check = np.array([(target_position[0]+1)*(n_cols+2) + target_position[1]+1])
+    distances[cells_to_check] = 0
+    n_steps = 0
+    while len(cells_to_check) != 0:
+        n_steps += 1
+        neighbours = (cells_to_check[:,np.newaxis] + neighbour_offsets).ravel()
+        is_climbable = padded_heights[neighbours] + 1 >= np.repeat(padded_heights[cells_to_check], len(neighbour_offsets))
+        is_unreached = distances[neighbours] == UNREACHED_DISTANCE
+        new_cells_to_check = np.unique(neighbours[is_climbable & is_unreached]) # a cell can be the neighbour of several cells of the level
+        distances[new_cells_to_check] = n_steps
+
+        if search_counters is not None:
+            is_in_grid = distances[neighbours] != BORDER_DISTANCE
+            search_counters.n_expanded_nodes += len(cells_to_check)
+            search_counters.update_peak_frontier_size(len(cells_to_check))
+            search_counters.n_pruned_nodes["elevation"] += int(np.count_nonzero(is_in_grid & ~is_climbable)) # too high to climb from
+            n_visited_checks = int(np.count_nonzero(is_in_grid & is_climbable))
+            search_counters.n_visited_checks += n_visited_checks
+            search_counters.n_visited_hits += n_visited_checks - len(new_cells_to_check)
+        cells_to_check = new_cells_to_check
+
+    return distances.reshape(n_rows+2, n_cols+2)[1:-1,1:-1].copy()
+
+
+class Heightmap:
+    '''
+    Elevations of a map, which answer how many steps it takes to climb from any set of cells to a target. The distances from every cell to a target are computed once, with get_distance_grid, and kept for the next questions, so each question is a gather from the distance grid.
+
+    The distance grids of several targets are kept, up to distance_grid_cache_size. When there are more, the grid of the target that was asked about the longest time ago is removed. The kept grids are read-only, so that a caller can not change the answers of the next questions
+    '''
+    def __init__(self, height_grid, starting_position, target_position, distance_grid_cache_size=DISTANCE_GRID_CACHE_SIZE):
+        self.height_grid = height_grid # uint8 grid with the elevation of each cell
+        self.starting_position = starting_position
+        self.target_position = target_position # default target of the questions
+        self.distance_grid_cache_size = distance_grid_cache_size
+        self.distance_grids = collections.OrderedDict() # indexed by target, from the least to the most recently used
+
+    def get_target_key(self, target_position):
+        if target_position is None:
+            return tuple(self.target_position)
+        return tuple(target_position)
+
+    def is_distance_grid_cached(self, target_position=None):
+        # if True, asking about the target does not search, so the search counters are not filled
+        return self.get_target_key(target_position) in self.distance_grids
+
+    def get_distance_grid(self, target_position=None, search_counters=None):
+        # the search counters are only filled if the distance grid has to be computed, see is_distance_grid_cached
+        target_position = self.get_target_key(target_position)
+        if target_position in self.distance_grids:
+            self.distance_grids.move_to_end(target_position)
+            return self.distance_grids[target_position]
+
+        distance_grid = get_distance_grid(self.height_grid, target_position, search_counters)
+        distance_grid.setflags(write=False)
+        self.distance_grids[target_position] = distance_grid
+        if len(self.distance_grids) > self.distance_grid_cache_size:
+            self.distance_grids.popitem(last=False)
+        return distance_grid
+
+    def get_elevation_positions(self, elevation_chars):
+        # (n_cells, 2) array with the positions of the cells of any of the given elevations (e.g. "a" or "ab"), in row-major order
+        elevations = [ord(elevation_char) - ord(MINIMUM_ELEVATION_CHAR) for elevation_char in elevation_chars]
+        return np.argwhere(np.isin(self.height_grid, elevations))
+
+    def get_distances(self, starting_positions, target_position=None, search_counters=None):
+        # steps from each of the starting positions (a (n_cells, 2) array or a list of positions) to the target, or UNREACHED_DISTANCE
+        starting_positions = np.asarray(starting_positions, dtype=np.int64).reshape(-1, 2)
+        return self.get_distance_grid(target_position, search_counters)[starting_positions[:,0], starting_positions[:,1]]
+
+    def get_shortest_distance(self, starting_positions, target_position=None, search_counters=None):
+        '''
+        Returns the fewest steps to the target from any of the starting positions and the starting position from which they are done (the first one given if there are several), or (UNREACHED_DISTANCE, None) if the target can not be reached from any of them
+        '''
+        starting_positions = np.asarray(starting_positions, dtype=np.int64).reshape(-1, 2)
+        distances = self.get_distances(starting_positions, target_position, search_counters)
+        is_reached = distances != UNREACHED_DISTANCE
+        if not is_reached.any():
+            return UNREACHED_DISTANCE, None
+        best_idx = np.flatnonzero(is_reached)[np.argmin(distances[is_reached])]
+        return int(distances[best_idx]), tuple(starting_positions[best_idx].tolist())
+
+
+def solve_first_part(heightmap, search_counters=None):
+    # the diagnostics tell if the distances were already computed, e.g. by the second part, in which case the search counters stay empty
+    is_distance_grid_cached = heightmap.is_distance_grid_cached()
+    n_steps, _ = heightmap.get_shortest_distance([heightmap.starting_position], search_counters=search_counters)
+    if n_steps == UNREACHED_DISTANCE:
+        raise ValueError("'{}' can not be reached from '{}'".format(TARGET_POSITION_CHAR, INITIAL_POSITION_CHAR))
+    return PuzzleResult(n_steps, {"is_distance_grid_cached": is_distance_grid_cached})
+
+
+def solve_second_part(heightmap, search_counters=None):
+    is_distance_grid_cached = heightmap.is_distance_grid_cached()
+    n_steps, best_starting_position = heightmap.get_shortest_distance(heightmap.get_elevation_positions(MINIMUM_ELEVATION_CHAR), search_counters=search_counters)
+    if n_steps == UNREACHED_DISTANCE:
+        raise ValueError("'{}' can not be reached from any position of elevation '{}'".format(TARGET_POSITION_CHAR, MINIMUM_ELEVATION_CHAR))
+    return PuzzleResult(n_steps, {"best_starting_position": best_starting_position, "is_distance_grid_cached": is_distance_grid_cached})
+
+
+def read_puzzle_input(file_name):
+    heightmap = parse_puzzle_file(read_character_grid(file_name))
+    return (heightmap,), (heightmap,) # arguments of solve_first_part and solve_second_part. Both parts share the heightmap, so the distances to the target are only computed once
+
+
+def main(file_name, answer_cache=None, part_profiler=None, counting_search=False):
+    if counting_search:
+        answer_cache = None # the counters are only filled if the parts are solved
+        first_part_search_counters = SearchCounters()
+        second_part_search_counters = SearchCounters()
     else:
-        return necessary_n_steps_list
-
-
-def solve_second_part(possible_starting_positions, climbing_grid):
-    necessary_n_steps_list = []
-    for starting_position in possible_starting_positions:
-        necessary_n_steps_list += solve_first_part(starting_position, climbing_grid, print_result=False)
-    
-    print("To reach '{}', it is necessary to do at least {} steps from any position of elevation '{}'".format(TARGET_POSITION_CHAR, np.min(necessary_n_steps_list), MINIMUM_ELEVATION_CHAR))
+        first_part_search_counters = None
+        second_part_search_counters = None
 
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
 
-def main(file_name):
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+    first_part_result = puzzle_solver.solve_first_part(search_counters=first_part_search_counters)
+    print("To reach '{}', it is necessary to do at least {} steps starting from '{}'".format(TARGET_POSITION_CHAR, first_part_result.answer, INITIAL_POSITION_CHAR))
+    if counting_search:
+        print_search_counters("first part", first_part_search_counters)
 
-    starting_position, possible_starting_positions, climbing_grid = parse_puzzle_file(lines)
-    
-    solve_first_part(starting_position, climbing_grid)
-    solve_second_part(possible_starting_positions, climbing_grid)
+    second_part_result = puzzle_solver.solve_second_part(search_counters=second_part_search_counters)
+    print("To reach '{}', it is necessary to do at least {} steps from any position of elevation '{}'".format(TARGET_POSITION_CHAR, second_part_result.answer, MINIMUM_ELEVATION_CHAR))
+    if counting_search:
+        print_search_counters("second part", second_part_search_counters)
+        if second_part_result.diagnostics["is_distance_grid_cached"]:
+            print("The second part reused the distances computed by the first part, so it did not search")
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
\ No newline at end of file
+    main(*parse_file_name())
\ No newline at end of file
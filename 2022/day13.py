@@ -1,153 +1,138 @@
 import argparse
-import numpy as np
-import ast
-
+import sys
+import functools
+import math
+import re
+from puzzle_result import PuzzleResult
+from fast_input import iterate_blocks
+from profiling import add_profiling_arguments, get_part_profiler
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
+
+DAY = 13
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day13.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day13_example.txt"
 
-DIVIDER_PACKAGE_BEGIN = [[2]]
-DIVIDER_PACKAGE_END = [[6]]
+DIVIDER_PACKETS = ("[[2]]", "[[6]]")
+OPEN_TOKEN = -1
+CLOSE_TOKEN = -2
+TOKEN_PATTERN = re.compile(r"\[|\]|\d+")
 
 
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 13: Distress Signal")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
-    else:
-        return args.file_name[1]
-
-
-def looped_decision(left_value,right_value,current_index,n_correctly_ordered_pairs, is_package_ordered):
-    is_left_a_list = type(left_value) is list
-    is_right_a_list = type(right_value) is list
-    if is_left_a_list == True and is_right_a_list == False:
-        right_value = [right_value]
-        is_right_a_list = True
-
-    elif is_left_a_list == False and is_right_a_list == True:
-        left_value = [left_value]
-        is_left_a_list = True
-
-
-    if is_left_a_list == True and is_right_a_list == True:
-        n_left_values = len(left_value)
-        n_right_values = len(right_value)
-        if n_left_values == 0:
-            if n_right_values == 0:
-                continue_decision_loop = True
-                return continue_decision_loop, n_correctly_ordered_pairs, is_package_ordered
-            else:
-                n_correctly_ordered_pairs += 1*current_index
-                is_package_ordered = True
-                continue_decision_loop = False
-                return continue_decision_loop, n_correctly_ordered_pairs, is_package_ordered
-        elif n_right_values == 0:
-            is_package_ordered = False
-            continue_decision_loop = False
-            return continue_decision_loop, n_correctly_ordered_pairs, is_package_ordered
-
-        continue_decision_loop = True
-        idx = 0
-        while continue_decision_loop == True:
-            continue_decision_loop, n_correctly_ordered_pairs, is_package_ordered = looped_decision(left_value[idx],right_value[idx],current_index, n_correctly_ordered_pairs, is_package_ordered)
-            if continue_decision_loop == True:
-                n_left_values = len(left_value[idx+1:])
-                n_right_values = len(right_value[idx+1:])
-                if n_left_values == 0:
-                    if n_right_values == 0:
-                        continue_decision_loop = True
-                        break
-                    else:
-                        is_package_ordered = True
-                        n_correctly_ordered_pairs += 1*current_index
-                        continue_decision_loop = False
-                        break
-                elif(n_right_values == 0):
-                    continue_decision_loop = False
-                    is_package_ordered = False
-                    break
-
-                idx += 1
-
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        if left_value < right_value:
-            is_package_ordered = True
-            n_correctly_ordered_pairs += 1*current_index
-            continue_decision_loop = False
-
-        elif left_value > right_value:
-            is_package_ordered = False
-            continue_decision_loop = False
+        return args.file_name[1], answer_cache, part_profiler
+
+
+def tokenize_packet(line):
+    # flat list with a token for each bracket and integer of the packet, e.g. "[1,[]]" gives [OPEN_TOKEN, 1, OPEN_TOKEN, CLOSE_TOKEN, CLOSE_TOKEN]. The integers are their own tokens, as they are never negative
+    return [OPEN_TOKEN if token == "[" else CLOSE_TOKEN if token == "]" else int(token) for token in TOKEN_PATTERN.findall(line)]
+
+
+def compare_packets(left_tokens, right_tokens):
+    '''
+    Returns -1 if the left packet goes before the right one (they are in the right order), 1 if it goes after it and 0 if they are equal, walking once through the tokens of both packets at the same time, without recursion.
+
+    When an integer is compared with a list, the integer is treated as a list with only that integer: the list is entered, and the side of the integer owes as many closing brackets as lists it was wrapped in (left_n_wraps or right_n_wraps). Once its integer matches, the other side must close those lists at once, or it has more values than the wrapped integer. Only one side can owe closing brackets at a time, as they are paid as soon as the integer is passed
+    '''
+    left_idx = 0
+    right_idx = 0
+    left_n_wraps = 0
+    right_n_wraps = 0
+    while left_idx < len(left_tokens) and right_idx < len(right_tokens):
+        left_token = left_tokens[left_idx]
+        right_token = right_tokens[right_idx]
+        if left_token >= 0 and right_token >= 0:
+            if left_token != right_token:
+                return -1 if left_token < right_token else 1
+            left_idx += 1
+            right_idx += 1
+            while left_n_wraps > 0: # the left list that wraps the integer ends, so the right one has to end too
+                if right_tokens[right_idx] != CLOSE_TOKEN:
+                    return -1
+                right_idx += 1
+                left_n_wraps -= 1
+            while right_n_wraps > 0:
+                if left_tokens[left_idx] != CLOSE_TOKEN:
+                    return 1
+                left_idx += 1
+                right_n_wraps -= 1
+        elif left_token == right_token: # both lists start or end at the same time
+            left_idx += 1
+            right_idx += 1
+        elif left_token == CLOSE_TOKEN: # the left list runs out of values first
+            return -1
+        elif right_token == CLOSE_TOKEN:
+            return 1
+        elif left_token == OPEN_TOKEN: # the right token is an integer, which is wrapped in a list
+            left_idx += 1
+            right_n_wraps += 1
         else:
-            continue_decision_loop = True
+            right_idx += 1
+            left_n_wraps += 1
+    return 0
 
-    return continue_decision_loop, n_correctly_ordered_pairs, is_package_ordered
 
+def sort_packets(packets):
+    # all the packets (as lists of tokens) in the right order
+    return sorted(packets, key=functools.cmp_to_key(compare_packets))
 
-def solve_first_part(lines):
-    n_correctly_ordered_pairs = 0
-    current_index = 0
-    process_left_list = True
-    for line in lines:
 
-        if line == "":
-            process_left_list = True
+def get_divider_positions(packets, divider_packets):
+    '''
+    Returns the position (starting from 1) that each divider packet would have if the packets and the dividers were sorted together, without sorting them: the position of a divider is 1 plus the number of packets and other dividers that go before it, which is counted in a single pass over the packets
+    '''
+    divider_positions = []
+    for divider_packet in divider_packets:
+        n_packets_before = sum(compare_packets(packet, divider_packet) < 0 for packet in packets)
+        n_dividers_before = sum(compare_packets(other_divider_packet, divider_packet) < 0 for other_divider_packet in divider_packets)
+        divider_positions.append(n_packets_before + n_dividers_before + 1)
+    return divider_positions
 
-        elif process_left_list:
-            left_list = ast.literal_eval(line) # used to ease parsing, it is not strictly necessary
-            process_left_list = False
 
-        else:
-            right_list = ast.literal_eval(line) # used to ease parsing, it is not strictly necessary
-            current_index += 1
-            _, n_correctly_ordered_pairs, _ = looped_decision(left_list,right_list,current_index, n_correctly_ordered_pairs, None)
-
-
-
-    print("There are", n_correctly_ordered_pairs, "ordered package pairs")
+def solve_first_part(packet_pairs):
+    n_correctly_ordered_pairs = 0
+    for current_index, (left_tokens, right_tokens) in enumerate(packet_pairs, start=1):
+        if compare_packets(left_tokens, right_tokens) < 0:
+            n_correctly_ordered_pairs += current_index
 
+    return PuzzleResult(n_correctly_ordered_pairs)
 
-def solve_second_part(lines):
-    lines_evaled = [ast.literal_eval(line) for line in lines if line != ""] # remove all blank spaces
 
-    is_package_ordered = False
-    lines_bigger_than_divider_begin = np.zeros(len(lines_evaled), dtype=bool)
-    lines_bigger_than_divider_end = np.zeros(len(lines_evaled), dtype=bool)
-    for line_idx, line in enumerate(lines_evaled):
-        continue_decision_loop = True
-        while continue_decision_loop == True:
-            continue_decision_loop, _, is_package_ordered = looped_decision(DIVIDER_PACKAGE_BEGIN,line,0,0,is_package_ordered)
-        lines_bigger_than_divider_begin[line_idx] = is_package_ordered # you can read as: Is begin smaller than X
+def solve_second_part(packet_pairs):
+    packets = [packet_tokens for packet_pair in packet_pairs for packet_tokens in packet_pair] # the packets of all pairs, in order
+    divider_positions = get_divider_positions(packets, [tokenize_packet(divider_packet) for divider_packet in DIVIDER_PACKETS])
 
-        continue_decision_loop = True
-        while continue_decision_loop == True:
-            continue_decision_loop, _, is_package_ordered = looped_decision(DIVIDER_PACKAGE_END,line,0,0,is_package_ordered)
-        lines_bigger_than_divider_end[line_idx] = is_package_ordered
+    decoder_key = math.prod(divider_positions)
+    return PuzzleResult(decoder_key, {"divider_positions": divider_positions})
 
-    n_below_top_divider = np.sum(lines_bigger_than_divider_begin == False)
-    _n_above_top_divider = np.sum(lines_bigger_than_divider_end)
-    n_between_dividers = np.sum(lines_bigger_than_divider_begin != lines_bigger_than_divider_end)
 
+def read_puzzle_input(file_name):
+    packet_pairs = [[tokenize_packet(line) for line in packet_pair] for packet_pair in iterate_blocks(file_name)] # each block of lines is a pair of packets, which are tokenized once for both parts
+    return (packet_pairs,), (packet_pairs,) # arguments of solve_first_part and solve_second_part
 
-    print("The decoder key is", (n_below_top_divider+1) * (n_below_top_divider+n_between_dividers+2) )
 
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
 
+    first_part_result = puzzle_solver.solve_first_part()
+    print("There are", first_part_result.answer, "ordered package pairs")
 
-def main(file_name): 
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
-    
-    solve_first_part(lines)
-    solve_second_part(lines)
+    second_part_result = puzzle_solver.solve_second_part()
+    print("The decoder key is", second_part_result.answer)
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
@@ -5,7 +5,13 @@ Although the second part is fast enough, it could be possible to do it in anothe
 '''
 
 import argparse
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines
+from profiling import add_profiling_arguments, get_part_profiler
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+DAY = 14
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day14.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day14_example.txt"
 
@@ -17,13 +23,17 @@ EXTRA_BORDER_LIMIT = 2
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 14: Regolith Reservoir")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler
 
 
 def parse_puzzle_file(lines):
@@ -87,7 +97,7 @@ def solve_first_part(blocked_nodes):
         if(sand_fell_into_abyss == False):
             stacked_sand += 1
             
-    print("The amount of stacked sand before some fells into the abyss is", stacked_sand)
+    return PuzzleResult(stacked_sand)
 
 
 def solve_second_part(blocked_nodes):
@@ -140,20 +150,26 @@ def solve_second_part(blocked_nodes):
 
         stacked_sand += 1
             
-    print("The amount of stacked sand before the sand source is blocked is", stacked_sand)
+    return PuzzleResult(stacked_sand)
 
 
-def main(file_name): 
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+def read_puzzle_input(file_name):
+    lines = list(iterate_lines(file_name))
 
     blocked_nodes = parse_puzzle_file(lines)
-    solve_first_part(blocked_nodes.copy())
-    solve_second_part(blocked_nodes)
+    return (blocked_nodes.copy(),), (blocked_nodes,) # arguments of solve_first_part and solve_second_part. Both parts add the stacked sand to the blocked nodes, so each one receives its own copy
+
+
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part()
+    print("The amount of stacked sand before some fells into the abyss is", first_part_result.answer)
+
+    second_part_result = puzzle_solver.solve_second_part()
+    print("The amount of stacked sand before the sand source is blocked is", second_part_result.answer)
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
@@ -8,9 +8,14 @@ To avoid such a long iteration and taking advantage of the fact that only one ce
 
 
 import argparse
-import numpy as np
+import sys
 from dataclasses import dataclass
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines
+from profiling import add_profiling_arguments, get_part_profiler
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+DAY = 15
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day15.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day15_example.txt"
 
@@ -37,15 +42,19 @@ def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 15: Beacon Exclusion Zone")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
     parser.add_argument("-e", "--example", dest="using_a_example_file", action="store_true", help="if a file path has been given, use this argument if that file path corresponds to an example file. This puzzle uses different contants (different row of interest and maximum coordinate position) for each file type")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
         using_a_example_file = False
-        return PUZZLE_INPUT_FILE_NAME, using_a_example_file
+        return PUZZLE_INPUT_FILE_NAME, using_a_example_file, answer_cache, part_profiler
     elif len(args.file_name) == 1:
         using_a_example_file = True
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, using_a_example_file
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, using_a_example_file, answer_cache, part_profiler
     else:
-        return args.file_name[1], args.using_a_example_file
+        return args.file_name[1], args.using_a_example_file, answer_cache, part_profiler
 
 
 def manhattan_distance(x_pos1,y_pos1,x_pos2,y_pos2):
@@ -76,7 +85,7 @@ def solve_first_part(lines, row_of_interest=ROW_OF_INTEREST):
             for blocked_x in range(sensor_x - lateral_x_extension, sensor_x + lateral_x_extension +1):
                 x_without_beacon.add(blocked_x)
 
-    print("Row", row_of_interest, "can contain up to", len(x_without_beacon) - len(x_with_beacon), "beacons")
+    return PuzzleResult(len(x_without_beacon) - len(x_with_beacon), {"row_of_interest": row_of_interest})
 
 
 
@@ -96,7 +105,7 @@ def check_sensing_borders(sensor_x, sensor_y, sensor_range,sensor_idx, sensor_li
     for y_idx in range(-sensor_range,sensor_range+1):
         border_y = sensor_y + y_idx
         if border_y >= MINIMUM_COORDINATE_POSITION and border_y <= maximum_coordinate_position:
-            pre_x_idx = sensor_range - y_idx*np.sign(y_idx) + 1
+            pre_x_idx = sensor_range - abs(y_idx) + 1
 
             if pre_x_idx != 0:
                 x_idxs = [pre_x_idx, -pre_x_idx]
@@ -137,17 +146,14 @@ def solve_second_part(lines, maximum_coordinate_position=MAXIMUM_COORDINATE_POSI
 
     if beacon_found == True:
         tuning_frequency = target_beacon_x * X_TUNING_FREQUENCY + target_beacon_y
-        print("Beacon found at [{},{}] with a tuning frequency of {}".format(target_beacon_x,target_beacon_y,tuning_frequency))
+        return PuzzleResult(tuning_frequency, {"beacon_x": target_beacon_x, "beacon_y": target_beacon_y})
 
     else:
-        print("Beacon not found. This option should never happen...Is the argument parsing option to use the parameters that correspond to example file, or not, correctly set (try --help)?")
+        return PuzzleResult(None)
 
 
-def main(file_name, using_example_file=False):    
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+def read_puzzle_input(file_name, using_example_file=False):
+    lines = list(iterate_lines(file_name))
 
     if using_example_file==False:
         row_of_interest = ROW_OF_INTEREST
@@ -156,8 +162,20 @@ def main(file_name, using_example_file=False):
         row_of_interest = ROW_OF_INTEREST_EXAMPLE_FILE
         maximum_coordinate_position = MAXIMUM_COORDINATE_POSITION_EXAMPLE_FILE
 
-    solve_first_part(lines, row_of_interest)
-    solve_second_part(lines, maximum_coordinate_position)
+    return (lines, row_of_interest), (lines, maximum_coordinate_position) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, using_example_file=False, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, (using_example_file,), answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part()
+    print("Row", first_part_result.diagnostics["row_of_interest"], "can contain up to", first_part_result.answer, "beacons")
+
+    second_part_result = puzzle_solver.solve_second_part()
+    if second_part_result.answer != None:
+        print("Beacon found at [{},{}] with a tuning frequency of {}".format(second_part_result.diagnostics["beacon_x"],second_part_result.diagnostics["beacon_y"],second_part_result.answer))
+    else:
+        print("Beacon not found. This option should never happen...Is the argument parsing option to use the parameters that correspond to example file, or not, correctly set (try --help)?")
 
 
 if __name__ == "__main__":
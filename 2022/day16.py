@@ -7,11 +7,18 @@ The second part is similar to the first, generating in this case combinations th
 """
 
 import argparse
-import numpy as np
+import sys
+import math
 import copy
 import itertools
 from dataclasses import dataclass
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines
+from profiling import add_profiling_arguments, get_part_profiler
+from search_counters import SearchCounters, add_search_counting_argument, print_search_counters
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+DAY = 16
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day16.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day16_example.txt"
 
@@ -36,13 +43,18 @@ class ValvePathParameters:
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 16: Proboscidea Volcanium")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
+    add_search_counting_argument(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.counting_search
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.counting_search
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler, args.counting_search
 
 
 def parse_puzzle_file(lines):
@@ -85,7 +97,7 @@ def map_valve(parent_valve, current_path_list, flow_rate_dict, valve_dict):
 def map_every_valve(flow_rate_dict, valve_dict):
     for valve in valve_dict.values():
         for target_valve_name in flow_rate_dict:
-            valve.valve_routes_dict[target_valve_name] = np.inf
+            valve.valve_routes_dict[target_valve_name] = math.inf
 
     # make a map of the full valve layout, doing it from every relevant valve (the ones with flow rate bigger than 0 and the starting valve)
     map_valve(valve_dict[STARTING_VALVE], [STARTING_VALVE], flow_rate_dict, valve_dict)
@@ -105,7 +117,7 @@ def calculate_ideal_pressure(path_to_continue_visiting, valve_to_visit, flow_rat
     return ideal_pressure
 
 
-def get_single_explorer_maximum_pressure(potential_paths_to_visit, initial_n_minutes, flow_rate_dict, valve_dict):
+def get_single_explorer_maximum_pressure(potential_paths_to_visit, initial_n_minutes, flow_rate_dict, valve_dict, search_counters=None):
     '''
     implements a breadth-first-search over potential_paths_to_visit, which contains al possible initial paths (nodes). The possible path continuations (children nodes) will go to the variable valve_paths_to_visit, which will be reloaded to potential_paths_to_visit until there is no more valve_paths_to_visit.
     To reduce the number of node visits, an ideal pressure value will be continuously calculated for every path. This ideal pressure value will be compared to the current maximum (non-ideal) pressure value. If it is smaller, the no more children nodes from that original node are considered
@@ -114,6 +126,9 @@ def get_single_explorer_maximum_pressure(potential_paths_to_visit, initial_n_min
     current_maximum_pressure = 0
     while(len(valve_paths_to_visit) != 0):
 
+        if search_counters is not None:
+            search_counters.n_expanded_nodes += 1
+            search_counters.update_peak_frontier_size(len(valve_paths_to_visit))
         visited_valve_path_ref = valve_paths_to_visit.pop(0)
         for valve_to_visit in potential_paths_to_visit:
             if valve_to_visit in visited_valve_path_ref.path_list:
@@ -136,27 +151,34 @@ def get_single_explorer_maximum_pressure(potential_paths_to_visit, initial_n_min
                         current_maximum_pressure_path = path_to_continue_visiting.path_list
 
                     valve_paths_to_visit.append(path_to_continue_visiting) # keep following this path, as it may be the optimal one
+
+                elif search_counters is not None:
+                    search_counters.n_pruned_nodes["calculate_ideal_pressure"] += 1
+
+            elif search_counters is not None:
+                search_counters.n_pruned_nodes["n_minutes_left"] += 1 # the valve can not be reached and opened in time
                     
     return current_maximum_pressure, current_maximum_pressure_path
 
 
 
-def solve_first_part(flow_rate_dict, valve_dict):
+def solve_first_part(flow_rate_dict, valve_dict, search_counters=None):
     # sort the valve names by the flow they will release if activated from the starting valve. It can help to process first the valves most likely to be in the best possible path. This in turn will help to avoid processing extra non-optimal paths
     maximum_pressure_per_valve = [(N_MINUTES-1-valve_dict[STARTING_VALVE].valve_routes_dict[path_element])*x for x, path_element in zip(flow_rate_dict.values(),flow_rate_dict.keys())]
     potential_paths_to_visit = [flow_rate_name for _, flow_rate_name in sorted(zip(maximum_pressure_per_valve, flow_rate_dict.keys()),reverse=True)] # sort valves from most to least flow rate
 
-    current_maximum_pressure, current_maximum_pressure_path = get_single_explorer_maximum_pressure(potential_paths_to_visit, N_MINUTES, flow_rate_dict, valve_dict)
-            
-    print("With {} minutes left the most presure that can be released is {} following the path {}".format(N_MINUTES, current_maximum_pressure, current_maximum_pressure_path[0]), end="")
-    for valve_element in current_maximum_pressure_path[1:]:
-        print("-{}".format(valve_element), end="")
-    print(" (intermediate 0-flow-rate valves ignored for this message)")
+    current_maximum_pressure, current_maximum_pressure_path = get_single_explorer_maximum_pressure(potential_paths_to_visit, N_MINUTES, flow_rate_dict, valve_dict, search_counters)
+    return PuzzleResult(current_maximum_pressure, {"path": current_maximum_pressure_path})
 
 
 
 
-def solve_second_part(flow_rate_dict, valve_dict):
+def solve_second_part(flow_rate_dict, valve_dict, report_current_maximum_pressure=None, search_counters=None):
+    '''
+    As this part takes long to finish, but the correct result is very likely known long before, report_current_maximum_pressure (if given) is called with every new maximum pressure found.
+
+    The search_counters (if given) add up the searches of every explorer in every division of the valves
+    '''
     # sort the valve names by the flow they will release if activated from the starting valve. It can help to process first the valves most likely to be in the best possible path. This in turn will help to avoid processing extra non-optimal paths
     maximum_pressure_per_valve = [(N_MINUTES_GROUP_EXPLORING-1-valve_dict[STARTING_VALVE].valve_routes_dict[path_element])*x for x, path_element in zip(flow_rate_dict.values(),flow_rate_dict.keys())]
     potential_paths_to_visit = [flow_rate_name for _, flow_rate_name in sorted(zip(maximum_pressure_per_valve, flow_rate_dict.keys()),reverse=True)] # sort valves from most to least flow rate
@@ -179,43 +201,57 @@ def solve_second_part(flow_rate_dict, valve_dict):
         current_maximum_pressure = 0
         current_maximum_pressure_path = []
         for idx in range(N_GROUP_EXPLORERS):
-            path_pressure, pressure_path = get_single_explorer_maximum_pressure(valve_per_explorer_list[idx], N_MINUTES_GROUP_EXPLORING, flow_rate_dict,valve_dict)
+            path_pressure, pressure_path = get_single_explorer_maximum_pressure(valve_per_explorer_list[idx], N_MINUTES_GROUP_EXPLORING, flow_rate_dict,valve_dict, search_counters)
             current_maximum_pressure += path_pressure
             current_maximum_pressure_path.append(pressure_path)
         
         if current_maximum_pressure > maximum_pressure:
             maximum_pressure = current_maximum_pressure
             maximum_pressure_path = current_maximum_pressure_path
-            print("Currently, from the visited combinations, the maximum pressure is", maximum_pressure)
+            if report_current_maximum_pressure is not None:
+                report_current_maximum_pressure(maximum_pressure)
 
+    return PuzzleResult(maximum_pressure, {"paths": maximum_pressure_path})
 
-    print("With {} explorers working together and {} minutes left the most presure that can be released is {} following the paths {}".format(N_GROUP_EXPLORERS, N_MINUTES_GROUP_EXPLORING, maximum_pressure, maximum_pressure_path[0][0]), end="")
-    for valve_element in maximum_pressure_path[0][1:]:
-        print("-{}".format(valve_element), end="")
-    print(" and {}".format(maximum_pressure_path[1][0]), end="")
-    for valve_element in maximum_pressure_path[1][1:]:
-        print("-{}".format(valve_element), end="")
-    print(" (intermediate 0-flow-rate valves ignored for this message)")
 
+def print_current_maximum_pressure(maximum_pressure):
+    print("Currently, from the visited combinations, the maximum pressure is", maximum_pressure)
 
 
 
-def main(file_name):    
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
 
+def read_puzzle_input(file_name):
+    lines = list(iterate_lines(file_name))
 
     flow_rate_dict, valve_dict = parse_puzzle_file(lines)
     map_every_valve(flow_rate_dict, valve_dict)
+    return (flow_rate_dict, valve_dict), (flow_rate_dict, valve_dict) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, answer_cache=None, part_profiler=None, counting_search=False):
+    if counting_search:
+        answer_cache = None # the counters are only filled if the parts are solved
+        first_part_search_counters = SearchCounters()
+        second_part_search_counters = SearchCounters()
+    else:
+        first_part_search_counters = None
+        second_part_search_counters = None
+
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
 
+    first_part_result = puzzle_solver.solve_first_part(search_counters=first_part_search_counters)
+    print("With {} minutes left the most presure that can be released is {} following the path {} (intermediate 0-flow-rate valves ignored for this message)".format(N_MINUTES, first_part_result.answer, "-".join(first_part_result.diagnostics["path"])))
+    if counting_search:
+        print_search_counters("first part", first_part_search_counters)
 
-    solve_first_part(flow_rate_dict, valve_dict)
-    solve_second_part(flow_rate_dict, valve_dict)
+    second_part_result = puzzle_solver.solve_second_part(report_current_maximum_pressure=print_current_maximum_pressure, search_counters=second_part_search_counters)
+    explorer_paths = second_part_result.diagnostics["paths"]
+    print("With {} explorers working together and {} minutes left the most presure that can be released is {} following the paths {} and {} (intermediate 0-flow-rate valves ignored for this message)".format(N_GROUP_EXPLORERS, N_MINUTES_GROUP_EXPLORING, second_part_result.answer, "-".join(explorer_paths[0]), "-".join(explorer_paths[1])))
+    if counting_search:
+        print_search_counters("second part", second_part_search_counters)
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
@@ -16,9 +16,17 @@ TODO Another improvement that the code could have would be to describe the rock
 '''
 
 import argparse
-import numpy as np
+import sys
 import enum
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines
+from profiling import add_profiling_arguments, get_part_profiler
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 17
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day17.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day17_example.txt"
 
@@ -37,13 +45,17 @@ ARBITRARY_HIGH_NUMBER_TO_BEGIN_TO_LOOK_FOR_A_PATTERN = 200
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 17: Pyroclastic Flow")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler
 
 
 class RockShape(enum.Enum):
@@ -311,7 +323,7 @@ class SquareRock(FallingRock):
 
 
 
-def solve_first_part(jet_pattern, print_result=True):
+def solve_first_part(jet_pattern):
     blocked_positions = set( (floor_width, -1) for floor_width in range(CAVE_WIDENESS) ) # block the bottom of the cave
 
     horizontal_line_rock = HorizontalLineRock(jet_pattern)
@@ -340,10 +352,8 @@ def solve_first_part(jet_pattern, print_result=True):
         elif rock_shape == RockShape.SQUARE:
             top_rock_height, jet_pattern_idx, blocked_positions, _, _  = square_rock.simulate_falling_rock(top_rock_height, jet_pattern_idx, blocked_positions)
     
-    if print_result:
-        total_tower_height = top_rock_height+1
-        print("After", N_FALLING_ROCKS, "falling rocks the tower will be", total_tower_height, "units tall")
-    return blocked_positions # variable returned only for data visualization
+    total_tower_height = top_rock_height+1
+    return PuzzleResult(total_tower_height, {"blocked_positions": blocked_positions}) # blocked_positions is returned only for data visualization
 
 
 def solve_second_part(jet_pattern):
@@ -423,16 +433,24 @@ def solve_second_part(jet_pattern):
                 independent_jet_pattern_idx = 0
 
     total_tower_height = n_repeated_rock_patterns * repeated_rock_patterns_height + top_rock_height + 1
-    print("After", N_FALLING_ROCKS_PART2, "falling rocks the tower will be", total_tower_height, "units tall")
+    return PuzzleResult(total_tower_height)
+
+
+def read_puzzle_input(file_name):
+    jet_pattern = next(iterate_lines(file_name)) # the jet pattern is the first line
+
+    return (jet_pattern,), (jet_pattern,) # arguments of solve_first_part and solve_second_part
+
 
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
 
-def main(file_name):    
-    with open(file_name) as file:
-        jet_pattern = file.read().splitlines()[0]
+    first_part_result = puzzle_solver.solve_first_part()
+    print("After", N_FALLING_ROCKS, "falling rocks the tower will be", first_part_result.answer, "units tall")
 
-    solve_first_part(jet_pattern)
-    solve_second_part(jet_pattern)
+    second_part_result = puzzle_solver.solve_second_part()
+    print("After", N_FALLING_ROCKS_PART2, "falling rocks the tower will be", second_part_result.answer, "units tall")
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
\ No newline at end of file
+    main(*parse_file_name())
\ No newline at end of file
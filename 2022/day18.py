@@ -5,8 +5,16 @@ TODO the recursive function that checks if a block is in air pocket should mark
 '''
 
 import argparse
-import numpy as np
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines
+from profiling import add_profiling_arguments, get_part_profiler
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 18
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day18.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day18_example.txt"
 
@@ -15,13 +23,17 @@ N_FACES_OF_A_CUBE = 6
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 18: Boiling Boulders")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler
 
 
 def parse_puzzle_file(lines):
@@ -62,7 +74,7 @@ def solve_first_part(boulder):
         if boulder[x,y,z] == True: # if there is a block in the boulder, it may have exposed surface
             surface_area += check_surface_of_boulder_block(boulder, x,y,z)
     
-    print("The total surface area is", surface_area)
+    return PuzzleResult(int(surface_area))
 
 
 
@@ -134,19 +146,25 @@ def solve_second_part(boulder):
                     # if the block is in an air buble within the boulder, do not consider the surface area that it covers. This surface has to be subtracted from the total
                     surface_area += (-N_FACES_OF_A_CUBE + check_surface_of_boulder_block(boulder,x,y,z))
 
-    print("The exterior surface area is", surface_area)
+    return PuzzleResult(int(surface_area))
 
 
-def main(file_name):    
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+def read_puzzle_input(file_name):
+    lines = list(iterate_lines(file_name))
 
     boulder = parse_puzzle_file(lines)
-    solve_first_part(boulder)
-    solve_second_part(boulder)
+    return (boulder,), (boulder,) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part()
+    print("The total surface area is", first_part_result.answer)
+
+    second_part_result = puzzle_solver.solve_second_part()
+    print("The exterior surface area is", second_part_result.answer)
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
\ No newline at end of file
+    main(*parse_file_name())
\ No newline at end of file
@@ -10,10 +10,17 @@ Note: The puzzle instructions, although not totally and completely explicitly, s
 '''
 
 import argparse
+import sys
 import copy
-import numpy as np
+import math
 from dataclasses import dataclass
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines
+from profiling import add_profiling_arguments, get_part_profiler
+from search_counters import SearchCounters, add_search_counting_argument, print_search_counters
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+DAY = 19
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day19.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day19_example.txt"
 
@@ -25,13 +32,18 @@ N_BLUEPRINTS_TO_CONSIDER_PART2 = 3
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 19")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
+    add_search_counting_argument(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.counting_search
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.counting_search
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler, args.counting_search
 
     
 @dataclass 
@@ -151,26 +163,30 @@ class RobotBuildingPath:
 
 
 
-def solve_first_part(blueprint_list, n_minutes_to_consider=N_MINUTES, print_result=True):
-    
+def get_most_geodes_by_blueprint(blueprint_list, n_minutes_to_consider, search_counters=None):
     most_geodes_by_blueprint = [None for _ in range(len(blueprint_list))]
-    total_quality_level = 0
     for blueprint_id, blueprint in enumerate(blueprint_list, start=1):
 
         most_geode_number = 0
         robot_path_list = [RobotBuildingPath(blueprint,n_minutes_to_consider)]
         while len(robot_path_list) != 0:
+            if search_counters is not None:
+                search_counters.update_peak_frontier_size(len(robot_path_list))
             current_robot_path = robot_path_list.pop()        
 
             can_buy_ore_robot = current_robot_path.n_ore >= blueprint.ore_robot_cost_ore and current_robot_path.n_ore_robots < current_robot_path.n_max_ore_robots
             can_buy_clay_robot = current_robot_path.n_ore >= blueprint.clay_robot_cost_ore and current_robot_path.n_clay_robots < current_robot_path.n_max_clay_robots
             can_buy_obsidian_robot = current_robot_path.n_ore >= blueprint.obsidian_robot_cost_ore and current_robot_path.n_clay >= blueprint.obsidian_robot_cost_clay and current_robot_path.n_obsidian_robots < current_robot_path.n_max_obsidian_robots
             can_buy_geode_robot = current_robot_path.n_ore >= blueprint.geode_robot_cost_ore and current_robot_path.n_obsidian >= blueprint.geode_robot_cost_obsidian
+            if search_counters is not None:
+                n_robots_over_maximum = (current_robot_path.n_ore >= blueprint.ore_robot_cost_ore and current_robot_path.n_ore_robots >= current_robot_path.n_max_ore_robots) + (current_robot_path.n_ore >= blueprint.clay_robot_cost_ore and current_robot_path.n_clay_robots >= current_robot_path.n_max_clay_robots) + (current_robot_path.n_ore >= blueprint.obsidian_robot_cost_ore and current_robot_path.n_clay >= blueprint.obsidian_robot_cost_clay and current_robot_path.n_obsidian_robots >= current_robot_path.n_max_obsidian_robots)
 
             current_robot_path.collect()
 
             n_geode_ideal = current_robot_path.ideal_path_estimation()
             if n_geode_ideal < most_geode_number:
+                if search_counters is not None:
+                    search_counters.n_pruned_nodes["ideal_path_estimation"] += 1
                 continue
 
             if current_robot_path.n_geode > most_geode_number:
@@ -178,8 +194,17 @@ def solve_first_part(blueprint_list, n_minutes_to_consider=N_MINUTES, print_resu
             
             if current_robot_path.n_minutes_left == 0:
                 # it does not matter what is built, there is no time to use it
+                if search_counters is not None:
+                    search_counters.n_pruned_nodes["n_minutes_left"] += 1
                 continue
 
+            if search_counters is not None:
+                search_counters.n_expanded_nodes += 1
+                # robots that could be paid but are not built because there are already enough of them, or because the path waited when it could have built them
+                search_counters.n_pruned_nodes["maximum_robots"] += n_robots_over_maximum
+                search_counters.n_pruned_nodes["could_have_bought_but_did_nothing"] += (can_buy_ore_robot and current_robot_path.could_have_bought_ore_robot_but_did_nothing) + (can_buy_clay_robot and current_robot_path.could_have_bought_clay_robot_but_did_nothing) + (can_buy_obsidian_robot and current_robot_path.could_have_bought_obsidian_robot_but_did_nothing)
+                search_counters.n_pruned_nodes["geode_robot_instead_of_nothing"] += can_buy_geode_robot
+
             # the nothing_done_robot_path is appended first, as in principle will be less efficient than paths where something is built
             if can_buy_geode_robot == False:
                 # it is not possible that not doing anything is better than building a geode robot, so this is only executed if no geode robot can be built
@@ -206,38 +231,64 @@ def solve_first_part(blueprint_list, n_minutes_to_consider=N_MINUTES, print_resu
 
 
         most_geodes_by_blueprint[blueprint_id-1] = most_geode_number
-        total_quality_level += most_geode_number * blueprint_id
-    
-     
-    if print_result==True:
-        print("With {} minutes, the total quality level is {}. The largest number of geodes is {} for Blueprint 1".format(N_MINUTES, total_quality_level, most_geodes_by_blueprint[0]), end="")
-        for blueprint_id, most_geode in enumerate(most_geodes_by_blueprint[1:-1], start=2):
-            print(", {} for Blueprint {}".format(most_geode, blueprint_id), end="")
-        print(" and {} for Blueprint {}".format(most_geodes_by_blueprint[-1], len(most_geodes_by_blueprint)))
 
     return most_geodes_by_blueprint
 
 
-def solve_second_part(blueprint_list):
-    most_geodes_by_blueprint = solve_first_part(blueprint_list[:N_BLUEPRINTS_TO_CONSIDER_PART2], n_minutes_to_consider=N_MINUTES_PART2, print_result=False)
+def solve_first_part(blueprint_list, search_counters=None):
+    most_geodes_by_blueprint = get_most_geodes_by_blueprint(blueprint_list, N_MINUTES, search_counters)
+
+    total_quality_level = 0
+    for blueprint_id, most_geode_number in enumerate(most_geodes_by_blueprint, start=1):
+        total_quality_level += most_geode_number * blueprint_id
+
+    return PuzzleResult(total_quality_level, {"most_geodes_by_blueprint": most_geodes_by_blueprint})
 
-    geode_multiplication = np.prod(most_geodes_by_blueprint)
 
-    print("Considering only the {} first blueprints and having {} minutes, the product of the maximum attainable number of geodes for each blueprint is {}. The largest number of geodes is {} for Blueprint 1".format(N_BLUEPRINTS_TO_CONSIDER_PART2, N_MINUTES_PART2, geode_multiplication, most_geodes_by_blueprint[0]),end="")
+def solve_second_part(blueprint_list, search_counters=None):
+    most_geodes_by_blueprint = get_most_geodes_by_blueprint(blueprint_list[:N_BLUEPRINTS_TO_CONSIDER_PART2], N_MINUTES_PART2, search_counters)
+
+    geode_multiplication = math.prod(most_geodes_by_blueprint)
+    return PuzzleResult(geode_multiplication, {"most_geodes_by_blueprint": most_geodes_by_blueprint})
+
+
+def print_most_geodes_by_blueprint(most_geodes_by_blueprint):
+    print("The largest number of geodes is {} for Blueprint 1".format(most_geodes_by_blueprint[0]), end="")
     for blueprint_id, most_geode in enumerate(most_geodes_by_blueprint[1:-1], start=2):
         print(", {} for Blueprint {}".format(most_geode, blueprint_id), end="")
     print(" and {} for Blueprint {}".format(most_geodes_by_blueprint[-1], len(most_geodes_by_blueprint)))
         
 
-def main(file_name): 
-    with open(file_name) as file:
-        lines = file.read().splitlines()
+def read_puzzle_input(file_name):
+    lines = list(iterate_lines(file_name))
 
     blueprint_list = parse_puzzle_file(lines)
+    return (blueprint_list,), (blueprint_list,) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, answer_cache=None, part_profiler=None, counting_search=False):
+    if counting_search:
+        answer_cache = None # the counters are only filled if the parts are solved
+        first_part_search_counters = SearchCounters()
+        second_part_search_counters = SearchCounters()
+    else:
+        first_part_search_counters = None
+        second_part_search_counters = None
+
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part(search_counters=first_part_search_counters)
+    print("With {} minutes, the total quality level is {}. ".format(N_MINUTES, first_part_result.answer), end="")
+    print_most_geodes_by_blueprint(first_part_result.diagnostics["most_geodes_by_blueprint"])
+    if counting_search:
+        print_search_counters("first part", first_part_search_counters)
 
-    solve_first_part(blueprint_list)
-    solve_second_part(blueprint_list)
+    second_part_result = puzzle_solver.solve_second_part(search_counters=second_part_search_counters)
+    print("Considering only the {} first blueprints and having {} minutes, the product of the maximum attainable number of geodes for each blueprint is {}. ".format(N_BLUEPRINTS_TO_CONSIDER_PART2, N_MINUTES_PART2, second_part_result.answer), end="")
+    print_most_geodes_by_blueprint(second_part_result.diagnostics["most_geodes_by_blueprint"])
+    if counting_search:
+        print_search_counters("second part", second_part_search_counters)
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
\ No newline at end of file
+    main(*parse_file_name())
\ No newline at end of file
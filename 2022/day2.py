@@ -1,5 +1,15 @@
 import argparse
+import collections
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import read_character_grid, iterate_line_stream, open_line_stream, add_streaming_argument
+from profiling import add_profiling_arguments, get_part_profiler, run_profiled
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 2
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day2.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day2_example.txt"
 
@@ -7,107 +17,104 @@ PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day2_example.txt"
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 2: Rock Paper Scissors")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
+    add_streaming_argument(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     else:
-        return args.file_name[1]
-
-
-
-def solve_first_part(lines):
-    # X is rock, Y is paper, Z is scissors
-    total_score = 0
-    for line in lines:
-        if line[0] == "A":
-            if line[2] == "X":
-                shape_score = 1
-                total_score += 3 + shape_score
-            elif line[2] == "Y":
-                shape_score = 2
-                total_score += 6 + shape_score
-            elif line[2] == "Z":
-                shape_score = 3
-                total_score += 0 + shape_score
-                
-        elif line[0] == "B":
-            if line[2] == "X":
-                shape_score = 1
-                total_score += 0 + shape_score
-            elif line[2] == "Y":
-                shape_score = 2
-                total_score += 3 + shape_score
-            elif line[2] == "Z":
-                shape_score = 3
-                total_score += 6 + shape_score
-
-        elif line[0] == "C":
-            if line[2] == "X":
-                shape_score = 1
-                total_score += 6 + shape_score
-            elif line[2] == "Y":
-                shape_score = 2
-                total_score += 0 + shape_score
-            elif line[2] == "Z":
-                shape_score = 3
-                total_score += 3 + shape_score
-
-    print("The total score is", total_score, "according to the strategy guide")
-
-
-def solve_second_part(lines):
-    # X is rock, Y is paper, Z is scissors
-    total_score = 0
-    for line in lines:
-        if line[0] == "A":
-            if line[2] == "X":
-                shape_score = 3
-                total_score += 0 + shape_score
-            elif line[2] == "Y":
-                shape_score = 1
-                total_score += 3 + shape_score
-            elif line[2] == "Z":
-                shape_score = 2
-                total_score += 6 + shape_score
-                
-        elif line[0] == "B":
-            if line[2] == "X":
-                shape_score = 1
-                total_score += 0 + shape_score
-            elif line[2] == "Y":
-                shape_score = 2
-                total_score += 3 + shape_score
-            elif line[2] == "Z":
-                shape_score = 3
-                total_score += 6 + shape_score
-
-        elif line[0] == "C":
-            if line[2] == "X":
-                shape_score = 2
-                total_score += 0 + shape_score
-            elif line[2] == "Y":
-                shape_score = 3
-                total_score += 3 + shape_score
-            elif line[2] == "Z":
-                shape_score = 1
-                total_score += 6 + shape_score
-
-    print("Considering the Elf's instructions, the total score is", total_score, "according to the strategy guide")
-
-
-def main(file_name):    
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
-
-    solve_first_part(lines)
-    solve_second_part(lines)
+        return args.file_name[1], answer_cache, part_profiler, args.streaming
+
+
+N_SHAPES = 3 # rock, paper and scissors, in this order in both columns: A, B, C for the opponent and X, Y, Z for the second column
+SHAPE_SCORES = (1, 2, 3)
+OUTCOME_SCORES = (0, 3, 6) # lost, draw, won. In the second part, X, Y and Z are these outcomes
+FIRST_COLUMN_FIRST_CHAR = "A"
+SECOND_COLUMN_FIRST_CHAR = "X"
+ROUND_LINE_LENGTH = 3 # e.g. "A Y"
+
+# score of a round, indexed by [opponent shape][own shape]. A shape beats the previous one (paper beats rock), and rock beats scissors, so the own shape wins if it is the next one modulo 3
+ROUND_SCORES = tuple(tuple(SHAPE_SCORES[own_shape] + OUTCOME_SCORES[(own_shape - opponent_shape + 1) % N_SHAPES] for own_shape in range(N_SHAPES)) for opponent_shape in range(N_SHAPES))
+# in the second part, the second column is the outcome, and the own shape the one that gets it: the previous shape to lose, the same one to draw and the next one to win
+SECOND_PART_ROUND_SCORES = tuple(tuple(ROUND_SCORES[opponent_shape][(opponent_shape + outcome - 1) % N_SHAPES] for outcome in range(N_SHAPES)) for opponent_shape in range(N_SHAPES))
+
+
+def get_total_score(round_counts, round_scores):
+    # round_counts[first_column][second_column] is the number of rounds of each of the 9 kinds, so the total is a sum of 9 products however many rounds there are
+    return sum(round_counts[first_column][second_column] * round_scores[first_column][second_column] for first_column in range(N_SHAPES) for second_column in range(N_SHAPES))
+
+
+def solve_first_part(round_counts):
+    return PuzzleResult(get_total_score(round_counts, ROUND_SCORES))
+
+
+def solve_second_part(round_counts):
+    return PuzzleResult(get_total_score(round_counts, SECOND_PART_ROUND_SCORES))
+
+
+def get_line_round_counts(lines):
+    # counts the rounds of each kind of any iterable of lines. The lines are counted by Counter first, so each of the 9 kinds of round (and not each line) is checked and added once, although the iteration over the lines still runs Python code for each line when they come from a generator such as iterate_line_stream
+    round_counts = [[0]*N_SHAPES for _ in range(N_SHAPES)]
+    for line, n_rounds in collections.Counter(lines).items():
+        if len(line) != ROUND_LINE_LENGTH:
+            raise ValueError("{!r} is not a round of the strategy guide".format(line))
+        first_column, second_column = ord(line[0]) - ord(FIRST_COLUMN_FIRST_CHAR), ord(line[2]) - ord(SECOND_COLUMN_FIRST_CHAR)
+        if not (0 <= first_column < N_SHAPES and 0 <= second_column < N_SHAPES):
+            raise ValueError("{!r} is not a round of the strategy guide".format(line))
+        round_counts[first_column][second_column] += n_rounds
+    return round_counts
+
+
+def solve_both_parts(lines):
+    # solves both parts in a single pass over any iterable of lines (e.g. an open file or sys.stdin), so that the lines do not have to be kept in memory. Only the number of rounds of each kind is kept
+    round_counts = get_line_round_counts(lines)
+    return solve_first_part(round_counts), solve_second_part(round_counts)
+
+
+def parse_puzzle_file(character_grid):
+    '''
+    Counts the rounds of each kind from the character codes of the file, with one row per round, e.g. "A Y". The column of the opponent and the own column are turned into indexes of the 3x3 table of kinds of rounds, and np.bincount counts every kind in a single pass over the whole file, without running Python code for each round.
+
+    Returns round_counts, a 3x3 list in which round_counts[first_column][second_column] is the number of rounds of that kind
+    '''
+    if character_grid.size == 0:
+        return [[0]*N_SHAPES for _ in range(N_SHAPES)]
+    if character_grid.shape[1] != ROUND_LINE_LENGTH:
+        raise ValueError("The rounds of the strategy guide must have {} characters, not {}".format(ROUND_LINE_LENGTH, character_grid.shape[1]))
+
+    first_columns = character_grid[:,0].astype(np.int64) - ord(FIRST_COLUMN_FIRST_CHAR)
+    second_columns = character_grid[:,2].astype(np.int64) - ord(SECOND_COLUMN_FIRST_CHAR)
+    if np.any((first_columns < 0) | (first_columns >= N_SHAPES) | (second_columns < 0) | (second_columns >= N_SHAPES)):
+        raise ValueError("The strategy guide has rounds with shapes other than {} and {}".format("ABC", "XYZ"))
+
+    round_counts = np.bincount(first_columns*N_SHAPES + second_columns, minlength=N_SHAPES*N_SHAPES)
+    return round_counts.reshape(N_SHAPES, N_SHAPES).tolist()
+
+
+def read_puzzle_input(file_name):
+    round_counts = parse_puzzle_file(read_character_grid(file_name))
+    return (round_counts,), (round_counts,) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, answer_cache=None, part_profiler=None, streaming=False):
+    if streaming:
+        with open_line_stream(file_name) as line_stream:
+            first_part_result, second_part_result = run_profiled(part_profiler, "both", solve_both_parts, iterate_line_stream(line_stream))
+    else:
+        puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+        first_part_result = puzzle_solver.solve_first_part()
+        second_part_result = puzzle_solver.solve_second_part()
+
+    print("The total score is", first_part_result.answer, "according to the strategy guide")
+    print("Considering the Elf's instructions, the total score is", second_part_result.answer, "according to the strategy guide")
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
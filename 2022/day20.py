@@ -1,7 +1,13 @@
 # NOTE: Python takes into account negatives as well as positives when using the modulo operator (it implements the flored modulo) e.g. -1 % 7 = -7
 
 import argparse
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines
+from profiling import add_profiling_arguments, get_part_profiler
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+DAY = 20
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day20.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day20_example.txt"
 
@@ -18,16 +24,20 @@ N_MIXES = 10
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 20: Grove Positioning System")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler
 
 
-def solve_first_part(encrypted_file, unencrypted_line_indexes=None, print_result=True, extra_printing_string=""):
+def mix_file(encrypted_file, unencrypted_line_indexes=None):
     encryption_length = len(encrypted_file)
     if unencrypted_line_indexes == None:
         unencrypted_line_indexes = list(range(encryption_length)) # stores the original indexes of the file
@@ -59,22 +69,28 @@ def solve_first_part(encrypted_file, unencrypted_line_indexes=None, print_result
                 unencrypted_line_indexes = unencrypted_line_indexes[:idx_list_idx] + unencrypted_line_indexes[idx_list_idx+1:idx_list_idx+1+movement] + [unencrypted_line_indexes[idx_list_idx]] + unencrypted_line_indexes[idx_list_idx+movement+1:]
 
 
-    if print_result == True:
-        original_base_decrypting_number_index = encrypted_file.index(BASE_DECRYPTING_NUMBER)
-        new_base_decrypting_number_index = unencrypted_line_indexes.index(original_base_decrypting_number_index)
+    return unencrypted_line_indexes
 
-        decrypting_movement_1 = (new_base_decrypting_number_index + DECRYPTING_MOVEMENT_1 % encryption_length) % encryption_length
-        decrypting_movement_2 = (new_base_decrypting_number_index + DECRYPTING_MOVEMENT_2 % encryption_length) % encryption_length
-        decrypting_movement_3 = (new_base_decrypting_number_index + DECRYPTING_MOVEMENT_3 % encryption_length) % encryption_length
 
-        coordinate_part_1 = encrypted_file[unencrypted_line_indexes[decrypting_movement_1]]
-        coordinate_part_2 = encrypted_file[unencrypted_line_indexes[decrypting_movement_2]]
-        coordinate_part_3 = encrypted_file[unencrypted_line_indexes[decrypting_movement_3]]
+def get_grove_coordinates(encrypted_file, unencrypted_line_indexes):
+    encryption_length = len(encrypted_file)
+    original_base_decrypting_number_index = encrypted_file.index(BASE_DECRYPTING_NUMBER)
+    new_base_decrypting_number_index = unencrypted_line_indexes.index(original_base_decrypting_number_index)
+
+    decrypting_movement_1 = (new_base_decrypting_number_index + DECRYPTING_MOVEMENT_1 % encryption_length) % encryption_length
+    decrypting_movement_2 = (new_base_decrypting_number_index + DECRYPTING_MOVEMENT_2 % encryption_length) % encryption_length
+    decrypting_movement_3 = (new_base_decrypting_number_index + DECRYPTING_MOVEMENT_3 % encryption_length) % encryption_length
+
+    coordinate_part_1 = encrypted_file[unencrypted_line_indexes[decrypting_movement_1]]
+    coordinate_part_2 = encrypted_file[unencrypted_line_indexes[decrypting_movement_2]]
+    coordinate_part_3 = encrypted_file[unencrypted_line_indexes[decrypting_movement_3]]
+
+    return coordinate_part_1 + coordinate_part_2 + coordinate_part_3
 
-        grove_coordinates = coordinate_part_1 + coordinate_part_2 + coordinate_part_3
-        print("The " + extra_printing_string + "grove coordinates are", grove_coordinates)
-    else:
-        return unencrypted_line_indexes
+
+def solve_first_part(encrypted_file):
+    unencrypted_line_indexes = mix_file(encrypted_file)
+    return PuzzleResult(get_grove_coordinates(encrypted_file, unencrypted_line_indexes))
 
 
 def solve_second_part(encrypted_file):
@@ -83,22 +99,26 @@ def solve_second_part(encrypted_file):
 
     unencrypted_line_indexes = list(range(len(encrypted_file))) # stores the original indexes of the file
 
-    for _ in range(N_MIXES-1):
-        unencrypted_line_indexes = solve_first_part(encrypted_file, unencrypted_line_indexes, print_result=False)
-    solve_first_part(encrypted_file, unencrypted_line_indexes, print_result=True, extra_printing_string="correct ")
+    for _ in range(N_MIXES):
+        unencrypted_line_indexes = mix_file(encrypted_file, unencrypted_line_indexes)
+    return PuzzleResult(get_grove_coordinates(encrypted_file, unencrypted_line_indexes))
+
+
+
+def read_puzzle_input(file_name):
+    encrypted_file = list(map(int,iterate_lines(file_name, as_bytes=True))) # int() reads the bytes directly, without creating a str for each line
+    return (encrypted_file,), (encrypted_file.copy(),) # arguments of solve_first_part and solve_second_part. solve_second_part applies the decryption key to its list, so it receives its own copy
 
 
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
 
-def main(file_name):    
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+    first_part_result = puzzle_solver.solve_first_part()
+    print("The grove coordinates are", first_part_result.answer)
 
-    encrypted_file = list(map(int,lines))
-    solve_first_part(encrypted_file)
-    solve_second_part(encrypted_file)
+    second_part_result = puzzle_solver.solve_second_part()
+    print("The correct grove coordinates are", second_part_result.answer)
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
\ No newline at end of file
+    main(*parse_file_name())
\ No newline at end of file
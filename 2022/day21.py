@@ -8,7 +8,11 @@ The program could benefit from deleting the lines that have been processed, inst
 
 import argparse
 import sys
+from puzzle_result import PuzzleResult
+from profiling import add_profiling_arguments, get_part_profiler
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+DAY = 21
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day21.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day21_example.txt"
 
@@ -20,13 +24,17 @@ NAME_CORRESPONDING_TO_YOU = "humn"
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 21: Monkey Math")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler
 
 
 def parse_puzzle_file(file_contents):
@@ -89,10 +97,10 @@ def solve_first_part(stacked_lines):
                     loop_got_stuck = False
 
     if loop_got_stuck == True:
-        print("This should never happen: the program ended in an infinite loop")
+        return PuzzleResult(None) # this should never happen: the program ended in an infinite loop
     else:
         math_result = monkey_math_operation(int(root_line[1]), int(root_line[3]), root_line[2])
-        print("The monkey named", ROOT_MONKEY_NAME,  "will yell", math_result)
+        return PuzzleResult(math_result)
 
 
 def solve_second_part(stacked_lines):
@@ -172,20 +180,34 @@ def solve_second_part(stacked_lines):
                 break
             
     if loop_got_stuck == True:
-        print("This should never happen: the program ended in an infinite loop")
+        return PuzzleResult(None) # this should never happen: the program ended in an infinite loop
     else:
-        print("The number to be yelled is", math_result)
+        return PuzzleResult(math_result)
 
 
-def main(file_name):    
+def read_puzzle_input(file_name):
     with open(file_name) as file:
         file_contents = file.read()
 
     stacked_lines, stacked_lines_part2 = parse_puzzle_file(file_contents)
+    return (stacked_lines,), (stacked_lines_part2,) # arguments of solve_first_part and solve_second_part
+
 
-    solve_first_part(stacked_lines)
-    solve_second_part(stacked_lines_part2)
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part()
+    if first_part_result.answer == None:
+        print("This should never happen: the program ended in an infinite loop")
+    else:
+        print("The monkey named", ROOT_MONKEY_NAME,  "will yell", first_part_result.answer)
+
+    second_part_result = puzzle_solver.solve_second_part()
+    if second_part_result.answer == None:
+        print("This should never happen: the program ended in an infinite loop")
+    else:
+        print("The number to be yelled is", second_part_result.answer)
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
\ No newline at end of file
+    main(*parse_file_name())
\ No newline at end of file
@@ -5,8 +5,14 @@ The second part has hardcoded the structure of the map for both the example puzz
 '''
 
 import argparse
+import sys
 import enum
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines
+from profiling import add_profiling_arguments, get_part_profiler
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+DAY = 22
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day22.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day22_example.txt"
 
@@ -31,13 +37,17 @@ COUNTERCLOCKWISE_INSTRUCTION = "L"
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 22: Monkey Map")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler
 
 
 def partially_parse_puzzle_file(lines):
@@ -242,8 +252,7 @@ def solve_first_part(initial_position, steps_instructions, blocked_paths, maze,
 
     position_1_based = (last_position[0]+1, last_position[1]+1)  
     password = 1000*position_1_based[0] + position_1_based[1]*4 + last_orientation
-
-    print("The final position is row {}, column {} and oriented {}, which gives the password {}".format(position_1_based[0], position_1_based[1], Orientation(last_orientation).name.lower(), password) )
+    return PuzzleResult(int(password), {"row": position_1_based[0], "column": position_1_based[1], "orientation": Orientation(last_orientation)})
 
 
 def parse_wrapping_points_and_orientations_for_second_part(lines):
@@ -468,21 +477,25 @@ def solve_second_part(lines, initial_position, steps_instructions, blocked_paths
 
     position_1_based = (last_position[0]+1, last_position[1]+1)  
     password = 1000*position_1_based[0] + position_1_based[1]*4 + last_orientation
-
-    print("Considering walking in a cube, the final position is row {}, column {} and oriented {}, which gives the password {}".format(position_1_based[0], position_1_based[1], Orientation(last_orientation).name.lower(), password) )
+    return PuzzleResult(int(password), {"row": position_1_based[0], "column": position_1_based[1], "orientation": Orientation(last_orientation)})
 
 
-def main(file_name):    
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+def read_puzzle_input(file_name):
+    lines = list(iterate_lines(file_name))
 
     initial_position, steps_instructions, blocked_paths, maze, n_rows, n_cols = partially_parse_puzzle_file(lines)
+    return (initial_position, steps_instructions, blocked_paths, maze, n_rows, n_cols), (lines, initial_position, steps_instructions, blocked_paths) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part()
+    print("The final position is row {}, column {} and oriented {}, which gives the password {}".format(first_part_result.diagnostics["row"], first_part_result.diagnostics["column"], first_part_result.diagnostics["orientation"].name.lower(), first_part_result.answer) )
 
-    solve_first_part(initial_position, steps_instructions, blocked_paths, maze, n_rows, n_cols)
-    solve_second_part(lines, initial_position, steps_instructions, blocked_paths)
+    second_part_result = puzzle_solver.solve_second_part()
+    print("Considering walking in a cube, the final position is row {}, column {} and oriented {}, which gives the password {}".format(second_part_result.diagnostics["row"], second_part_result.diagnostics["column"], second_part_result.diagnostics["orientation"].name.lower(), second_part_result.answer) )
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
\ No newline at end of file
+    main(*parse_file_name())
\ No newline at end of file
@@ -6,9 +6,17 @@ It has not been found yet a solution that can predict the final positions of the
 '''
 
 import argparse
-import numpy as np
+import sys
 import enum
+from puzzle_result import PuzzleResult
+from fast_input import read_character_grid
+from profiling import add_profiling_arguments, get_part_profiler
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 23
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day23.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day23_example.txt"
 
@@ -26,23 +34,21 @@ class CardinalDirections(enum.IntEnum):
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 23: Unstable Diffusion")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        return args.file_name[1]
-
+        return args.file_name[1], answer_cache, part_profiler
 
-def parse_puzzle_file(lines):
-    elf_list = []
-    for row_idx, line in enumerate(lines):
-        for col_idx, cell_character in enumerate(line):
-            if(cell_character == ELF_CELL):
-                elf_list.append([row_idx,col_idx])
 
-    elf_positions = np.array(elf_list)
+def parse_puzzle_file(character_grid):
+    elf_positions = np.argwhere(character_grid == ord(ELF_CELL)) # [row_idx, col_idx] of every elf, in row-major order
     return elf_positions
 
 
@@ -122,11 +128,12 @@ def solve_first_part(elf_positions):
     n_elves = elf_positions.shape[0]
 
     orientation_instructions = [CardinalDirections.NORTH, CardinalDirections.SOUTH, CardinalDirections.WEST, CardinalDirections.EAST]
+    stopping_round = None # round in which the elves cannot move anymore, if it happens before N_ROUNDS
     for round_n in range(N_ROUNDS):
 
         positions_elves_able_to_move, occupied_cells_mask = round_first_half(elf_positions, n_elves)
         if positions_elves_able_to_move.size == 0:
-            print("Elves cannot move anymore. The movement process stopped in round", round_n)
+            stopping_round = round_n
             break
         
         # Second phase
@@ -142,7 +149,7 @@ def solve_first_part(elf_positions):
     n_empty_spaces = rectangle_height*rectangle_width - n_elves
 
     # elf_positions[np.lexsort((elf_positions[:,1],elf_positions[:,0]))]
-    print("After", N_ROUNDS, "rounds, the smallest rectangle that contains all Elves has", n_empty_spaces, "emtpy spaces")
+    return PuzzleResult(int(n_empty_spaces), {"stopping_round": stopping_round})
         
 
 
@@ -161,7 +168,6 @@ def solve_second_part(elf_positions):
 
         positions_elves_able_to_move, occupied_cells_mask = round_first_half(elf_positions, n_elves)
         if positions_elves_able_to_move.size == 0:
-            print("Elves cannot move anymore. The movement process stopped in round", round_n)
             break
         
         # Second phase
@@ -176,22 +182,28 @@ def solve_second_part(elf_positions):
     rectangle_width = np.abs(highest_occupied_column) + np.abs(lowest_occupied_column) + 1
     n_empty_spaces = rectangle_height*rectangle_width - n_elves
 
-    print("After", round_n, "rounds, the smallest rectangle that contains all Elves has", n_empty_spaces, "emtpy spaces") # information not actually requested by the puzzle, but nice to have
+    return PuzzleResult(round_n, {"n_empty_spaces": int(n_empty_spaces)}) # n_empty_spaces is information not actually requested by the puzzle, but nice to have
 
 
-def main(file_name):    
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+def read_puzzle_input(file_name):
+    elf_positions = parse_puzzle_file(read_character_grid(file_name))
+    return (elf_positions,), (elf_positions,) # arguments of solve_first_part and solve_second_part
 
-    elf_positions = parse_puzzle_file(lines)
-    
-    solve_first_part(elf_positions)
-    solve_second_part(elf_positions)
+
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part()
+    if first_part_result.diagnostics["stopping_round"] != None:
+        print("Elves cannot move anymore. The movement process stopped in round", first_part_result.diagnostics["stopping_round"])
+    print("After", N_ROUNDS, "rounds, the smallest rectangle that contains all Elves has", first_part_result.answer, "emtpy spaces")
+
+    second_part_result = puzzle_solver.solve_second_part()
+    print("Elves cannot move anymore. The movement process stopped in round", second_part_result.answer)
+    print("After", second_part_result.answer, "rounds, the smallest rectangle that contains all Elves has", second_part_result.diagnostics["n_empty_spaces"], "emtpy spaces")
     
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
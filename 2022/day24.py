@@ -4,8 +4,17 @@ To reduce the number of paths to visit, the current time that a path is taking t
 '''
 
 import argparse
-import numpy as np
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import read_character_grid
+from profiling import add_profiling_arguments, get_part_profiler
+from search_counters import SearchCounters, add_search_counting_argument, print_search_counters
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 24
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day24.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day24_example.txt"
 
@@ -15,41 +24,33 @@ N_EXTRA_ROW_BORDERS_CONSIDERED = 2
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 24: Blizzard Basin")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
+    add_search_counting_argument(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.counting_search
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.counting_search
     else:
-        return args.file_name[1]
-
-
-
-def parse_puzzle_file(lines):
-    n_rows = len(lines) + N_EXTRA_ROW_BORDERS_CONSIDERED # N_EXTRA_ROW_BORDERS_CONSIDERED (2) extra rows are considered in order to take into account the borders of the map. These borders will be marked as impossible to access in further functions
-    n_cols = len(lines[0])
-    starting_position = (1, lines[0].find("."))
-    ending_position = (n_rows-2, lines[-1].find("."))
-
-    left_blizzards = []
-    right_blizzards = []
-    up_blizzards = []
-    down_blizzards = []
-    for row_idx, line in enumerate(lines[1:-1], start=2):
-        for col_idx, character in enumerate(line[1:-1], start=1):
-            if character == "<":
-                left_blizzards.append((row_idx,col_idx))
-            elif character == ">":
-                right_blizzards.append((row_idx,col_idx))
-            elif character == "^":
-                up_blizzards.append((row_idx,col_idx))
-            elif character == "v":
-                down_blizzards.append((row_idx,col_idx))
-
-    left_blizzards = np.array(left_blizzards)
-    right_blizzards = np.array(right_blizzards)
-    up_blizzards = np.array(up_blizzards)
-    down_blizzards = np.array(down_blizzards)
+        return args.file_name[1], answer_cache, part_profiler, args.counting_search
+
+
+
+def parse_puzzle_file(character_grid):
+    n_rows = character_grid.shape[0] + N_EXTRA_ROW_BORDERS_CONSIDERED # N_EXTRA_ROW_BORDERS_CONSIDERED (2) extra rows are considered in order to take into account the borders of the map. These borders will be marked as impossible to access in further functions
+    n_cols = character_grid.shape[1]
+    starting_position = (1, int(np.argmax(character_grid[0] == ord(".")))) # argmax gives the first free cell of the top wall
+    ending_position = (n_rows-2, int(np.argmax(character_grid[-1] == ord("."))))
+
+    valley = character_grid[1:-1,1:-1]
+    valley_offset = np.array([2,1]) # the first row of the valley is the row 2 of the map (the extra row and the top wall are above it), and its first column is the column 1 (the left wall is at its left)
+    left_blizzards = np.argwhere(valley == ord("<")) + valley_offset
+    right_blizzards = np.argwhere(valley == ord(">")) + valley_offset
+    up_blizzards = np.argwhere(valley == ord("^")) + valley_offset
+    down_blizzards = np.argwhere(valley == ord("v")) + valley_offset
 
     return starting_position, ending_position, n_rows, n_cols, left_blizzards, right_blizzards, up_blizzards, down_blizzards
 
@@ -97,23 +98,30 @@ def get_blizzard_map_over_time(starting_position, ending_position, n_rows, n_col
     return covered_by_blizzard_map
 
 
-def consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, considered_time, considered_position):
+def consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, considered_time, considered_position, search_counters=None):
     considered_position_mod = (current_time_mod, considered_position[1], considered_position[2])
     '''
     Check if a considered movement is possible. If it is, it will be added to paths_considered_to_visit 
     '''
 
     if covered_by_blizzard_map[current_time_mod, considered_position[1], considered_position[2]] == False:
+        if search_counters is not None:
+            search_counters.n_visited_checks += 1
         if considered_position_mod in paths_considered_to_visit[current_time_mod]:
             if considered_time < paths_considered_to_visit[current_time_mod][considered_position_mod]: # revisit the path only if there is a chance to get a smaller time
                 paths_to_visit.append(considered_position)
                 paths_considered_to_visit[current_time_mod][considered_position_mod] = considered_time
+            elif search_counters is not None:
+                search_counters.n_visited_hits += 1
         else:
             paths_to_visit.append(considered_position)
             paths_considered_to_visit[current_time_mod][considered_position_mod] = considered_time
 
+    elif search_counters is not None:
+        search_counters.n_pruned_nodes["covered_by_blizzard_map"] += 1 # blizzards and walls
+
 
-def solve_first_part(starting_position, ending_position, covered_by_blizzard_map, starting_time=0, print_result=True):
+def start_to_goal(starting_position, ending_position, covered_by_blizzard_map, starting_time=0, search_counters=None):
     time_until_blizzards_loop = covered_by_blizzard_map.shape[0]
     paths_considered_to_visit = [{} for _ in range(time_until_blizzards_loop)] # list of dictionaries that show the paths already visited in each minute, in order to not consider them again. This can happen quite often (for example, going up and then down is equivalent to waiting in the same position two minutes in a row). The dictionaries keep the actual number of minutes in which the path was reached, for the plausible (although unlikely) case in which it may have taken less time to reach the same position. This value of time is different from the time value which is used to index one dictionary or another, as this index time is looped. The dictionaries store variables as a tuple as (time,row,column)
     paths_to_visit = [np.hstack([starting_time,starting_position])] # lists of positions and times from which a movement can be considered
@@ -121,12 +129,19 @@ def solve_first_part(starting_position, ending_position, covered_by_blizzard_map
     
     minimum_arrival_minutes = np.inf
     while len(paths_to_visit) != 0:
+        if search_counters is not None:
+            search_counters.update_peak_frontier_size(len(paths_to_visit))
         current_time_and_position = paths_to_visit.pop() # the first element is the time (minutes), the second the rows and the third the columns
 
         current_time = current_time_and_position[0] + 1
         if(current_time >= minimum_arrival_minutes):
+            if search_counters is not None:
+                search_counters.n_pruned_nodes["minimum_arrival_minutes"] += 1
             continue # do not consider paths that cannot be faster than an already visited path
 
+        if search_counters is not None:
+            search_counters.n_expanded_nodes += 1
+
         current_time_and_position[0] = current_time
         left_movement = current_time_and_position + [0,0,-1]
         right_movement = current_time_and_position + [0,0,1]
@@ -140,21 +155,18 @@ def solve_first_part(starting_position, ending_position, covered_by_blizzard_map
             current_time_mod = current_time % time_until_blizzards_loop
             
             # the order in which these functions are executed can affect noticeably the time it takes to the program to finish. As the movement from start to end is from the top left to the bottom right, movements that go to the right and down should be prioritized. To do this, they are considered after the other possible movements, so that they appear as last elements in the stack, therefore being checked before many others
-            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, left_movement)
-            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, up_movement)
-            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, current_time_and_position)
-            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, down_movement)
-            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, right_movement)
-
-    if print_result:
-        print("The trip requires a minimum of {} minutes to reach the goal".format(minimum_arrival_minutes))
-    
+            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, left_movement, search_counters)
+            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, up_movement, search_counters)
+            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, current_time_and_position, search_counters)
+            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, down_movement, search_counters)
+            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, right_movement, search_counters)
+
     return minimum_arrival_minutes
         
 
-def goal_to_start(starting_position, ending_position, covered_by_blizzard_map, starting_time=0, print_result=True):
+def goal_to_start(starting_position, ending_position, covered_by_blizzard_map, starting_time=0, search_counters=None):
     '''
-    This function contains mostly the same code as solve_first_part, varying only in which movement is checked to see if the ending position has been reached (up instead of down is checked), and the order of execution of the movements to consider (higher priority to movements that go left and up)
+    This function contains mostly the same code as start_to_goal, varying only in which movement is checked to see if the ending position has been reached (up instead of down is checked), and the order of execution of the movements to consider (higher priority to movements that go left and up)
     '''
     time_until_blizzards_loop = covered_by_blizzard_map.shape[0]
     paths_considered_to_visit = [{} for _ in range(time_until_blizzards_loop)]
@@ -163,12 +175,19 @@ def goal_to_start(starting_position, ending_position, covered_by_blizzard_map, s
     
     minimum_arrival_minutes = np.inf
     while len(paths_to_visit) != 0:
+        if search_counters is not None:
+            search_counters.update_peak_frontier_size(len(paths_to_visit))
         current_time_and_position = paths_to_visit.pop()
 
         current_time = current_time_and_position[0] + 1
         if(current_time >= minimum_arrival_minutes):
+            if search_counters is not None:
+                search_counters.n_pruned_nodes["minimum_arrival_minutes"] += 1
             continue # do not consider paths that cannot be faster than an already visited path
 
+        if search_counters is not None:
+            search_counters.n_expanded_nodes += 1
+
         current_time_and_position[0] = current_time
         left_movement = current_time_and_position + [0,0,-1]
         right_movement = current_time_and_position + [0,0,1]
@@ -181,51 +200,88 @@ def goal_to_start(starting_position, ending_position, covered_by_blizzard_map, s
         else:
             current_time_mod = current_time % time_until_blizzards_loop
 
-            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, right_movement)
-            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, down_movement)
-            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, current_time_and_position)
-            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, up_movement)
-            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, left_movement)
+            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, right_movement, search_counters)
+            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, down_movement, search_counters)
+            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, current_time_and_position, search_counters)
+            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, up_movement, search_counters)
+            consider_movement(paths_to_visit, paths_considered_to_visit, covered_by_blizzard_map, current_time_mod, current_time, left_movement, search_counters)
             
 
-    if print_result:
-        print("The path requires {}".format(minimum_arrival_minutes))
-    
     return minimum_arrival_minutes
 
 
-def solve_second_part(starting_position, ending_position, covered_by_blizzard_map, n_minutes_first_trip=0):
+def get_minutes_or_none(minutes):
+    # the searches return np.inf if the goal can not be reached, which is given as None
+    if np.isinf(minutes):
+        return None
+    return int(minutes)
+
+
+def solve_first_part(starting_position, ending_position, covered_by_blizzard_map, search_counters=None):
+    # the answer is None if the goal can not be reached
+    minimum_arrival_minutes = start_to_goal(starting_position, ending_position, covered_by_blizzard_map, search_counters=search_counters)
+    return PuzzleResult(get_minutes_or_none(minimum_arrival_minutes), {"is_goal_reached": not np.isinf(minimum_arrival_minutes)})
+
+
+def solve_second_part(starting_position, ending_position, covered_by_blizzard_map, n_minutes_first_trip=0, search_counters=None):
+    # the search_counters (if given) add up the searches of all the computed trips
     # as one of the movements to consider is waiting, and this can be done infinitely in the starting and ending positions (as they do not get hit by blizzards), it is possible to simulate the full trip as three different trips, just by measuring the minimum amount of time in which those trips can be done
-    start_to_goal = solve_first_part
-    if n_minutes_first_trip == 0:
-        n_minutes_first_trip = start_to_goal(starting_position, ending_position, covered_by_blizzard_map, print_result=False)
+    # the answer and the minutes of the trips that can not be done are None. n_minutes_first_trip is None if the first part already found that the goal can not be reached
+    if n_minutes_first_trip is None:
+        n_minutes_first_trip = np.inf
+    elif n_minutes_first_trip == 0:
+        n_minutes_first_trip = start_to_goal(starting_position, ending_position, covered_by_blizzard_map, search_counters=search_counters)
+    if np.isinf(n_minutes_first_trip):
+        return PuzzleResult(None, {"n_minutes_first_trip": None, "n_minutes_back_trip": None, "n_minutes_final_trip": None})
 
-    n_minutes_back_and_forth = goal_to_start(ending_position, starting_position, covered_by_blizzard_map, starting_time=n_minutes_first_trip, print_result=False)
+    n_minutes_back_and_forth = goal_to_start(ending_position, starting_position, covered_by_blizzard_map, starting_time=n_minutes_first_trip, search_counters=search_counters)
 
-    n_minutes_full_trip = start_to_goal(starting_position, ending_position, covered_by_blizzard_map, starting_time=n_minutes_back_and_forth, print_result=False)
+    if np.isinf(n_minutes_back_and_forth):
+        return PuzzleResult(None, {"n_minutes_first_trip": int(n_minutes_first_trip), "n_minutes_back_trip": None, "n_minutes_final_trip": None})
+
+    n_minutes_full_trip = start_to_goal(starting_position, ending_position, covered_by_blizzard_map, starting_time=n_minutes_back_and_forth, search_counters=search_counters)
 
     n_minutes_back_trip = n_minutes_back_and_forth - n_minutes_first_trip
     n_minutes_final_trip = n_minutes_full_trip - n_minutes_back_and_forth
-    print("The full trip requires {} minutes, {} to go to the goal, {} to go from the goal to the start and {} to go from the start to the goal again".format(n_minutes_full_trip, n_minutes_first_trip, n_minutes_back_trip, n_minutes_final_trip))
+    return PuzzleResult(get_minutes_or_none(n_minutes_full_trip), {"n_minutes_first_trip": get_minutes_or_none(n_minutes_first_trip), "n_minutes_back_trip": get_minutes_or_none(n_minutes_back_trip), "n_minutes_final_trip": get_minutes_or_none(n_minutes_final_trip)})
     
 
 
-def main(file_name):    
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+def read_puzzle_input(file_name):
+    starting_position, ending_position, n_rows, n_cols, left_blizzards, right_blizzards, up_blizzards, down_blizzards = parse_puzzle_file(read_character_grid(file_name))
+    covered_by_blizzard_map = get_blizzard_map_over_time(starting_position, ending_position, n_rows, n_cols, left_blizzards, right_blizzards, up_blizzards, down_blizzards)
+    return (starting_position, ending_position, covered_by_blizzard_map), (starting_position, ending_position, covered_by_blizzard_map) # arguments of solve_first_part and solve_second_part. Run on its own, solve_second_part also computes the first trip
 
 
-    starting_position, ending_position, n_rows, n_cols, left_blizzards, right_blizzards, up_blizzards, down_blizzards = parse_puzzle_file(lines)
-    
-    covered_by_blizzard_map = get_blizzard_map_over_time(starting_position, ending_position, n_rows, n_cols, left_blizzards, right_blizzards, up_blizzards, down_blizzards)
+def main(file_name, answer_cache=None, part_profiler=None, counting_search=False):
+    if counting_search:
+        answer_cache = None # the counters are only filled if the parts are solved
+        first_part_search_counters = SearchCounters()
+        second_part_search_counters = SearchCounters()
+    else:
+        first_part_search_counters = None
+        second_part_search_counters = None
+
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part(search_counters=first_part_search_counters)
+    if first_part_result.answer is None:
+        print("The goal can not be reached")
+    else:
+        print("The trip requires a minimum of {} minutes to reach the goal".format(first_part_result.answer))
+    if counting_search:
+        print_search_counters("first part", first_part_search_counters)
+
+    second_part_result = puzzle_solver.solve_second_part(first_part_result.answer, search_counters=second_part_search_counters)
+    if second_part_result.answer is None:
+        print("The full trip can not be done")
+    else:
+        print("The full trip requires {} minutes, {} to go to the goal, {} to go from the goal to the start and {} to go from the start to the goal again".format(second_part_result.answer, second_part_result.diagnostics["n_minutes_first_trip"], second_part_result.diagnostics["n_minutes_back_trip"], second_part_result.diagnostics["n_minutes_final_trip"]))
+    if counting_search:
+        print_search_counters("second part", second_part_search_counters)
 
-    minimum_arrival_minutes = solve_first_part(starting_position, ending_position, covered_by_blizzard_map)
-    solve_second_part(starting_position, ending_position, covered_by_blizzard_map, minimum_arrival_minutes)
-    
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
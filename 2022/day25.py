@@ -1,5 +1,11 @@
 import argparse
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines, iterate_line_stream, open_line_stream, add_streaming_argument
+from profiling import add_profiling_arguments, get_part_profiler, run_profiled
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+DAY = 25
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day25.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day25_example.txt"
 
@@ -11,13 +17,18 @@ SNAFU_RADIX = 5
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 25: Full of Hot Air")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
+    add_streaming_argument(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler, args.streaming
 
 
 def SNAFU_to_decimal(SNAFU_number):
@@ -76,20 +87,27 @@ def solve_first_part(lines):
 
     number_sum_SNAFU = decimal_to_SNAFU(number_sum_decimal)
 
-    print("The sum of the numbers in decimal is {}, which is equivalent to {} when using SNAFU".format(number_sum_decimal, number_sum_SNAFU))
+    return PuzzleResult(number_sum_SNAFU, {"number_sum_decimal": number_sum_decimal})
 
 
-def main(file_name): 
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+def read_puzzle_input(file_name):
+    lines = list(iterate_lines(file_name))
 
-    solve_first_part(lines)
-    # there is no second part to be coded for this puzzle
+    return (lines,), None # arguments of solve_first_part. There is no second part to be coded for this puzzle
+
+
+def main(file_name, answer_cache=None, part_profiler=None, streaming=False):
+    if streaming: # solve_first_part already makes a single pass over its lines, so it can solve a stream of lines on its own
+        with open_line_stream(file_name) as line_stream:
+            first_part_result = run_profiled(part_profiler, "first", solve_first_part, iterate_line_stream(line_stream))
+    else:
+        puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+        first_part_result = puzzle_solver.solve_first_part()
+
+    print("The sum of the numbers in decimal is {}, which is equivalent to {} when using SNAFU".format(first_part_result.diagnostics["number_sum_decimal"], first_part_result.answer))
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
@@ -1,106 +1,152 @@
 import argparse
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import read_bytes, iterate_line_stream, open_line_stream, add_streaming_argument, LINE_ENDING_CHARACTERS
+from profiling import add_profiling_arguments, get_part_profiler, run_profiled
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 3
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day3.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day3_example.txt"
 
-BELLOW_SMALLEST_INTEGER_VALUE_LOWERCASE_LETTER = ord("a")
-SMALLEST_INTEGER_VALUE_FOR_UPPERCASE_LETTER = ord("A")
 PRIORITY_LOWERCASE_LETTER = 1
 PRIORITY_UPPERCASE_LETTER = 27
-LAST_UPPERCASE_LETTER_INTEGER_VALUE = ord("Z")
+N_LETTERS = 26
+ITEM_PRIORITIES = {**{chr(ord("a")+letter_idx): PRIORITY_LOWERCASE_LETTER+letter_idx for letter_idx in range(N_LETTERS)}, **{chr(ord("A")+letter_idx): PRIORITY_UPPERCASE_LETTER+letter_idx for letter_idx in range(N_LETTERS)}}
+GROUP_SIZE = 3
+
+# The items of a rucksack (or of one of its compartments) are kept as a mask of 52 bits, in which the bit in the position of the priority of an item is set if the item is there, so the items in common are the bitwise AND of the masks and the priority of an item is the position of its bit (bit 0 is not used)
+ITEM_BITS = {item: 1 << priority for item, priority in ITEM_PRIORITIES.items()}
 
 
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 3: Rucksack Reorganization")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
+    add_streaming_argument(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler, args.streaming
 
 
 
-def solve_first_part(lines):
-    total_priority_value = 0
-    for line in lines:
-        half_marker = len(line) // 2
-        first_compartment = line[:half_marker]
-        second_compartment = line[half_marker:]
-        
-        same_letter = ''
-        for first_comp_letter in first_compartment:
-            for second_comp_letter in second_compartment:
-                if(first_comp_letter == second_comp_letter):
-                    same_letter = first_comp_letter
-                    break
-            if same_letter != '':
-                break
-            
-        if ord(same_letter) <= LAST_UPPERCASE_LETTER_INTEGER_VALUE:
-            # capital letter
-            total_priority_value += ord(same_letter) - SMALLEST_INTEGER_VALUE_FOR_UPPERCASE_LETTER + PRIORITY_UPPERCASE_LETTER
-        else:
-            # lowercase letter
-            total_priority_value += ord(same_letter) - BELLOW_SMALLEST_INTEGER_VALUE_LOWERCASE_LETTER + PRIORITY_LOWERCASE_LETTER
-
-    print("The total priority value of the items in common is", total_priority_value)
-
-
-def solve_second_part(lines):
-    total_priority_value = 0
-    group_counter = 0
+def get_item_mask(items):
+    # set() finds the different items in C, so only the (at most 52) different items are looped over in Python, however long the rucksack is
+    item_mask = 0
+    for item in set(items):
+        item_mask |= ITEM_BITS[item]
+    return item_mask
+
+
+def get_mask_priority(item_mask):
+    # priority of the only item of the mask
+    if item_mask == 0:
+        raise ValueError("There is no item in common")
+    return item_mask.bit_length() - 1
+
+
+def get_compartments_priority(line):
+    half_marker = len(line) // 2
+    return get_mask_priority(get_item_mask(line[:half_marker]) & get_item_mask(line[half_marker:]))
+
+
+def get_group_priority(line1, line2, line3):
+    return get_mask_priority(get_item_mask(line1) & get_item_mask(line2) & get_item_mask(line3))
+
+
+def get_masks_priorities(item_masks):
+    # get_mask_priority for an array of masks. The masks with a single item are powers of two below 2**53, which float64 represents exactly, so their base-2 logarithm is the position of their bit
+    if np.any(item_masks == 0):
+        raise ValueError("There is no item in common")
+    return np.log2(item_masks.astype(np.float64)).astype(np.int64)
+
+
+def solve_first_part(compartment_masks):
+    total_priority_value = int(np.sum(get_masks_priorities(compartment_masks[:,0] & compartment_masks[:,1])))
+    return PuzzleResult(total_priority_value)
+
+
+def solve_second_part(compartment_masks):
+    rucksack_masks = compartment_masks[:,0] | compartment_masks[:,1]
+    n_groups = len(rucksack_masks) // GROUP_SIZE
+    group_masks = np.bitwise_and.reduce(rucksack_masks[:n_groups*GROUP_SIZE].reshape(n_groups, GROUP_SIZE), axis=1) # the items in common of all groups at once
+    total_priority_value = int(np.sum(get_masks_priorities(group_masks)))
+    return PuzzleResult(total_priority_value)
+
+
+def solve_both_parts(lines):
+    # solves both parts in a single pass over any iterable of lines (e.g. an open file or sys.stdin), so that the lines do not have to be kept in memory. Only the lines of the current three-Elf group are kept
+    first_part_total_priority_value = 0
+    second_part_total_priority_value = 0
+    group_lines = []
     for line in lines:
-        if group_counter == 0:
-            line1 = line
-            group_counter += 1
-            continue
-        elif group_counter == 1:
-            line2 = line
-            group_counter += 1
-            continue
-        elif group_counter == 2:
-            line3 = line
-            group_counter = 0
-        
-
-        same_letter = ''
-        for line1_letter in line1:
-            for line2_letter in line2:
-                if line1_letter == line2_letter:
-                    for line3_letter in line3:
-                        if line1_letter == line3_letter:
-                            same_letter = line1_letter
-                            break
-                
-                if same_letter != '':
-                    break
-            if same_letter != '':
-                break
-                    
-        if ord(same_letter) <= LAST_UPPERCASE_LETTER_INTEGER_VALUE:
-            # capital letter
-            total_priority_value += ord(same_letter) - SMALLEST_INTEGER_VALUE_FOR_UPPERCASE_LETTER + PRIORITY_UPPERCASE_LETTER
-        else:
-            # lowercase letter
-            total_priority_value += ord(same_letter) - BELLOW_SMALLEST_INTEGER_VALUE_LOWERCASE_LETTER + PRIORITY_LOWERCASE_LETTER
-
-    print("The total priority value of the items in common for three-Elf groups is", total_priority_value)
-
-
-def main(file_name):    
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
-
-    solve_first_part(lines)
-    solve_second_part(lines)
+        first_part_total_priority_value += get_compartments_priority(line)
+
+        group_lines.append(line)
+        if len(group_lines) == GROUP_SIZE:
+            second_part_total_priority_value += get_group_priority(*group_lines)
+            group_lines = []
+
+    return PuzzleResult(first_part_total_priority_value), PuzzleResult(second_part_total_priority_value)
+
+
+def parse_puzzle_file(file_bytes):
+    '''
+    Returns an array of shape (n_rucksacks, 2) with the item masks of the two compartments of every rucksack, computed for the whole file at once: every byte is turned into the bit of its item (0 for the line endings), and np.bitwise_or.reduceat joins the bits between the start of each compartment and the start of the next one
+    '''
+    file_array = np.frombuffer(file_bytes, dtype=np.uint8)
+    content_length = len(file_array)
+    while content_length > 0 and file_array[content_length-1] in LINE_ENDING_CHARACTERS: # ignore the last empty lines
+        content_length -= 1
+    if content_length == 0:
+        return np.zeros((0, 2), dtype=np.uint64)
+    file_array = file_array[:content_length]
+
+    line_ends = np.append(np.flatnonzero(file_array == ord("\n")), content_length)
+    line_starts = np.append(0, line_ends[:-1] + 1)
+    line_lengths = line_ends - line_starts
+    has_carriage_return = np.zeros(len(line_ends), dtype=bool)
+    has_carriage_return[line_lengths > 0] = file_array[line_ends[line_lengths > 0] - 1] == ord("\r")
+    line_lengths -= has_carriage_return
+    if np.any(line_lengths < 2):
+        raise ValueError("Every rucksack must have at least an item in each compartment")
+
+    byte_bits = np.zeros(256, dtype=np.uint64)
+    for item, item_bit in ITEM_BITS.items():
+        byte_bits[ord(item)] = item_bit
+    compartment_starts = np.column_stack([line_starts, line_starts + line_lengths//2]).ravel() # both compartments start before the next line starts, as they are not empty, so the offsets are increasing
+    return np.bitwise_or.reduceat(byte_bits[file_array], compartment_starts).reshape(-1, 2)
+
+
+def read_puzzle_input(file_name):
+    compartment_masks = parse_puzzle_file(read_bytes(file_name))
+    return (compartment_masks,), (compartment_masks,) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, answer_cache=None, part_profiler=None, streaming=False):
+    if streaming:
+        with open_line_stream(file_name) as line_stream:
+            first_part_result, second_part_result = run_profiled(part_profiler, "both", solve_both_parts, iterate_line_stream(line_stream))
+    else:
+        puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+        first_part_result = puzzle_solver.solve_first_part()
+        second_part_result = puzzle_solver.solve_second_part()
+
+    print("The total priority value of the items in common is", first_part_result.answer)
+    print("The total priority value of the items in common for three-Elf groups is", second_part_result.answer)
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
@@ -1,68 +1,137 @@
 import argparse
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import read_bytes, iterate_line_stream, open_line_stream, add_streaming_argument
+from profiling import add_profiling_arguments, get_part_profiler, run_profiled
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 4
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day4.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day4_example.txt"
 
+N_SECTION_NUMBERS_BY_PAIR = 4 # first and last section of each Elf, e.g. 2-4,6-8
+SECTION_SEPARATORS = b",-"
+
 
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 4: Camp Cleanup")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
+    add_streaming_argument(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler, args.streaming
 
 
-def solve_first_part(lines):
-    n_fully_overlaping_pairs = 0
-    for line in lines:
-        elf1, elf2 = line.split(",")
-        elf1_task_first, elf1_task_last = [int(section_number) for section_number in elf1.split("-")]
-        elf2_task_first, elf2_task_last = [int(section_number) for section_number in elf2.split("-")]
-        
-        if elf1_task_first <= elf2_task_first and elf1_task_last >= elf2_task_last:
-            n_fully_overlaping_pairs += 1
-        elif elf2_task_first <= elf1_task_first and elf2_task_last >= elf1_task_last:
-            n_fully_overlaping_pairs +=1
+def parse_section_assignments(line):
+    elf1, elf2 = line.split(",")
+    elf1_task_first, elf1_task_last = [int(section_number) for section_number in elf1.split("-")]
+    elf2_task_first, elf2_task_last = [int(section_number) for section_number in elf2.split("-")]
+    return elf1_task_first, elf1_task_last, elf2_task_first, elf2_task_last
+
+
+def is_pair_fully_overlaping(elf1_task_first, elf1_task_last, elf2_task_first, elf2_task_last):
+    return (
+        (elf1_task_first <= elf2_task_first and elf1_task_last >= elf2_task_last) or
+        (elf2_task_first <= elf1_task_first and elf2_task_last >= elf1_task_last)
+    )
+
+
+def is_pair_overlaping(elf1_task_first, elf1_task_last, elf2_task_first, elf2_task_last):
+    # two ranges overlap unless one of them ends before the other one starts
+    return elf1_task_first <= elf2_task_last and elf2_task_first <= elf1_task_last
+
+
+def solve_first_part(section_assignments):
+    elf1_task_first, elf1_task_last, elf2_task_first, elf2_task_last = section_assignments.T # the same expression as is_pair_fully_overlaping, for all pairs at once
+    are_pairs_fully_overlaping = ((elf1_task_first <= elf2_task_first) & (elf1_task_last >= elf2_task_last)) | ((elf2_task_first <= elf1_task_first) & (elf2_task_last >= elf1_task_last))
+    n_fully_overlaping_pairs = int(np.count_nonzero(are_pairs_fully_overlaping))
+
+    return PuzzleResult(n_fully_overlaping_pairs)
+
+
+def solve_second_part(section_assignments):
+    elf1_task_first, elf1_task_last, elf2_task_first, elf2_task_last = section_assignments.T
+    n_overlaping_pairs = int(np.count_nonzero((elf1_task_first <= elf2_task_last) & (elf2_task_first <= elf1_task_last)))
 
-    print("The assignment pairs fully overlap", n_fully_overlaping_pairs, "times")
+    return PuzzleResult(n_overlaping_pairs)
 
 
-def solve_second_part(lines):
+class SectionAssignmentIndex:
+    '''
+    Counts how many section assignments (of every Elf of every pair) overlap a range of sections, in logarithmic time, for sets of assignments that are queried many times.
+
+    An assignment does not overlap [first_section, last_section] if it starts after last_section or ends before first_section, and both can not happen at once. So the overlapping assignments are all the assignments but the ones that start after the range and the ones that end before it, which are counted with a binary search in the sorted first sections and in the sorted last sections
+    '''
+    def __init__(self, section_assignments):
+        self.sorted_task_firsts = np.sort(section_assignments[:,0::2], axis=None)
+        self.sorted_task_lasts = np.sort(section_assignments[:,1::2], axis=None)
+
+    def __len__(self):
+        return len(self.sorted_task_firsts)
+
+    def count_overlaping_assignments(self, first_section, last_section):
+        # first_section and last_section can also be arrays, to count the overlaps of many ranges in one call
+        n_starting_after = len(self) - np.searchsorted(self.sorted_task_firsts, last_section, side="right")
+        n_ending_before = np.searchsorted(self.sorted_task_lasts, first_section, side="left")
+        n_overlaping_assignments = len(self) - n_starting_after - n_ending_before
+        if np.ndim(n_overlaping_assignments) == 0:
+            return int(n_overlaping_assignments)
+        return n_overlaping_assignments
+
+
+def solve_both_parts(lines):
+    # solves both parts in a single pass over any iterable of lines (e.g. an open file or sys.stdin), so that the lines do not have to be kept in memory. Each line is only parsed once
+    n_fully_overlaping_pairs = 0
     n_overlaping_pairs = 0
     for line in lines:
-        elf1, elf2 = line.split(",")
-        elf1_task_first, elf1_task_last = [int(section_number) for section_number in elf1.split("-")]
-        elf2_task_first, elf2_task_last = [int(section_number) for section_number in elf2.split("-")]
-        
-        if (
-            (elf1_task_first <= elf2_task_first and elf1_task_last >= elf2_task_first) or
-            (elf1_task_first <= elf2_task_last and elf1_task_last >= elf2_task_last) 
-        ):
+        section_assignments = parse_section_assignments(line)
+        if is_pair_fully_overlaping(*section_assignments):
+            n_fully_overlaping_pairs += 1
+        if is_pair_overlaping(*section_assignments):
             n_overlaping_pairs += 1
-        elif (
-            (elf2_task_first <= elf1_task_first and elf2_task_last >= elf1_task_first) or
-            (elf2_task_first <= elf1_task_last and elf2_task_last >= elf1_task_last) 
-        ):
-            n_overlaping_pairs +=1
 
-    print("The assignment pairs overlap", n_overlaping_pairs, "times")
+    return PuzzleResult(n_fully_overlaping_pairs), PuzzleResult(n_overlaping_pairs)
 
 
-def main(file_name):    
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+def parse_puzzle_file(file_bytes):
+    # returns an (n_pairs, 4) array with the first and last sections of both Elves of every pair, parsing all numbers at once: the separators are turned into spaces, so the numbers are the words of the file
+    section_numbers = bytes(file_bytes).translate(bytes.maketrans(SECTION_SEPARATORS, b" "*len(SECTION_SEPARATORS))).split()
+    if len(section_numbers) % N_SECTION_NUMBERS_BY_PAIR != 0:
+        raise ValueError("Every line must have the first and last sections of two Elves")
+    return np.fromiter(map(int, section_numbers), dtype=np.int64, count=len(section_numbers)).reshape(-1, N_SECTION_NUMBERS_BY_PAIR)
+
+
+def read_puzzle_input(file_name):
+    section_assignments = parse_puzzle_file(read_bytes(file_name))
+
+    return (section_assignments,), (section_assignments,) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, answer_cache=None, part_profiler=None, streaming=False):
+    if streaming:
+        with open_line_stream(file_name) as line_stream:
+            first_part_result, second_part_result = run_profiled(part_profiler, "both", solve_both_parts, iterate_line_stream(line_stream))
+    else:
+        puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+        first_part_result = puzzle_solver.solve_first_part()
+        second_part_result = puzzle_solver.solve_second_part()
 
-    solve_first_part(lines)
-    solve_second_part(lines)
+    print("The assignment pairs fully overlap", first_part_result.answer, "times")
+    print("The assignment pairs overlap", second_part_result.answer, "times")
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
@@ -1,5 +1,11 @@
 import argparse
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines
+from profiling import add_profiling_arguments, get_part_profiler
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+DAY = 5
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day5.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day5_example.txt"
 
@@ -7,88 +13,105 @@ PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day5_example.txt"
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 5: Supply Stacks")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler
 
 
 
-def solve_first_part(lines):
-    stack_list = [ [] for _ in range(9) ]
-    for line_idx, line in enumerate(lines):
-        if(line[1] == '1'):
-            break
+CRATE_COLUMN_OFFSET = 1 # e.g. "[A] [B]": the crate of stack n is at column 1 + 4*n
+CRATE_COLUMN_STRIDE = 4
+EMPTY_STACK_TOP_ITEM = ' ' # the instructions do not specify whether should be left blank or with space (or if this case may ever happen)
 
-        for list_idx in range(len(stack_list)):
-            if((1+list_idx*4) < len(line)):
-                if(line[1+list_idx*4] != ' '):
-                    stack_list[list_idx].insert(0,line[1+list_idx*4])
 
-    for line in lines[line_idx+2:]:
-        _, n_pops, _, pop_origin, _, pop_destination = line.split(" ")
-        n_pops = int(n_pops)
-        pop_origin = int(pop_origin) - 1
-        pop_destination = int(pop_destination) - 1
-        
-        for _ in range(n_pops):
-            stack_list[pop_destination].append(stack_list[pop_origin].pop())
-            
-    top_items = ''
-    for idx in range(len(stack_list)):
-        if (len(stack_list[idx]) != 0):
-            top_items += stack_list[idx][-1]
-        else: # No items on the stack
-            top_items += ' ' # the instructions do not specify whether should be left blank or with space (or if this case may ever happen)
-
-    print("After the rearrangement procedure the items on top are:", top_items)
-
-
-def solve_second_part(lines):
-    stack_list = [ [] for _ in range(9) ]
-    for line_idx, line in enumerate(lines):
-        if(line[1] == '1'):
+def parse_puzzle_file(lines):
+    '''
+    Returns the initial stacks and the list of moves. Each stack is a list of crates from bottom to top, and there are as many stacks as numbers in the line below the drawing of the stacks. Each move is a tuple (n_pops, pop_origin, pop_destination), with the stacks indexed from 0
+    '''
+    for numbers_line_idx, line in enumerate(lines):
+        if '[' not in line: # the line with the numbers of the stacks, below the drawing of the crates
             break
+    n_stacks = len(lines[numbers_line_idx].split())
+
+    stack_list = [ [] for _ in range(n_stacks) ]
+    for line in reversed(lines[:numbers_line_idx]): # from the bottom up, so every crate is appended on top of the ones below it
+        for list_idx, crate in enumerate(line[CRATE_COLUMN_OFFSET::CRATE_COLUMN_STRIDE]):
+            if crate != ' ':
+                stack_list[list_idx].append(crate)
+
+    move_list = []
+    for line in lines[numbers_line_idx+1:]:
+        if len(line) == 0:
+            continue
+        _, n_pops, _, pop_origin, _, pop_destination = line.split(" ")
+        move_list.append((int(n_pops), int(pop_origin) - 1, int(pop_destination) - 1))
 
-        for list_idx in range(len(stack_list)):
-            if (1+list_idx*4) < len(line):
-                if(line[1+list_idx*4] != ' '):
-                    stack_list[list_idx].insert(0,line[1+list_idx*4])
+    return stack_list, move_list
 
-    for line in lines[line_idx+2:]:
-        _, n_pops, _, pop_origin, _, pop_destination = line.split(" ")
-        n_pops = int(n_pops)
-        pop_origin = int(pop_origin) - 1
-        pop_destination = int(pop_destination) - 1
-        
-        sub_stack = stack_list[pop_origin][-n_pops:]
-        del stack_list[pop_origin][-n_pops:]
-        stack_list[pop_destination] = stack_list[pop_destination] + (sub_stack)
-
-            
-    top_items = ''
-    for idx in range(len(stack_list)):
-        if len(stack_list[idx]) != 0:
-            top_items += stack_list[idx][-1]
-        else: # No items on the stack
-            top_items += ' ' # the instructions do not specify whether should be left blank or with space (or if this case may ever happen)
-
-    print("After the rearrangement procedure considering multiple crates moved at once, the items on top are:", top_items)
-
-def main(file_name):    
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
-
-    solve_first_part(lines)
-    solve_second_part(lines)
+
+def move_crates(stack_list, move_list, keep_order):
+    '''
+    Applies the moves to the stacks, moving the crates one at a time (CrateMover 9000, which reverses the order of the moved crates) or all at once (CrateMover 9001, which keeps it, if keep_order is True).
+
+    Every move costs O(moved crates), whatever the height of the stacks: the moved crates are the end of the origin list, which is copied with a slice and removed with del, and they are added to the end of the destination list with extend, all without moving the crates below them. A move to the same stack leaves it as it is with both cranes, as the crates are put back one at a time (or all at once) where they were taken from
+    '''
+    for n_pops, pop_origin, pop_destination in move_list:
+        if n_pops == 0: # stack[-0:] would be the whole stack
+            continue
+        origin_stack = stack_list[pop_origin]
+        if n_pops > len(origin_stack):
+            raise ValueError("Can not move {} crates from stack {}, which has {}".format(n_pops, pop_origin+1, len(origin_stack)))
+        if pop_origin == pop_destination: # the stack does not change when its crates are put back on it
+            continue
+
+        sub_stack = origin_stack[-n_pops:]
+        del origin_stack[-n_pops:]
+        if not keep_order:
+            sub_stack.reverse()
+        stack_list[pop_destination].extend(sub_stack)
+
+    return stack_list
+
+
+def get_top_items(stack_list):
+    return "".join(stack[-1] if len(stack) != 0 else EMPTY_STACK_TOP_ITEM for stack in stack_list)
+
+
+def solve_first_part(stack_list, move_list):
+    stack_list = move_crates([list(stack) for stack in stack_list], move_list, keep_order=False) # the stacks are copied, as the second part starts from the same ones
+    return PuzzleResult(get_top_items(stack_list))
+
+
+def solve_second_part(stack_list, move_list):
+    stack_list = move_crates([list(stack) for stack in stack_list], move_list, keep_order=True)
+    return PuzzleResult(get_top_items(stack_list))
+
+
+def read_puzzle_input(file_name):
+    stack_list, move_list = parse_puzzle_file(list(iterate_lines(file_name)))
+
+    return (stack_list, move_list), (stack_list, move_list) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part()
+    print("After the rearrangement procedure the items on top are:", first_part_result.answer)
+
+    second_part_result = puzzle_solver.solve_second_part()
+    print("After the rearrangement procedure considering multiple crates moved at once, the items on top are:", second_part_result.answer)
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
@@ -1,81 +1,149 @@
 import argparse
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import read_bytes, open_byte_stream, iterate_byte_chunks, add_streaming_argument
+from profiling import add_profiling_arguments, get_part_profiler, run_profiled
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+DAY = 6
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day6.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day6_example.txt"
 
 N_UNIQUE_CHARACTERS_FOR_PACKAGE = 4
 N_UNIQUE_CHARACTERS_FOR_MESSAGE = 14
+N_BYTE_VALUES = 256
 
 
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 6: Tuning Trouble")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
+    add_streaming_argument(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler, args.streaming
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler, args.streaming
+
+
+class MarkerDetector:
+    '''
+    Finds the first marker (a run of window_size different characters) of a datastream for several window sizes at once, in a single pass and incrementally: the datastream is given in chunks with feed, e.g. as they arrive from a file or a socket, and only the last characters of the previous chunk are kept between chunks.
+
+    Each window size keeps the number of times that every character is in its window and the number of duplicates (characters that are in the window more than once). When a character enters or leaves the window only its count changes, and the number of duplicates only changes when a count goes from 1 to 2 or from 2 to 1, so every character costs O(1) however big the window is, instead of comparing all the characters of the window again. The marker is found when there are no duplicates in a full window.
+
+    The datastream ends at its first line ending, so a line ending at the end of a file is not taken as a character of the datastream
+    '''
+    def __init__(self, window_sizes):
+        self.window_sizes = sorted(set(window_sizes))
+        self.marker_positions = {} # indexed by window size, number of characters read until the end of the first marker
+        self.character_counts = {window_size: [0]*N_BYTE_VALUES for window_size in self.window_sizes} # indexed by byte value, as the counts of letters would need to subtract ord("a") first
+        self.n_duplicates = {window_size: 0 for window_size in self.window_sizes}
+        self.n_read_characters = 0
+        self.previous_characters = b"" # the last characters read, which will leave the windows in the next chunks
+        self.has_ended = False
+
+    def is_done(self):
+        return self.has_ended or len(self.marker_positions) == len(self.window_sizes)
+
+    def feed(self, chunk):
+        if self.is_done():
+            return
+        chunk = bytes(chunk)
+        line_ending_idxs = [line_ending_idx for line_ending_idx in (chunk.find(b"\n"), chunk.find(b"\r")) if line_ending_idx != -1]
+        if len(line_ending_idxs) != 0:
+            chunk = chunk[:min(line_ending_idxs)]
+            self.has_ended = True
+
+        characters = self.previous_characters + chunk
+        first_new_idx = len(self.previous_characters)
+        for window_size in self.window_sizes:
+            if window_size not in self.marker_positions:
+                self.search_marker(window_size, characters, first_new_idx)
+
+        self.n_read_characters += len(chunk)
+        self.previous_characters = characters[-self.window_sizes[-1]:] if len(self.window_sizes) != 0 else b""
+
+    def search_marker(self, window_size, characters, first_new_idx):
+        character_counts = self.character_counts[window_size]
+        n_duplicates = self.n_duplicates[window_size]
+        first_character_position = self.n_read_characters - first_new_idx # position in the datastream of characters[0]
+        for character_idx in range(first_new_idx, len(characters)):
+            character = characters[character_idx]
+            character_counts[character] += 1
+            if character_counts[character] == 2:
+                n_duplicates += 1
+
+            if first_character_position + character_idx >= window_size: # the window is full, so the character that entered it window_size characters ago leaves it
+                leaving_character = characters[character_idx - window_size]
+                character_counts[leaving_character] -= 1
+                if character_counts[leaving_character] == 1:
+                    n_duplicates -= 1
+
+            if n_duplicates == 0 and first_character_position + character_idx >= window_size - 1:
+                self.marker_positions[window_size] = first_character_position + character_idx + 1
+                break
+        self.n_duplicates[window_size] = n_duplicates
 
 
-def check_if_all_characters_are_different(character_list):
-    are_all_different = True
-    for idx, character in enumerate(character_list[:-1]):
-        for sub_idx in range(idx+1,len(character_list)):
-            are_all_different = are_all_different and (character_list[sub_idx] != character)
-        if are_all_different == False:
+def find_markers(datastream_chunks, window_sizes):
+    # returns a dictionary with the position of the first marker of each window size (None if there is none), reading only the chunks needed to find them all
+    marker_detector = MarkerDetector(window_sizes)
+    for chunk in datastream_chunks:
+        marker_detector.feed(chunk)
+        if marker_detector.is_done():
             break
-    return are_all_different
+    return {window_size: marker_detector.marker_positions.get(window_size) for window_size in window_sizes}
 
 
-def search_marker(file_contents, n_unique_characters):
-    previous_characters = [ [] for _ in range(n_unique_characters) ]
-    for idx in range(n_unique_characters):
-        previous_characters[idx] = file_contents[idx]
+def solve_first_part(datastream):
+    marker_position = find_markers(iterate_byte_chunks(datastream), [N_UNIQUE_CHARACTERS_FOR_PACKAGE])[N_UNIQUE_CHARACTERS_FOR_PACKAGE]
+    return PuzzleResult(marker_position)
 
-    are_all_characters_different = check_if_all_characters_are_different(previous_characters)
-    if are_all_characters_different == False:
-        for current_character_position in range(len(file_contents)):
-            previous_characters = previous_characters[1:] + [file_contents[current_character_position+n_unique_characters]]
-            are_all_characters_different = check_if_all_characters_are_different(previous_characters)
-            if are_all_characters_different == True:
-                break
-            
-    if are_all_characters_different == True:
-        current_character_position += n_unique_characters+1
-        return current_character_position
-    else:
-        return None
 
+def solve_second_part(datastream):
+    marker_position = find_markers(iterate_byte_chunks(datastream), [N_UNIQUE_CHARACTERS_FOR_MESSAGE])[N_UNIQUE_CHARACTERS_FOR_MESSAGE]
+    return PuzzleResult(marker_position)
 
-def solve_first_part(file_contents):
-    n_unique_characters = N_UNIQUE_CHARACTERS_FOR_PACKAGE
-    marker_position = search_marker(file_contents, n_unique_characters)
-    if marker_position != None:
-        print("First start-of-packet marker detected at character", marker_position)
-    else:
-        print("No pattern detected when looking for start-of-packet marker. This option should never happen")
 
+def solve_both_parts(datastream_chunks):
+    # solves both parts in a single pass over any iterable of byte chunks (e.g. the ones of iterate_byte_chunks over an open file or sys.stdin.buffer), which are not kept in memory
+    marker_positions = find_markers(datastream_chunks, [N_UNIQUE_CHARACTERS_FOR_PACKAGE, N_UNIQUE_CHARACTERS_FOR_MESSAGE])
+    return PuzzleResult(marker_positions[N_UNIQUE_CHARACTERS_FOR_PACKAGE]), PuzzleResult(marker_positions[N_UNIQUE_CHARACTERS_FOR_MESSAGE])
 
-def solve_second_part(file_contents):
-    n_unique_characters = N_UNIQUE_CHARACTERS_FOR_MESSAGE
-    marker_position = search_marker(file_contents, n_unique_characters)
-    if marker_position != None:
-        print("First start-of-message marker detected at character", marker_position)
-    else:
-        print("No pattern detected when looking for start-of-message marker. This option should never happen")
 
+def read_puzzle_input(file_name):
+    datastream = read_bytes(file_name) # mapped into memory, so only the chunks that the search reads are loaded
+
+    return (datastream,), (datastream,) # arguments of solve_first_part and solve_second_part
 
-def main(file_name):    
-    with open(file_name) as file:
-        file_contents = file.read()
 
-    solve_first_part(file_contents)
-    solve_second_part(file_contents)
+def main(file_name, answer_cache=None, part_profiler=None, streaming=False):
+    if streaming:
+        with open_byte_stream(file_name) as byte_stream:
+            first_part_result, second_part_result = run_profiled(part_profiler, "both", solve_both_parts, iterate_byte_chunks(byte_stream))
+    else:
+        puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+        first_part_result = puzzle_solver.solve_first_part()
+        second_part_result = puzzle_solver.solve_second_part()
+
+    if first_part_result.answer != None:
+        print("First start-of-packet marker detected at character", first_part_result.answer)
+    else:
+        print("No pattern detected when looking for start-of-packet marker. This option should never happen")
+
+    if second_part_result.answer != None:
+        print("First start-of-message marker detected at character", second_part_result.answer)
+    else:
+        print("No pattern detected when looking for start-of-message marker. This option should never happen")
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
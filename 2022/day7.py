@@ -1,5 +1,13 @@
 import argparse
-
+import bisect
+import itertools
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines
+from profiling import add_profiling_arguments, get_part_profiler
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
+
+DAY = 7
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day7.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day7_example.txt"
 
@@ -8,131 +16,169 @@ MAXIMUM_ALLOWED_SIZE = 100000
 NECESSARY_SPACE = 30000000
 MAXIMUM_SPACE = 70000000
 
+ROOT_DIRECTORY_NAME = "/"
+ROOT_DIRECTORY_IDX = 0
+NO_PARENT_IDX = -1
+
 
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 7: No Space Left On Device")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        return args.file_name[1]
-
-
-
-class DeviceDirectory():
-    def __init__(self, lines):
-        self.lines = lines
-        self.used_space = None
-    
-    def prepare_subfolder_size_count(self):
-        self.current_path = "" # variable currently not used for anything practical in the code, except for debugging
-        self.line_idx = 0
-        self.accumulated_sizes = 0
-
-
-    # As this function is recursive, it benefits from using variables from inside the class, to avoid copying them continuously
-    def subfolder_size_count(self):
-        current_size = 0
-        while True:
-            line = self.lines[self.line_idx]
-            self.line_idx += 1 
-            if "$ cd" in line:
-                if "$ cd .." in line:
-                    if(current_size <= MAXIMUM_ALLOWED_SIZE):
-                        self.accumulated_sizes += current_size
-                    self.current_path = self.current_path[:self.current_path.rfind("/")]
-                    return current_size
-                else:
-                    if line[len("$ cd "):] != "/":
-                        self.current_path = self.current_path + "/" + line[len("$ cd "):]
-                    subfolder_size = self.subfolder_size_count()
-                    current_size += subfolder_size
-            elif "dir " not in line and "$ ls" not in line:
-                current_size += int(line.split(" ")[0])
-
-            if self.line_idx >= len(self.lines):
-                if current_size <= MAXIMUM_ALLOWED_SIZE:
-                    self.accumulated_sizes += current_size
-                self.current_path = self.current_path[:self.current_path.rfind("/")]
-                return current_size
-
-
-    def prepare_subfolder_search_for_space(self, space_to_delete, proposed_size_to_delete):
-        self.current_path = "" # variable currently not used for anything practical in the code, except for debugging
-        self.line_idx = 0
-        self.space_to_delete = space_to_delete
-        self.proposed_size_to_delete = proposed_size_to_delete
-
-
-    def subfolder_search_for_space(self):
-        current_size = 0
-        while True:
-            line = self.lines[self.line_idx]
-            self.line_idx += 1 
-            if "$ cd" in line:
-                if "$ cd .." in line:
-                    if current_size >= self.space_to_delete and current_size < self.proposed_size_to_delete:
-                        self.proposed_size_to_delete = current_size
-                    self.current_path = self.current_path[:self.current_path.rfind("/")]
-                    return current_size
-                else:
-                    if line[len("$ cd "):] != "/":
-                        self.current_path = self.current_path + "/" + line[len("$ cd "):]
-                    subfolder_size = self.subfolder_search_for_space()
-                    current_size += subfolder_size
-            elif "dir " not in line and "$ ls" not in line:
-                current_size += int(line.split(" ")[0])
-
-            if self.line_idx >= len(self.lines):
-                if current_size >= self.space_to_delete and current_size < self.proposed_size_to_delete:
-                    self.proposed_size_to_delete = current_size
-                self.current_path = self.current_path[:self.current_path.rfind("/")]
-                return current_size
-
-
-
-def solve_first_part(device_directory):
-    device_directory.prepare_subfolder_size_count()
-    device_directory.used_space = device_directory.subfolder_size_count()
-    print("The added size of the directories with a size of at most", MAXIMUM_ALLOWED_SIZE, "is", device_directory.accumulated_sizes)
+        return args.file_name[1], answer_cache, part_profiler
+
+
+
+class DirectorySizeIndex:
+    '''
+    Sorted sizes of the directories, with their cumulative sums, so that the sum of the sizes of the directories of at most a size, and the smallest directory of at least a size, are both found with a binary search, in O(log n) for every query
+    '''
+    def __init__(self, directory_sizes):
+        self.sorted_sizes = sorted(directory_sizes)
+        self.cumulative_sizes = [0] + list(itertools.accumulate(self.sorted_sizes)) # cumulative_sizes[n] is the sum of the n smallest sizes
+
+    def sum_sizes_at_most(self, maximum_size):
+        return self.cumulative_sizes[bisect.bisect_right(self.sorted_sizes, maximum_size)]
+
+    def get_smallest_size_at_least(self, minimum_size):
+        # None if no directory is that big
+        size_idx = bisect.bisect_left(self.sorted_sizes, minimum_size)
+        if size_idx == len(self.sorted_sizes):
+            return None
+        return self.sorted_sizes[size_idx]
+
+
+class DirectoryTree:
+    '''
+    Directories of the device, as compact arrays indexed by directory: the index of the parent of each directory, its name and the added size of the files directly inside it. The root is the directory 0.
+
+    Every directory is created after its parent, so its index is always bigger than the one of its parent. This allows to compute the sizes of all directories bottom-up in a single loop (going through the directories from the last one, each one adds its size to its parent) without recursion, however deep the tree is
+    '''
+    def __init__(self):
+        self.parent_idxs = [NO_PARENT_IDX]
+        self.directory_names = [ROOT_DIRECTORY_NAME]
+        self.file_sizes = [0]
+        self.child_idxs = {} # indexed by (parent index, name), so going into an already known directory does not create it again
+        self.file_names = set() # (directory index, name) of the files already counted, so a directory listed twice does not count its files twice
+        self.directory_sizes = None
+        self.size_index = None
+
+    def get_child_directory(self, parent_idx, directory_name):
+        child_idx = self.child_idxs.get((parent_idx, directory_name))
+        if child_idx is None:
+            child_idx = len(self.parent_idxs)
+            self.parent_idxs.append(parent_idx)
+            self.directory_names.append(directory_name)
+            self.file_sizes.append(0)
+            self.child_idxs[(parent_idx, directory_name)] = child_idx
+            self.directory_sizes = None
+        return child_idx
+
+    def add_file(self, directory_idx, file_name, file_size):
+        if (directory_idx, file_name) not in self.file_names:
+            self.file_names.add((directory_idx, file_name))
+            self.file_sizes[directory_idx] += file_size
+            self.directory_sizes = None
+
+    def get_path(self, directory_idx):
+        directory_names = []
+        while directory_idx != ROOT_DIRECTORY_IDX:
+            directory_names.append(self.directory_names[directory_idx])
+            directory_idx = self.parent_idxs[directory_idx]
+        return ROOT_DIRECTORY_NAME + "/".join(reversed(directory_names))
+
+    def get_directory_sizes(self):
+        # size of every directory, including the files inside its subdirectories. Computed once and kept until the tree changes
+        if self.directory_sizes is None:
+            directory_sizes = list(self.file_sizes)
+            for directory_idx in range(len(directory_sizes)-1, ROOT_DIRECTORY_IDX, -1):
+                directory_sizes[self.parent_idxs[directory_idx]] += directory_sizes[directory_idx]
+            self.directory_sizes = directory_sizes
+            self.size_index = None
+        return self.directory_sizes
+
+    def get_size_index(self):
+        directory_sizes = self.get_directory_sizes()
+        if self.size_index is None:
+            self.size_index = DirectorySizeIndex(directory_sizes)
+        return self.size_index
+
+    def get_used_space(self):
+        return self.get_directory_sizes()[ROOT_DIRECTORY_IDX]
+
+
+def parse_terminal_output(lines):
+    # builds the directory tree in a single pass over the lines, keeping only the index of the current directory
+    directory_tree = DirectoryTree()
+    current_directory_idx = ROOT_DIRECTORY_IDX
+    for line in lines:
+        if line.startswith("$ cd "):
+            directory_name = line[len("$ cd "):]
+            if directory_name == ROOT_DIRECTORY_NAME:
+                current_directory_idx = ROOT_DIRECTORY_IDX
+            elif directory_name == "..":
+                if current_directory_idx != ROOT_DIRECTORY_IDX:
+                    current_directory_idx = directory_tree.parent_idxs[current_directory_idx]
+            else:
+                current_directory_idx = directory_tree.get_child_directory(current_directory_idx, directory_name)
+        elif line.startswith("dir "):
+            directory_tree.get_child_directory(current_directory_idx, line[len("dir "):])
+        elif len(line) != 0 and not line.startswith("$"): # a file, e.g. "14848514 b.txt"
+            file_size, file_name = line.split(" ", 1)
+            directory_tree.add_file(current_directory_idx, file_name, int(file_size))
+
+    return directory_tree
+
+
+def solve_first_part(directory_tree):
+    accumulated_sizes = directory_tree.get_size_index().sum_sizes_at_most(MAXIMUM_ALLOWED_SIZE)
+    return PuzzleResult(accumulated_sizes, {"used_space": directory_tree.get_used_space()})
  
 
-def solve_second_part(device_directory):
-    if device_directory.used_space == None: # this variable should have set already in the first part
-        device_directory.prepare_recursive_search()
-        device_directory.used_space = device_directory.subfolder_size_count()
+def solve_second_part(directory_tree):
+    space_to_delete = NECESSARY_SPACE - (MAXIMUM_SPACE - directory_tree.get_used_space())
+    if space_to_delete <= 0:
+        return PuzzleResult(0, {"space_to_delete": space_to_delete}) # it is not necessary to delete a folder
 
-    space_to_delete = NECESSARY_SPACE - (MAXIMUM_SPACE - device_directory.used_space)
-    if space_to_delete == 0:  
-        print("It is not necessary to delete a folder, there is enough space left")
+    proposed_size_to_delete = directory_tree.get_size_index().get_smallest_size_at_least(space_to_delete)
+    if proposed_size_to_delete is None or proposed_size_to_delete > MAXIMUM_SPACE:
+        return PuzzleResult(MAXIMUM_SPACE, {"space_to_delete": space_to_delete})
 
-    else:
-        device_directory.prepare_subfolder_search_for_space(space_to_delete, MAXIMUM_SPACE)
-        device_directory.subfolder_search_for_space()
+    proposed_directory_path = directory_tree.get_path(directory_tree.get_directory_sizes().index(proposed_size_to_delete))
+    return PuzzleResult(proposed_size_to_delete, {"space_to_delete": space_to_delete, "proposed_directory_path": proposed_directory_path})
 
-        if space_to_delete > NECESSARY_SPACE:
-            print("No folder big enough to delete was found, at most one with size", device_directory.proposed_size_to_delete)
-        else:
-            print("It is proposed to delete a folder with size", device_directory.proposed_size_to_delete)
-        
-        
 
-def main(file_name): 
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+def read_puzzle_input(file_name):
+    directory_tree = parse_terminal_output(iterate_lines(file_name))
+    return (directory_tree,), (directory_tree,) # arguments of solve_first_part and solve_second_part
 
-    device_directory = DeviceDirectory(lines)
 
-    solve_first_part(device_directory)
-    solve_second_part(device_directory)
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part()
+    print("The added size of the directories with a size of at most", MAXIMUM_ALLOWED_SIZE, "is", first_part_result.answer)
+
+    second_part_result = puzzle_solver.solve_second_part()
+    space_to_delete = second_part_result.diagnostics["space_to_delete"]
+    if space_to_delete <= 0:
+        print("It is not necessary to delete a folder, there is enough space left")
+    elif space_to_delete > NECESSARY_SPACE:
+        print("No folder big enough to delete was found, at most one with size", second_part_result.answer)
+    else:
+        print("It is proposed to delete a folder with size", second_part_result.answer)
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
 
 
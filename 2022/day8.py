@@ -1,113 +1,118 @@
 import argparse
-import numpy as np
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import read_character_grid
+from profiling import add_profiling_arguments, get_part_profiler
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 8
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day8.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day8_example.txt"
 
+N_TREE_HEIGHTS = 10 # from 0 to 9
+SCENIC_SCORE_BLOCK_N_TREES = 1024*1024
+
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 8: Treetop Tree House")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        return args.file_name[1]
-
+        return args.file_name[1], answer_cache, part_profiler
 
-def parse_puzzle_file(lines):
-    n_rows = len(lines)
-    n_cols = len(lines[0])
 
-    tree_grid = np.zeros([n_rows,n_cols])
-    for idx, line in enumerate(lines):
-        tree_grid[idx,:] = [int(character) for character in line]
+def parse_puzzle_file(character_grid):
+    tree_grid = np.subtract(character_grid, ord("0"), dtype=np.uint8) # the character codes of the digits are consecutive. A single operation over the whole grid
 
     return tree_grid
 
 
+def get_visible_from_start(tree_grid):
+    # True for the trees that are taller than all the trees before them along the first axis (e.g. seen from above). The tallest tree before each one comes from a cumulative maximum, shifted by one row, and nothing is before the first row (-1)
+    tallest_tree_before = np.full(tree_grid.shape, -1, dtype=np.int8)
+    tallest_tree_before[1:] = np.maximum.accumulate(tree_grid, axis=0)[:-1]
+    return tree_grid > tallest_tree_before
+
+
 def solve_first_part(tree_grid):
+    are_trees_visible = (
+        get_visible_from_start(tree_grid) |
+        get_visible_from_start(tree_grid[::-1])[::-1] |
+        get_visible_from_start(tree_grid.T).T |
+        get_visible_from_start(tree_grid.T[::-1])[::-1].T
+    ) # from above, below, the left and the right. The trees in the borders are always visible, as there is nothing before them
+    visible_trees = int(np.count_nonzero(are_trees_visible))
+
+    return PuzzleResult(visible_trees)
+
+
+def get_viewing_distances_to_start(tree_grid, distance_dtype):
+    '''
+    Returns the viewing distance of every tree towards the start of the first axis (e.g. looking up): the number of rows until the first tree at least as tall, or until the edge.
+
+    The rows are gone through once, keeping for every column the equivalent of a monotonic stack of the trees that can still block the view. As there are only 10 heights, that stack is kept as the index of the last row with a tree of each height or taller (0, the edge, if there is none), so every row is solved for all columns at once: its viewing distances are its index minus the last blocking row of the height of each tree, and then each tree becomes the last blocking row of its height and all the lower ones
+    '''
     n_rows, n_cols = tree_grid.shape
+    last_blocking_row_idxs = np.zeros((N_TREE_HEIGHTS, n_cols), dtype=distance_dtype) # indexed by [height, column]
+    viewing_distances = np.empty((n_rows, n_cols), dtype=distance_dtype)
+    col_idxs = np.arange(n_cols)
+    tree_heights = np.arange(N_TREE_HEIGHTS).reshape(-1, 1)
+    for row_idx in range(n_rows):
+        row_tree_heights = tree_grid[row_idx]
+        viewing_distances[row_idx] = row_idx - last_blocking_row_idxs[row_tree_heights, col_idxs]
+        last_blocking_row_idxs[tree_heights <= row_tree_heights] = row_idx
+
+    return viewing_distances
 
-    visible_trees = n_rows*2 + (n_cols-2)*2 # trees in the borders
-    for col_idx in range(1,n_cols-1):
-        for row_idx in range(1,n_rows-1):
-            tree_size = tree_grid[row_idx,col_idx]
-            
-            upper_trees = tree_grid[:row_idx,col_idx]
-            if np.max(upper_trees) < tree_size:
-                visible_trees += 1
-                continue
-            lower_trees = tree_grid[row_idx+1:,col_idx]
-            if np.max(lower_trees) < tree_size:
-                visible_trees += 1
-                continue
-            left_trees = tree_grid[row_idx,:col_idx]
-            if np.max(left_trees) < tree_size:
-                visible_trees += 1
-                continue
-            right_trees = tree_grid[row_idx,col_idx+1:]
-            if np.max(right_trees) < tree_size:
-                visible_trees += 1
-                continue
-        
-    print("The are", visible_trees, "visible trees")
- 
 
 def solve_second_part(tree_grid):
-    ''' Note that the trees in the borders/edges are ignored, as at least one of their scenic scores is 0 (no trees to be seen), making their total scenic score 0 '''
+    ''' Note that the trees in the borders/edges get a score of 0 without special handling, as at least one of their viewing distances is 0 (no trees to be seen) '''
+
+    if tree_grid.size == 0:
+        return PuzzleResult(0)
+    distance_dtype = np.min_scalar_type(max(tree_grid.shape)) # uint16 for forests of up to 65535 trees per side, whose products of two distances fit in uint32
+    product_dtype = np.promote_types(distance_dtype, np.uint32)
+
+    vertical_scenic_scores = get_viewing_distances_to_start(tree_grid, distance_dtype).astype(product_dtype)
+    vertical_scenic_scores *= get_viewing_distances_to_start(tree_grid[::-1], distance_dtype)[::-1] # up and down
+    transposed_tree_grid = np.ascontiguousarray(tree_grid.T) # the rows of the transposed grid are the columns, so the left and right distances are computed as the up and down ones
+    horizontal_scenic_scores = get_viewing_distances_to_start(transposed_tree_grid, distance_dtype).astype(product_dtype)
+    horizontal_scenic_scores *= get_viewing_distances_to_start(transposed_tree_grid[::-1], distance_dtype)[::-1]
+    horizontal_scenic_scores = horizontal_scenic_scores.T
 
-    n_rows, n_cols = tree_grid.shape
     highest_scenic_score = 0
-    for col_idx in range(1,n_cols-1):
-        for row_idx in range(1,n_rows-1):
-            tree_size = tree_grid[row_idx,col_idx]
-            
-            upper_trees = np.flip(tree_grid[:row_idx,col_idx])
-            upper_limit = np.max(upper_trees) >= tree_size
-            if upper_limit:
-                current_scenic_score = np.argwhere(upper_trees >= tree_size)[0]+1
-            else:
-                current_scenic_score = len(upper_trees)
-                
-            lower_trees = tree_grid[row_idx+1:,col_idx]
-            lower_limit = np.max(lower_trees) >= tree_size
-            if lower_limit:
-                current_scenic_score *= np.argwhere(lower_trees >= tree_size)[0]+1
-            else:
-                current_scenic_score *= len(lower_trees)
-                
-            left_trees = np.flip(tree_grid[row_idx,:col_idx])
-            left_limit = np.max(left_trees) >= tree_size
-            if left_limit:
-                current_scenic_score *= np.argwhere(left_trees >= tree_size)[0]+1
-            else:
-                current_scenic_score *= len(left_trees)
-                
-            right_trees = tree_grid[row_idx,col_idx+1:]
-            right_limit = np.max(right_trees) >= tree_size
-            if right_limit:
-                current_scenic_score *= np.argwhere(right_trees >= tree_size)[0]+1
-            else:
-                current_scenic_score *= len(right_trees)
-        
-            if highest_scenic_score < current_scenic_score:
-                highest_scenic_score = current_scenic_score[0]
-            
-    print("The highest scenic score is", highest_scenic_score)
+    n_rows_by_block = max(1, SCENIC_SCORE_BLOCK_N_TREES // tree_grid.shape[1]) # the products of the four distances need 64 bits, so they are computed by blocks of rows, instead of for the whole grid at once
+    for first_row_idx in range(0, tree_grid.shape[0], n_rows_by_block):
+        block_scenic_scores = vertical_scenic_scores[first_row_idx:first_row_idx+n_rows_by_block].astype(np.uint64) * horizontal_scenic_scores[first_row_idx:first_row_idx+n_rows_by_block]
+        highest_scenic_score = max(highest_scenic_score, int(block_scenic_scores.max()))
+
+    return PuzzleResult(highest_scenic_score)
         
 
-def main(file_name): 
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
+def read_puzzle_input(file_name):
+    tree_grid = parse_puzzle_file(read_character_grid(file_name))
+    return (tree_grid,), (tree_grid,) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part()
+    print("The are", first_part_result.answer, "visible trees")
 
-    tree_grid = parse_puzzle_file(lines)
-    solve_first_part(tree_grid)
-    solve_second_part(tree_grid)
+    second_part_result = puzzle_solver.solve_second_part()
+    print("The highest scenic score is", second_part_result.answer)
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
+    main(*parse_file_name())
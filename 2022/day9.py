@@ -1,132 +1,172 @@
 import argparse
-import numpy as np
+import array
+import sys
+from puzzle_result import PuzzleResult
+from fast_input import iterate_lines
+from profiling import add_profiling_arguments, get_part_profiler
+from lazy_import import lazy_import
+from answer_cache import CachedPuzzleSolver, add_cache_arguments, get_answer_cache
 
+np = lazy_import("numpy") # only imported when it is first used, see lazy_import.py
+
+DAY = 9
 PUZZLE_INPUT_FILE_NAME = "puzzle_inputs/day9.txt"
 PUZZLE_EXAMPLE_INPUT_FILE_NAME = "puzzle_inputs/day9_example.txt"
 
 ROPE_BODY_LENGTH = 10
+DIRECTION_STEPS = {"R": (1, 0), "L": (-1, 0), "U": (0, 1), "D": (0, -1)}
+COORDINATE_OFFSET = 2**30 # the packed positions are non-negative and fit in 64 bits as long as the coordinates are within +-2**30
+PACKED_X_STEP = 2**31
+MINIMUM_VISITED_POSITIONS_TO_COMPACT = 1024*1024
+MINIMUM_SEGMENT_LENGTH_FOR_NUMPY = 256
 
 def parse_file_name():
     parser = argparse.ArgumentParser(description="Advent of Code Day 9: Rope Bridge")
     parser.add_argument("file_name", type=str, nargs='*', help="if no arguments are given, use default (hardcoded) file path. If one argument is given, use default example path. If at least 2 arguments are given, use second as path")
+    add_cache_arguments(parser)
+    add_profiling_arguments(parser)
     args = parser.parse_args()
+    answer_cache = get_answer_cache(args, DAY)
+    part_profiler = get_part_profiler(args, "day{}".format(DAY))
     if args.file_name == []:
-        return PUZZLE_INPUT_FILE_NAME
+        return PUZZLE_INPUT_FILE_NAME, answer_cache, part_profiler
     elif len(args.file_name) == 1:
-        return PUZZLE_EXAMPLE_INPUT_FILE_NAME
+        return PUZZLE_EXAMPLE_INPUT_FILE_NAME, answer_cache, part_profiler
     else:
-        return args.file_name[1]
+        return args.file_name[1], answer_cache, part_profiler
 
 
-def solve_first_part(lines):
-    base_positions = set()
-    base_positions.add((0,0))
-    current_head = [0,0]
-    current_tail = [0,0]
-    for line in lines:
-        movement = line[0]
-        distance = int(line[2:])
-        
-        if movement == "R":
-            current_head[0] += distance
-        elif movement == "L":
-            current_head[0] -= distance
-        elif movement == "U":
-            current_head[1] += distance
-        elif movement == "D":
-            current_head[1] -= distance
-        
-        x_distance = current_head[0] - current_tail[0]
-        y_distance = current_head[1] - current_tail[1]
-
-        x_distance_abs = abs(x_distance)
-        y_distance_abs = abs(y_distance)
-        if x_distance == 0:
-            pass
-        elif y_distance == 0:
-            pass
-        elif x_distance_abs != y_distance_abs:
-            if x_distance_abs > y_distance_abs and y_distance != 0:
-                current_tail[1] = current_head[1]
-            elif x_distance_abs < y_distance_abs and x_distance != 0:
-                current_tail[0] = current_head[0]
-
-        for _x_steps in range( abs(x_distance -1*np.sign(x_distance)) ):
-            current_tail[0] += 1*np.sign(x_distance)
-            base_positions.add(tuple(current_tail))  
-
-        for _y_steps in range( abs(y_distance -1*np.sign(y_distance)) ):
-            current_tail[1] += 1*np.sign(y_distance)
-            base_positions.add(tuple(current_tail))
-            
-    print("The tail visits", len(base_positions), "positions at least once")
- 
-
-def tail_step(temp_head, temp_tail, track_positions, base_positions):
-    x_distance = temp_head[0] - temp_tail[0]
-    y_distance = temp_head[1] - temp_tail[1]
-    x_distance_abs = abs(x_distance)
-    y_distance_abs = abs(y_distance)
-
-    if not (x_distance_abs <= 1 and y_distance_abs <= 1):
-        if x_distance_abs > y_distance_abs and y_distance != 0:
-            temp_tail[0] += x_distance + -1*np.sign(x_distance)
-            temp_tail[1] = temp_head[1]
-        elif x_distance_abs < y_distance_abs and x_distance != 0:
-            temp_tail[0] = temp_head[0]
-            temp_tail[1] += y_distance + -1*np.sign(y_distance)
+def pack_position(x_position, y_position):
+    # a position as a single integer, so that the visited positions can be kept in an array of integers instead of a set of tuples. Moving one cell along x adds PACKED_X_STEP and along y adds 1
+    return (x_position + COORDINATE_OFFSET)*PACKED_X_STEP + y_position + COORDINATE_OFFSET
+
 
+class VisitedPositions:
+    '''
+    Positions visited by a knot, packed with pack_position into an array of 64-bit integers. The visits are appended as they happen (the same position can be appended many times), and once the array doubles its size since the last time, the repeated positions are removed, so the array never holds more than about twice the number of different positions.
+
+    The simulation appends single positions directly to packed_positions, which is much faster than a method call for each one, and compacts the arrays between moves
+    '''
+    def __init__(self):
+        self.packed_positions = array.array("q")
+        self.n_compacted_positions = 0
+
+    def add_segment(self, first_packed_position, packed_step, n_positions):
+        # adds the positions of a straight move at once: their packed values are an arithmetic sequence, which NumPy creates much faster than range for long moves
+        if n_positions < MINIMUM_SEGMENT_LENGTH_FOR_NUMPY:
+            self.packed_positions.extend(range(first_packed_position, first_packed_position + n_positions*packed_step, packed_step))
         else:
-            temp_tail[0] += x_distance + -1*np.sign(x_distance)
-            temp_tail[1] += y_distance + -1*np.sign(y_distance)
-    
-        if track_positions:
-            base_positions.add(tuple(temp_tail))
+            self.packed_positions.frombytes(np.arange(first_packed_position, first_packed_position + n_positions*packed_step, packed_step, dtype=np.int64).tobytes())
+        self.compact_if_needed()
 
-    return temp_tail
-    
+    def needs_compaction(self):
+        return len(self.packed_positions) >= 2*self.n_compacted_positions + MINIMUM_VISITED_POSITIONS_TO_COMPACT
 
-def solve_second_part(lines):
+    def compact_if_needed(self):
+        if self.needs_compaction():
+            self.compact()
+
+    def compact(self):
+        sorted_packed_positions = np.sort(np.frombuffer(self.packed_positions, dtype=np.int64)) # sorting and removing the repeated neighbours is much faster than np.unique for these arrays
+        unique_packed_positions = sorted_packed_positions[np.append(True, sorted_packed_positions[1:] != sorted_packed_positions[:-1])]
+        self.packed_positions = array.array("q", unique_packed_positions.tobytes())
+        self.n_compacted_positions = len(self.packed_positions)
+
+    def __len__(self):
+        self.compact()
+        return len(self.packed_positions)
+
+
+def simulate_rope(moves, n_knots):
     '''
-    The code was slightly changed from the past part. It predicted the movement of the tail without looking at the individual steps of the head in each cell, just at its final position for each movement direction. When adding more knots to the rope, it seems that it is no longer possible to predict the movement of each subsequent knot just by looking at the final position of each knot head (in many cases, as with the example given in the page, it is still possible). As a result, the code was changed to move each knot head and its subsecuent knot tail one cell at a time
+    Moves a rope of n_knots knots (the first one is the head) and returns the number of different positions visited by each knot.
+
+    The head moves one cell at a time, and every knot follows the previous one if they stop touching. When a knot does not move, the knots behind it do not move either, so the rest of them are not checked. Once every knot is right behind the previous one in the direction of a move (the rope is taut), every knot moves exactly like the head for the rest of the move, so the rest of the move is done at once for all knots
     '''
+    x_positions = [0]*n_knots
+    y_positions = [0]*n_knots
+    visited_positions_by_knot = [VisitedPositions() for _ in range(n_knots)]
+    for visited_positions in visited_positions_by_knot:
+        visited_positions.packed_positions.append(pack_position(0, 0))
+
+    for direction, distance in moves:
+        x_step, y_step = DIRECTION_STEPS[direction]
+        packed_step = x_step*PACKED_X_STEP + y_step
+        if abs(x_positions[0] + x_step*distance) >= COORDINATE_OFFSET or abs(y_positions[0] + y_step*distance) >= COORDINATE_OFFSET:
+            raise ValueError("The head moves too far away, out of the coordinates that can be packed")
+        visited_positions_by_knot[0].add_segment(pack_position(x_positions[0], y_positions[0]) + packed_step, packed_step, distance) # the head always moves in a straight line
+        add_visited_position_by_knot = [visited_positions.packed_positions.append for visited_positions in visited_positions_by_knot]
+
+        for step_idx in range(distance):
+            head_x_position = x_positions[0] = x_positions[0] + x_step
+            head_y_position = y_positions[0] = y_positions[0] + y_step
+            for knot_idx in range(1, n_knots):
+                knot_x_position = x_positions[knot_idx]
+                knot_y_position = y_positions[knot_idx]
+                x_distance = head_x_position - knot_x_position # the knot in front of this one is the head of this knot
+                y_distance = head_y_position - knot_y_position
+                if -1 <= x_distance <= 1 and -1 <= y_distance <= 1: # still touching, so neither this knot nor the ones behind it move
+                    break
+                head_x_position = x_positions[knot_idx] = knot_x_position + (x_distance > 0) - (x_distance < 0)
+                head_y_position = y_positions[knot_idx] = knot_y_position + (y_distance > 0) - (y_distance < 0)
+                add_visited_position_by_knot[knot_idx]((head_x_position + COORDINATE_OFFSET)*PACKED_X_STEP + head_y_position + COORDINATE_OFFSET) # pack_position, inlined
+            else: # every knot moved, so the rope may be taut
+                is_rope_taut = all(x_positions[knot_idx] == x_positions[knot_idx-1] - x_step and y_positions[knot_idx] == y_positions[knot_idx-1] - y_step for knot_idx in range(1, n_knots))
+                n_remaining_steps = distance - step_idx - 1
+                if is_rope_taut and n_remaining_steps != 0:
+                    x_positions[0] += x_step*n_remaining_steps
+                    y_positions[0] += y_step*n_remaining_steps
+                    for knot_idx in range(1, n_knots):
+                        visited_positions_by_knot[knot_idx].add_segment(pack_position(x_positions[knot_idx], y_positions[knot_idx]) + packed_step, packed_step, n_remaining_steps)
+                        x_positions[knot_idx] += x_step*n_remaining_steps
+                        y_positions[knot_idx] += y_step*n_remaining_steps
+                    break
+
+        if visited_positions_by_knot[0].needs_compaction(): # the head moves in every step, so its array is always the first one to grow enough
+            for visited_positions in visited_positions_by_knot:
+                visited_positions.compact_if_needed()
+
+    return [len(visited_positions) for visited_positions in visited_positions_by_knot]
+
+
+def solve_first_part(moves):
+    visited_counts_by_knot = simulate_rope(moves, 2)
+    return PuzzleResult(visited_counts_by_knot[-1])
+
+
+def solve_second_part(moves, n_knots=ROPE_BODY_LENGTH):
+    '''
+    The knots only depend on the ones in front of them, so the tail of the first part is the second knot of this rope, and the number of positions visited by every knot comes from the same simulation
+    '''
+    visited_counts_by_knot = simulate_rope(moves, n_knots)
+    return PuzzleResult(visited_counts_by_knot[-1], {"visited_counts_by_knot": visited_counts_by_knot})
+
 
-    base_positions = set()
-    base_positions.add((0,0))
-    count = 0
-    rope_body = [[0,0] for _ in range(ROPE_BODY_LENGTH)]
+def parse_puzzle_file(lines):
+    moves = []
     for line in lines:
-        direction = line[0]
-        distance = int(line[2:])
-        
-        if direction == "R":
-            movement_distance = [1,0]  
-        elif direction == "L":
-            movement_distance = [-1,0]
-        elif direction == "U":
-            movement_distance = [0,1]
-        elif direction == "D":
-            movement_distance = [0,-1]
-        
-        for _ in range(abs(distance)):
-            rope_body[0][0] +=  movement_distance[0]
-            rope_body[0][1] +=  movement_distance[1]
-            for idx in range(1,ROPE_BODY_LENGTH):
-                rope_body[idx] = tail_step(rope_body[idx-1],rope_body[idx], idx == (ROPE_BODY_LENGTH-1), base_positions)
-        count +=1
-            
-    print("With a rope length of", ROPE_BODY_LENGTH, "the tail visits", len(base_positions), "positions at least once")
-        
-
-def main(file_name): 
-    with open(file_name) as file:
-        lines = file.read().splitlines()
-    while lines[-1] == "": # remove last empty lines, if any. They do not add information and can cause confusion
-        lines.pop()
-
-    solve_first_part(lines)
-    solve_second_part(lines)
+        direction, distance = line.split(" ")
+        if direction not in DIRECTION_STEPS:
+            raise ValueError("Unknown direction {!r}".format(direction))
+        moves.append((direction, int(distance)))
+    return moves
+
+
+def read_puzzle_input(file_name):
+    moves = parse_puzzle_file(iterate_lines(file_name))
+
+    return (moves,), (moves,) # arguments of solve_first_part and solve_second_part
+
+
+def main(file_name, answer_cache=None, part_profiler=None):
+    puzzle_solver = CachedPuzzleSolver(DAY, sys.modules[__name__], file_name, answer_cache=answer_cache, part_profiler=part_profiler)
+
+    first_part_result = puzzle_solver.solve_first_part()
+    print("The tail visits", first_part_result.answer, "positions at least once")
+
+    second_part_result = puzzle_solver.solve_second_part()
+    print("With a rope length of", ROPE_BODY_LENGTH, "the tail visits", second_part_result.answer, "positions at least once")
 
 
 if __name__ == "__main__":
-    main(parse_file_name())
\ No newline at end of file
+    main(*parse_file_name())
\ No newline at end of file
@@ -0,0 +1,132 @@
+'''
+Shared reading of the puzzle files. Instead of reading the whole file into a string and splitting it into a list of lines (and then removing the last empty lines) in every day, the file is mapped into memory with mmap and read in the mode that fits the format of each day:
+- read_bytes: the bytes of the file, without copying them
+- iterate_lines: a lazy iterator of the lines, which are only created when they are needed
+- iterate_blocks: a lazy iterator of the groups of lines separated by empty lines (e.g. the inventory of each Elf in day 1)
+- read_character_grid: a fixed-width grid of characters (e.g. the trees of day 8 or the heightmap of day 12) as a NumPy uint8 array of shape (n_rows, n_cols), which is a view of the mapped file and not a copy
+
+The last empty lines of the files are ignored by all the modes, and the line endings can be "\\n" or "\\r\\n".
+
+The days whose solutions only need one pass over the lines (1, 2, 3, 4, 10 and 25) can also solve a stream of lines, such as an open file or the standard input, without ever keeping more than a few lines in memory: open_line_stream opens it and iterate_line_stream cleans its lines in the same way as iterate_lines. Day 6, whose input is a single (possibly huge) line, reads a stream of bytes in chunks instead, with open_byte_stream and iterate_byte_chunks
+'''
+
+import contextlib
+import mmap
+import sys
+
+LINE_ENDING_CHARACTERS = b"\r\n"
+STANDARD_INPUT_FILE_NAME = "-"
+BYTE_CHUNK_SIZE = 1024*1024 # bytes read at once from a byte stream
+
+
+def read_bytes(file_name):
+    # returns a read-only mmap, which can be sliced, searched and given to NumPy like bytes. The mapping stays valid after the file is closed, until it is no longer used
+    with open(file_name, "rb") as file:
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: # empty files can not be mapped
+            return b""
+
+
+def iterate_line_stream(line_stream):
+    # yields the lines of any iterable of str or bytes lines (e.g. an open file or sys.stdin) without their line endings, ignoring the last empty lines. Only the current line and the number of pending empty lines are kept in memory
+    n_pending_empty_lines = 0 # empty lines are only yielded once a non-empty line follows them, so the last empty lines are ignored
+    for line in line_stream:
+        if isinstance(line, str):
+            line = line.rstrip("\r\n")
+        else:
+            line = line.rstrip(LINE_ENDING_CHARACTERS)
+        if len(line) == 0:
+            n_pending_empty_lines += 1
+            continue
+
+        for _ in range(n_pending_empty_lines):
+            yield line[:0] # empty line of the same type
+        n_pending_empty_lines = 0
+        yield line
+
+
+def iterate_lines(file_name, as_bytes=False):
+    # yields the lines without their line endings, as str or, if as_bytes is True, as bytes (int() accepts both, so numbers do not need to be decoded)
+    file_bytes = read_bytes(file_name)
+    if len(file_bytes) == 0:
+        return
+
+    for line in iterate_line_stream(iter(file_bytes.readline, b"")):
+        yield line if as_bytes else line.decode()
+
+
+def iterate_blocks(file_name, as_bytes=False):
+    # yields lists with the lines of each group of lines separated by one or more empty lines
+    block = []
+    for line in iterate_lines(file_name, as_bytes):
+        if len(line) != 0:
+            block.append(line)
+        elif len(block) != 0:
+            yield block
+            block = []
+    if len(block) != 0:
+        yield block
+
+
+def open_line_stream(file_name):
+    # opens a file to be read line by line, or the standard input if file_name is "-". Use it in a with block
+    if file_name == STANDARD_INPUT_FILE_NAME:
+        return contextlib.nullcontext(sys.stdin)
+    return open(file_name)
+
+
+def open_byte_stream(file_name):
+    # same as open_line_stream, for streams read as bytes
+    if file_name == STANDARD_INPUT_FILE_NAME:
+        return contextlib.nullcontext(sys.stdin.buffer)
+    return open(file_name, "rb")
+
+
+def iterate_byte_chunks(byte_stream, chunk_size=BYTE_CHUNK_SIZE):
+    # yields the bytes of a stream (e.g. an open file, sys.stdin.buffer or socket.makefile("rb")) in chunks of at most chunk_size bytes, so only one chunk is kept in memory. Bytes-like objects, such as the mmap of read_bytes, are sliced into chunks instead
+    if isinstance(byte_stream, (bytes, bytearray, memoryview, mmap.mmap)):
+        for chunk_start in range(0, len(byte_stream), chunk_size):
+            yield byte_stream[chunk_start:chunk_start+chunk_size]
+        return
+    for chunk in iter(lambda: byte_stream.read(chunk_size), b""):
+        yield chunk
+
+
+def add_streaming_argument(parser):
+    parser.add_argument("--stream", dest="streaming", action="store_true", help="solve both parts in a single pass over the lines of the file, keeping only a few lines in memory, so that files bigger than the memory can be solved. Give - as path to read the standard input. The answer cache is not used")
+
+
+def read_character_grid(file_name):
+    '''
+    Returns a read-only NumPy uint8 array of shape (n_rows, n_cols) with the character codes of a file whose lines all have the same length, e.g. grid[row_idx, col_idx] == ord("#").
+
+    The array is a strided view of the mapped file: every row starts where its line starts and the line endings are skipped by the stride, so nothing is copied. Use grid.copy() or grid.astype() to get an array that can be modified
+    '''
+    import numpy as np # imported here, so that the days that only read lines do not have to import NumPy
+
+    file_bytes = read_bytes(file_name)
+    content_length = len(file_bytes)
+    while content_length > 0 and file_bytes[content_length-1] in LINE_ENDING_CHARACTERS: # ignore the last empty lines
+        content_length -= 1
+    if content_length == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    n_cols = file_bytes.find(b"\n", 0, content_length)
+    if n_cols == -1: # a single line
+        n_cols = content_length
+        line_ending_length = 1 # not used, as there is no next row
+    elif n_cols > 0 and file_bytes[n_cols-1] == ord("\r"):
+        n_cols -= 1
+        line_ending_length = 2
+    else:
+        line_ending_length = 1
+    row_stride = n_cols + line_ending_length
+
+    n_rows, remaining_length = divmod(content_length + line_ending_length, row_stride)
+    file_array = np.frombuffer(file_bytes, dtype=np.uint8, count=content_length)
+    line_endings = np.lib.stride_tricks.as_strided(file_array[row_stride-1:], shape=(n_rows-1,), strides=(row_stride,), writeable=False)
+    if remaining_length != 0 or np.any(line_endings != ord("\n")):
+        raise ValueError("The lines of {} do not have the same length, so they can not be read as a grid".format(file_name))
+
+    return np.lib.stride_tricks.as_strided(file_array, shape=(n_rows, n_cols), strides=(row_stride, 1), writeable=False)
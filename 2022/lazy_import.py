@@ -0,0 +1,32 @@
+'''
+Deferred import of heavy modules. Importing NumPy takes longer than solving most days on their puzzle inputs, so the days that only need it in some code paths (e.g. the grid of the map of day 8, or the cycle detection of the second part of day 17) import it with lazy_import: the module is registered at once, but its code only runs the first time one of its attributes is used, e.g. np.zeros.
+
+The days that only used NumPy for scalars (np.sign, np.sort, np.min, np.prod...) do it in pure Python instead, and do not import it at all. benchmarks/import_time_benchmark.py measures the import time of every day, so that a new module-level import does not go unnoticed
+'''
+
+import importlib.util
+import sys
+
+lazily_imported_module_names = set()
+
+
+def lazy_import(module_name):
+    # returns the module, without running its code until one of its attributes is used. If the module was already imported, it is returned as it is
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    module_spec = importlib.util.find_spec(module_name)
+    if module_spec is None:
+        raise ModuleNotFoundError("No module named {!r}".format(module_name), name=module_name)
+    module_spec.loader = importlib.util.LazyLoader(module_spec.loader)
+    module = importlib.util.module_from_spec(module_spec)
+    sys.modules[module_name] = module
+    module_spec.loader.exec_module(module)
+    lazily_imported_module_names.add(module_name)
+    return module
+
+
+def finish_lazy_imports():
+    # runs the code of the modules imported with lazy_import that are still pending, e.g. so that the runners do not measure the import of NumPy as part of the first day that uses it
+    for module_name in sorted(lazily_imported_module_names):
+        getattr(sys.modules[module_name], "__name__")
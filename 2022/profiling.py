@@ -0,0 +1,146 @@
+'''
+Profiling of each part of a solution, to find where the time goes when a day gets slow on a new input, without having to wrap the calls in cProfile by hand.
+
+Every call profiled with PartProfiler.profile_call writes its results to the profile folder, in files named after the day (or puzzle file) and the part, e.g. profiles/day19_first.pstats:
+- trace mode (default): cProfile traces every function call. It writes a .pstats file, which can be explored with python -m pstats, snakeviz or similar tools, and a .collapsed file with the collapsed stacks (one "caller;callee;... microseconds" line per call stack) that flamegraph.pl, speedscope or inferno can draw as a flame graph. cProfile does not record whole stacks, so the stacks of the .collapsed file are rebuilt from the time spent by each caller in each callee
+- sample mode: a background thread takes a sample of the stack of the profiled code every sampling interval. It adds almost no overhead to the profiled code, so long runs such as the second part of day 16 can be profiled, but it only writes the .collapsed file (with the number of samples of each stack) and its precision depends on the number of samples. Python switches between threads every few milliseconds, so intervals shorter than sys.getswitchinterval() do not give more samples
+
+The scripts of every day and the runners (run_all_days.py and run_batch.py) accept --profile, --profile-mode, --profile-folder and --sampling-interval
+'''
+
+import collections
+import os
+import sys
+import threading
+
+DEFAULT_PROFILE_FOLDER = "profiles"
+TRACE_MODE = "trace"
+SAMPLE_MODE = "sample"
+DEFAULT_SAMPLING_INTERVAL = 0.005 # seconds
+MAXIMUM_COLLAPSED_STACK_DEPTH = 100 # rebuilt stacks of recursive functions are cut at this depth
+MICROSECONDS_PER_SECOND = 1000000
+
+
+def get_function_label(file_name, function_name):
+    # e.g. day19.py:get_most_geodes_by_blueprint. Semicolons separate the frames of a collapsed stack, so they can not be part of a label
+    if file_name == "~": # built-in functions, e.g. <built-in method builtins.sorted>
+        return function_name.replace(";", ",")
+    return "{}:{}".format(os.path.basename(file_name), function_name).replace(";", ",")
+
+
+class StackSampler(threading.Thread):
+    def __init__(self, sampled_thread_id, outermost_frame, sampling_interval):
+        super().__init__(daemon=True)
+        self.sampled_thread_id = sampled_thread_id
+        self.outermost_frame = outermost_frame # frame that calls the profiled code. Its frame and the ones above it (main, the runners...) are not part of the stacks
+        self.sampling_interval = sampling_interval
+        self.stack_counts = collections.Counter()
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(self.sampling_interval):
+            frame = sys._current_frames().get(self.sampled_thread_id)
+            stack = []
+            while frame is not None and frame is not self.outermost_frame:
+                stack.append(get_function_label(frame.f_code.co_filename, frame.f_code.co_name))
+                frame = frame.f_back
+            if len(stack) != 0:
+                self.stack_counts[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+def get_collapsed_stacks_from_stats(profile_stats):
+    '''
+    Rebuilds the collapsed stacks of a cProfile run. cProfile records, for every function, its own time and the time spent in it by each of its callers, so the stacks are rebuilt from the root functions down: the time of a function in a stack is split between its own time and its callees in proportion to what cProfile measured for the function as a whole.
+
+    The times are exact for functions that are always called from the same stack, and estimated for the others. Recursive calls are not followed: cProfile already adds the own time of the recursive calls to the first call of the stack
+    '''
+    stats = profile_stats.stats # {function: (primitive calls, total calls, own time, cumulative time, {caller: (primitive calls, total calls, own time, cumulative time)})}
+    callees = collections.defaultdict(list)
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, caller_stats in callers.items():
+            callees[caller].append((function, caller_stats[3]))
+
+    stack_times = collections.Counter()
+    def add_function_stacks(function, stack, cumulative_time):
+        _, _, own_time, function_cumulative_time, _ = stats[function]
+        if function_cumulative_time <= 0:
+            return
+        time_fraction = min(cumulative_time / function_cumulative_time, 1.0)
+        stack = stack + [get_function_label(function[0], function[2])]
+        stack_times[";".join(stack)] += own_time*time_fraction
+        if len(stack) >= MAXIMUM_COLLAPSED_STACK_DEPTH:
+            return
+        for callee, callee_cumulative_time in callees[function]:
+            if get_function_label(callee[0], callee[2]) not in stack: # recursive calls are not followed
+                add_function_stacks(callee, stack, callee_cumulative_time*time_fraction)
+
+    for function, (_, _, _, cumulative_time, callers) in stats.items():
+        if len(callers) == 0:
+            add_function_stacks(function, [], cumulative_time)
+
+    return {stack: round(time*MICROSECONDS_PER_SECOND) for stack, time in stack_times.items() if round(time*MICROSECONDS_PER_SECOND) > 0}
+
+
+def write_collapsed_stacks(file_name, stack_counts):
+    with open(file_name, "w") as file:
+        for stack, count in sorted(stack_counts.items()):
+            file.write("{} {}\n".format(stack, count))
+
+
+class PartProfiler:
+    def __init__(self, file_prefix, profile_folder=DEFAULT_PROFILE_FOLDER, mode=TRACE_MODE, sampling_interval=DEFAULT_SAMPLING_INTERVAL):
+        self.file_prefix = file_prefix # e.g. day19. The part is added to it
+        self.profile_folder = profile_folder
+        self.mode = mode
+        self.sampling_interval = sampling_interval
+
+    def get_profile_file_name(self, part, extension):
+        return os.path.join(self.profile_folder, "{}_{}{}".format(self.file_prefix, part, extension))
+
+    def profile_call(self, part, function, *arguments, **keyword_arguments):
+        # calls function and returns its output, writing the profile of the call. part (e.g. "first") is only used to name the files
+        os.makedirs(self.profile_folder, exist_ok=True)
+        if self.mode == SAMPLE_MODE:
+            stack_sampler = StackSampler(threading.get_ident(), sys._getframe(), self.sampling_interval)
+            stack_sampler.start()
+            try:
+                function_output = function(*arguments, **keyword_arguments)
+            finally:
+                stack_sampler.stop()
+            write_collapsed_stacks(self.get_profile_file_name(part, ".collapsed"), stack_sampler.stack_counts)
+            written_file_names = [self.get_profile_file_name(part, ".collapsed")]
+        else:
+            import cProfile, pstats # imported here, as they are only needed when profiling, and the day scripts import this module every time they run
+            profile = cProfile.Profile()
+            function_output = profile.runcall(function, *arguments, **keyword_arguments)
+            profile.dump_stats(self.get_profile_file_name(part, ".pstats"))
+            write_collapsed_stacks(self.get_profile_file_name(part, ".collapsed"), get_collapsed_stacks_from_stats(pstats.Stats(profile)))
+            written_file_names = [self.get_profile_file_name(part, ".pstats"), self.get_profile_file_name(part, ".collapsed")]
+
+        print("Profile of {} {} written to {}".format(self.file_prefix, part, " and ".join(written_file_names)), file=sys.stderr)
+        return function_output
+
+
+def run_profiled(part_profiler, part, function, *arguments, **keyword_arguments):
+    # calls function through part_profiler, or directly if there is no profiler
+    if part_profiler is None:
+        return function(*arguments, **keyword_arguments)
+    return part_profiler.profile_call(part, function, *arguments, **keyword_arguments)
+
+
+def add_profiling_arguments(parser):
+    parser.add_argument("--profile", dest="profile", action="store_true", help="profile the parsing and each part separately, writing the results to the profile folder. Profiled parts are always solved, even if their answers are cached")
+    parser.add_argument("--profile-mode", dest="profile_mode", choices=(TRACE_MODE, SAMPLE_MODE), default=TRACE_MODE, help="{}: trace every call with cProfile, writing .pstats and .collapsed (flame graph) files. {}: sample the stack every --sampling-interval seconds, writing only .collapsed files, with almost no overhead. Default: {}".format(TRACE_MODE, SAMPLE_MODE, TRACE_MODE))
+    parser.add_argument("--profile-folder", dest="profile_folder", type=str, default=DEFAULT_PROFILE_FOLDER, help="folder in which to write the profiles. Default: " + DEFAULT_PROFILE_FOLDER)
+    parser.add_argument("--sampling-interval", dest="sampling_interval", type=float, default=DEFAULT_SAMPLING_INTERVAL, help="seconds between samples of the {} mode. Default: {}".format(SAMPLE_MODE, DEFAULT_SAMPLING_INTERVAL))
+
+
+def get_part_profiler(args, file_prefix):
+    # PartProfiler for the arguments added by add_profiling_arguments, or None if profiling is not requested
+    if not args.profile:
+        return None
+    return PartProfiler(file_prefix, args.profile_folder, args.profile_mode, args.sampling_interval)
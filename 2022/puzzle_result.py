@@ -0,0 +1,11 @@
+'''
+Result returned by every solve_first_part and solve_second_part function. The solvers do not print anything: the answer (and any extra information that is nice to have, such as the followed path or the number of rounds) is returned, and the main() function of each day prints it
+'''
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PuzzleResult:
+    answer: object # the value requested by the puzzle, an int in most cases. None if no answer was found
+    diagnostics: dict = field(default_factory=dict) # optional extra values, indexed by name
@@ -0,0 +1,162 @@
+'''
+Runs the solutions of several days in a single process, so that the interpreter and the imported modules (e.g. NumPy) are loaded only once. Each day module is imported, its puzzle file is read with read_puzzle_input() and then solve_first_part() and solve_second_part() are called.
+
+The wall time, CPU time and peak memory of the parsing and of each part are measured and shown as a table, or as JSON (which also contains the answer of each part). The peak memory is measured with tracemalloc, which slows down the measured code. If only the times are of interest, the memory measurement can be disabled.
+
+With --profile, the parsing and each part are also profiled (see profiling.py). Profiling slows down the measured code, so the times are less accurate with it
+
+A day that raises an exception does not stop the run: the failed step (the import of the day, the parsing or a part) is reported with the exception instead of its measurements, the parts that do not depend on it are still run, and the exit status is 1
+'''
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+
+from profiling import add_profiling_arguments, get_part_profiler, run_profiled
+from lazy_import import finish_lazy_imports
+
+PUZZLE_INPUT_FILE_NAME_FORMAT = "day{}.txt"
+PUZZLE_EXAMPLE_INPUT_FILE_NAME_FORMAT = "day{}_example.txt"
+DEFAULT_INPUT_FOLDER = "puzzle_inputs"
+
+N_DAYS = 25
+DAYS_WITH_EXAMPLE_DEPENDENT_CONSTANTS = (15,) # days whose read_puzzle_input() needs to know if the file is an example file
+
+BYTES_PER_MEBIBYTE = 1024*1024
+
+
+@dataclass
+class PartMeasurement:
+    day: int
+    part: str
+    wall_time: float # seconds
+    cpu_time: float # seconds
+    peak_memory: int # bytes, None if not measured
+    answer: object = None # PuzzleResult.answer of the part, None for the parsing
+    error: str = None # description of the exception raised by the step, if any. The times and the memory are None then
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Advent of Code 2022: run the solutions of several days in a single process, measuring each part")
+    parser.add_argument("days", type=int, nargs='*', help="days to run. If no days are given, all days are run")
+    parser.add_argument("-e", "--example", dest="using_example_files", action="store_true", help="use the example files (dayX_example.txt) instead of the puzzle files (dayX.txt)")
+    parser.add_argument("-i", "--input-folder", dest="input_folder", type=str, default=DEFAULT_INPUT_FOLDER, help="folder containing the puzzle files. Default: " + DEFAULT_INPUT_FOLDER)
+    parser.add_argument("--json", dest="print_json", action="store_true", help="print the measurements as JSON instead of as a table")
+    parser.add_argument("--no-memory", dest="trace_memory", action="store_false", help="do not measure the peak memory. tracemalloc slows down the measured code, so the times are more accurate without it")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    if args.days == []:
+        args.days = list(range(1,N_DAYS+1))
+    return args
+
+
+def get_puzzle_file_name(day, input_folder, using_example_file):
+    if using_example_file:
+        return os.path.join(input_folder, PUZZLE_EXAMPLE_INPUT_FILE_NAME_FORMAT.format(day))
+    else:
+        return os.path.join(input_folder, PUZZLE_INPUT_FILE_NAME_FORMAT.format(day))
+
+
+def get_error_description(exception):
+    return "{}: {}".format(type(exception).__name__, exception)
+
+
+def measure_call(function, arguments, trace_memory, part_profiler=None, part=None):
+    if trace_memory:
+        tracemalloc.start()
+
+    try:
+        wall_time_begin = time.perf_counter()
+        cpu_time_begin = time.process_time()
+        function_output = run_profiled(part_profiler, part, function, *arguments)
+        cpu_time = time.process_time() - cpu_time_begin
+        wall_time = time.perf_counter() - wall_time_begin
+
+        peak_memory = None
+        if trace_memory:
+            _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        if trace_memory: # also if the function raised, so that the next measurements are not traced from here
+            tracemalloc.stop()
+
+    return function_output, wall_time, cpu_time, peak_memory
+
+
+def run_day(day, file_name, using_example_file=False, trace_memory=True, part_profiler=None):
+    # returns the measurements of the parsing and of each part. A step that raises is returned with its error, and the parts are not run if the import or the parsing fails
+    try:
+        day_module = importlib.import_module("day{}".format(day))
+        finish_lazy_imports() # so that the import of NumPy is not measured as part of the parsing
+    except Exception as exception:
+        return [PartMeasurement(day, "import", None, None, None, error=get_error_description(exception))]
+
+    if day in DAYS_WITH_EXAMPLE_DEPENDENT_CONSTANTS:
+        reading_arguments = (file_name, using_example_file)
+    else:
+        reading_arguments = (file_name,)
+
+    measurements = []
+    try:
+        (first_part_arguments, second_part_arguments), wall_time, cpu_time, peak_memory = measure_call(day_module.read_puzzle_input, reading_arguments, trace_memory, part_profiler, "parse")
+    except Exception as exception:
+        return [PartMeasurement(day, "parse", None, None, None, error=get_error_description(exception))]
+    measurements.append(PartMeasurement(day, "parse", wall_time, cpu_time, peak_memory))
+
+    part_steps = [("first", day_module.solve_first_part, first_part_arguments)]
+    if second_part_arguments is not None: # day 25 has no second part
+        part_steps.append(("second", day_module.solve_second_part, second_part_arguments))
+    for part, solve_part, part_arguments in part_steps:
+        try:
+            part_result, wall_time, cpu_time, peak_memory = measure_call(solve_part, part_arguments, trace_memory, part_profiler, part)
+        except Exception as exception:
+            measurements.append(PartMeasurement(day, part, None, None, None, error=get_error_description(exception)))
+            continue
+        measurements.append(PartMeasurement(day, part, wall_time, cpu_time, peak_memory, part_result.answer))
+
+    return measurements
+
+
+def print_measurement_table(measurements):
+    print("{:>3}  {:<6}  {:>13}  {:>12}  {:>17}  {}".format("Day", "Part", "Wall time (s)", "CPU time (s)", "Peak memory (MiB)", "Answer"))
+    for measurement in measurements:
+        if measurement.error is not None:
+            print("{:>3}  {:<6}  {:>13}  {:>12}  {:>17}  failed with {}".format(measurement.day, measurement.part, "-", "-", "-", measurement.error))
+            continue
+        if measurement.peak_memory is None:
+            peak_memory = "-"
+        else:
+            peak_memory = "{:.2f}".format(measurement.peak_memory / BYTES_PER_MEBIBYTE)
+        if measurement.answer is None or "\n" in str(measurement.answer): # the drawings of day 10 do not fit in a table row
+            answer = "-"
+        else:
+            answer = measurement.answer
+        print("{:>3}  {:<6}  {:>13.4f}  {:>12.4f}  {:>17}  {}".format(measurement.day, measurement.part, measurement.wall_time, measurement.cpu_time, peak_memory, answer))
+
+
+def main(args):
+    measurements = []
+    for day in args.days:
+        file_name = get_puzzle_file_name(day, args.input_folder, args.using_example_files)
+        if not os.path.isfile(file_name):
+            print("Skipping day", day, "as the file", file_name, "does not exist", file=sys.stderr)
+            continue
+        measurements += run_day(day, file_name, args.using_example_files, args.trace_memory, get_part_profiler(args, "day{}".format(day)))
+
+    if args.print_json:
+        print(json.dumps([asdict(measurement) for measurement in measurements], indent=2))
+    else:
+        print_measurement_table(measurements)
+
+    n_failed_steps = sum(measurement.error is not None for measurement in measurements)
+    if n_failed_steps != 0:
+        print(n_failed_steps, "steps failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(parse_arguments())
@@ -0,0 +1,148 @@
+'''
+Solves many puzzle files in parallel, e.g. one file per dataset for the same day. The files are given as folders or glob patterns, and are distributed over a pool of worker processes (one per core by default). Each worker reads and solves whole files with run_all_days.run_day(), and keeps its interpreter and imported day modules between files, so the start-up cost is paid only once per worker and not once per file.
+
+The results are printed as soon as each file is solved, so they come in completion order and not in the given order. With --json, each result is printed as a JSON line.
+
+The day of each file is taken from its name (e.g. day8.txt, day8_example.txt or day8_customer3.txt are solved with day8.py), unless a day is given with --day.
+
+With --profile, each file is profiled (see profiling.py), and its profiles are named after the file, e.g. profiles/day8_customer3_first.pstats
+'''
+
+import argparse
+import glob
+import importlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+
+import run_all_days
+from profiling import add_profiling_arguments, get_part_profiler
+from lazy_import import finish_lazy_imports
+
+DAY_IN_FILE_NAME_PATTERN = re.compile(r"day(\d+)")
+
+
+@dataclass
+class BatchResult:
+    day: int
+    file_name: str
+    first_part_answer: object
+    second_part_answer: object # None for day 25, which has no second part
+    wall_time: float # seconds, adding the parsing and both parts
+    error: str = None # description of the exception raised while solving the file, if any
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Advent of Code 2022: solve many puzzle files in parallel")
+    parser.add_argument("inputs", type=str, nargs='+', help="puzzle files, folders (all their files are solved) or glob patterns, e.g. 'datasets/day8_*.txt'")
+    parser.add_argument("-d", "--day", type=int, default=None, help="day with which to solve all the files. By default, the day is taken from the name of each file (dayX...)")
+    parser.add_argument("-e", "--example", dest="using_example_files", action="store_true", help="the files are example files. Only day 15 needs to know it, as it uses different constants for them")
+    parser.add_argument("-j", "--jobs", dest="n_workers", type=int, default=os.cpu_count(), help="number of worker processes. Default: number of cores ({})".format(os.cpu_count()))
+    parser.add_argument("--json", dest="print_json", action="store_true", help="print each result as a JSON line instead of as text")
+    add_profiling_arguments(parser)
+    return parser.parse_args()
+
+
+def expand_inputs(inputs):
+    file_names = []
+    for input_path in inputs:
+        if os.path.isdir(input_path):
+            input_file_names = [os.path.join(input_path, file_name) for file_name in sorted(os.listdir(input_path))]
+            file_names += [file_name for file_name in input_file_names if os.path.isfile(file_name)]
+        elif os.path.isfile(input_path):
+            file_names.append(input_path)
+        else:
+            matching_file_names = sorted(glob.glob(input_path))
+            if len(matching_file_names) == 0:
+                print("No file matches", input_path, file=sys.stderr)
+            file_names += [file_name for file_name in matching_file_names if os.path.isfile(file_name)]
+    return file_names
+
+
+def get_day_from_file_name(file_name):
+    day_match = DAY_IN_FILE_NAME_PATTERN.search(os.path.basename(file_name))
+    if day_match is None or not 1 <= int(day_match.group(1)) <= run_all_days.N_DAYS:
+        return None
+    return int(day_match.group(1))
+
+
+import_errors_by_day = {} # descriptions of the exceptions raised by the imports of import_day_modules, in each worker
+
+
+def import_day_modules(days):
+    # initializer of the workers, so that every worker imports the day modules (and NumPy) once, before solving any file. A day whose import fails is recorded in import_errors_by_day, so that only its files fail: an exception in the initializer would break the whole pool
+    for day in days:
+        try:
+            importlib.import_module("day{}".format(day))
+        except Exception as exception:
+            import_errors_by_day[day] = run_all_days.get_error_description(exception)
+    try:
+        finish_lazy_imports()
+    except Exception as exception:
+        for day in days:
+            import_errors_by_day.setdefault(day, run_all_days.get_error_description(exception))
+
+
+def solve_puzzle_file(day, file_name, using_example_file, part_profiler=None):
+    if day in import_errors_by_day:
+        return BatchResult(day, file_name, None, None, None, "{} (import)".format(import_errors_by_day[day]))
+    measurements = run_all_days.run_day(day, file_name, using_example_file, trace_memory=False, part_profiler=part_profiler)
+    failed_measurements = [measurement for measurement in measurements if measurement.error is not None]
+    if len(failed_measurements) != 0:
+        return BatchResult(day, file_name, None, None, None, "{} ({})".format(failed_measurements[0].error, failed_measurements[0].part))
+    answers = [measurement.answer for measurement in measurements[1:]] + [None] # the parsing has no answer. The extra None is the missing second part of day 25
+    wall_time = sum(measurement.wall_time for measurement in measurements)
+    return BatchResult(day, file_name, answers[0], answers[1], wall_time)
+
+
+def print_batch_result(batch_result, print_json):
+    if print_json:
+        print(json.dumps(asdict(batch_result), default=str), flush=True) # default=str avoids failing with answers that are not JSON types
+    elif batch_result.error is not None:
+        print("Day {}, {}: failed with {}".format(batch_result.day, batch_result.file_name, batch_result.error), flush=True)
+    else:
+        answers = [batch_result.first_part_answer, batch_result.second_part_answer]
+        for idx, answer in enumerate(answers):
+            if "\n" in str(answer): # the drawings of day 10 start in a new line, so they are not misaligned
+                answers[idx] = "\n" + answer
+        print("Day {}, {} ({:.4f} s): first part {}, second part {}".format(batch_result.day, batch_result.file_name, batch_result.wall_time, *answers), flush=True)
+
+
+def main(args):
+    day_by_file_name = {}
+    for file_name in expand_inputs(args.inputs):
+        if args.day is not None:
+            day_by_file_name[file_name] = args.day
+        elif get_day_from_file_name(file_name) is not None:
+            day_by_file_name[file_name] = get_day_from_file_name(file_name)
+        else:
+            print("Skipping", file_name, "as its name does not contain a day. Use --day to give it", file=sys.stderr)
+
+    # the biggest files are sent first, so that the workers do not end up waiting for a big file that started last
+    file_names = sorted(day_by_file_name, key=os.path.getsize, reverse=True)
+    n_failed_files = 0
+    with ProcessPoolExecutor(max_workers=args.n_workers, initializer=import_day_modules, initargs=(sorted(set(day_by_file_name.values())),)) as executor:
+        future_to_file_name = {}
+        for file_name in file_names:
+            part_profiler = get_part_profiler(args, os.path.splitext(os.path.basename(file_name))[0]) # files with the same name in different folders overwrite each other's profiles
+            future_to_file_name[executor.submit(solve_puzzle_file, day_by_file_name[file_name], file_name, args.using_example_files, part_profiler)] = file_name
+        for future in as_completed(future_to_file_name):
+            file_name = future_to_file_name[future]
+            try:
+                batch_result = future.result()
+            except Exception as exception:
+                batch_result = BatchResult(day_by_file_name[file_name], file_name, None, None, None, run_all_days.get_error_description(exception))
+            if batch_result.error is not None:
+                n_failed_files += 1
+            print_batch_result(batch_result, args.print_json)
+
+    if n_failed_files != 0:
+        print(n_failed_files, "of", len(file_names), "files failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(parse_arguments())
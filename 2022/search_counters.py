@@ -0,0 +1,47 @@
+'''
+Counters of the work done by the search-based solutions (days 12, 16, 19 and 24), to tell whether a pruning rule is pulling its weight on a given input:
+- expanded nodes: nodes taken from the frontier whose children were considered
+- pruned nodes, by the bound or rule that discarded them (e.g. the ideal pressure of day 16 or the ideal number of geodes of day 19)
+- peak frontier size: the most nodes waiting in the frontier (queue or stack) at the same time
+- visited checks and hits: how many times a node was looked up in the record of already visited nodes, and how many of those times it was already there (so it was not added again)
+
+The searches receive search_counters=None by default. Every update of the counters is inside an "if search_counters is not None" block, so when they are off the searches only pay for that comparison, which is negligible next to the work done for each node. The scripts of those days fill and print the counters with --count-search
+'''
+
+import collections
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SearchCounters:
+    n_expanded_nodes: int = 0
+    n_pruned_nodes: dict = field(default_factory=collections.Counter) # indexed by the name of the bound or rule that pruned the nodes
+    peak_frontier_size: int = 0
+    n_visited_checks: int = 0
+    n_visited_hits: int = 0
+
+    def update_peak_frontier_size(self, frontier_size):
+        if frontier_size > self.peak_frontier_size:
+            self.peak_frontier_size = frontier_size
+
+    def get_visited_hit_rate(self):
+        # None if the search does not keep a record of the visited nodes
+        if self.n_visited_checks == 0:
+            return None
+        return self.n_visited_hits / self.n_visited_checks
+
+    def as_dict(self):
+        return {"n_expanded_nodes": self.n_expanded_nodes, "n_pruned_nodes": dict(self.n_pruned_nodes), "peak_frontier_size": self.peak_frontier_size, "n_visited_checks": self.n_visited_checks, "n_visited_hits": self.n_visited_hits, "visited_hit_rate": self.get_visited_hit_rate()}
+
+
+def print_search_counters(part_name, search_counters):
+    print("Search counters of the {}: {} expanded nodes, peak frontier of {} nodes".format(part_name, search_counters.n_expanded_nodes, search_counters.peak_frontier_size), end="")
+    for bound_name, n_pruned_nodes in sorted(search_counters.n_pruned_nodes.items()):
+        print(", {} pruned by {}".format(n_pruned_nodes, bound_name), end="")
+    if search_counters.get_visited_hit_rate() is not None:
+        print(", {} of {} visited checks were hits ({:.1%})".format(search_counters.n_visited_hits, search_counters.n_visited_checks, search_counters.get_visited_hit_rate()), end="")
+    print()
+
+
+def add_search_counting_argument(parser):
+    parser.add_argument("--count-search", dest="counting_search", action="store_true", help="count the nodes expanded and pruned by the search of each part and print them after its answer. The answer cache is not used, as the search has to run to be counted")